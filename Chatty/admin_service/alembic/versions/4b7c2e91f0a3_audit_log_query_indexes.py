@@ -0,0 +1,31 @@
+"""audit_log query indexes
+
+Revision ID: 4b7c2e91f0a3
+Revises: da485eaf13a1
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7c2e91f0a3'
+down_revision: Union[str, None] = 'da485eaf13a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index('ix_audit_log_timestamp_id', 'audit_log', ['timestamp', 'id'])
+    op.create_index('ix_audit_log_admin_id_timestamp_id', 'audit_log', ['admin_id', 'timestamp', 'id'])
+    op.create_index('ix_audit_log_action_timestamp_id', 'audit_log', ['action', 'timestamp', 'id'])
+    op.create_index('ix_audit_log_target_id_timestamp_id', 'audit_log', ['target_id', 'timestamp', 'id'])
+
+def downgrade():
+    op.drop_index('ix_audit_log_target_id_timestamp_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_action_timestamp_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_admin_id_timestamp_id', table_name='audit_log')
+    op.drop_index('ix_audit_log_timestamp_id', table_name='audit_log')
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.database import SessionLocal
+from app.models import AuditLog
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    """Buffers audit log entries in memory and writes them with multi-row INSERTs.
+
+    A flush happens when `batch_size` entries are pending, every `flush_interval`
+    seconds, and on shutdown, so admin actions don't pay a commit each.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL,
+        max_buffer: int = settings.AUDIT_MAX_BUFFER,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: list[dict] = []
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def add(self, admin_id: int, action: str, target_id: int, reason: str | None = None):
+        self._buffer.append({
+            "admin_id": admin_id,
+            "action": action,
+            "target_id": target_id,
+            "reason": reason,
+            "timestamp": datetime.utcnow(),
+        })
+        if len(self._buffer) > self.max_buffer:
+            dropped = len(self._buffer) - self.max_buffer
+            del self._buffer[:dropped]
+            logger.error("Audit log buffer overflow, dropped %d oldest entries", dropped)
+        if len(self._buffer) >= self.batch_size:
+            task = asyncio.create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            try:
+                async with self.session_factory() as session:
+                    # One INSERT ... VALUES (...), (...) per chunk, kept under the driver's parameter limit
+                    for start in range(0, len(rows), self.CHUNK_SIZE):
+                        await session.execute(insert(AuditLog).values(rows[start:start + self.CHUNK_SIZE]))
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to write %d audit log entries, will retry", len(rows))
+                self._buffer[:0] = rows
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+
+
+audit_writer = AuditLogWriter()
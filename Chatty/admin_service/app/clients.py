@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any
+
+import httpx
+
+from common.http_client import HttpClientPool
+from config import settings
+
+http_client = HttpClientPool(settings)
+
+start_http_client = http_client.start
+close_http_client = http_client.close
+get_http_client = http_client.get
+
+
+class ServiceClient:
+    """Async client for one upstream service with its own per-call timeout."""
+
+    def __init__(self, name: str, base_url: str, timeout: float = settings.http_timeout,
+                 pool: HttpClientPool = http_client):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool = pool
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        return await self.pool.get().request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+        )
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def get_json(self, path: str, **kwargs) -> Any:
+        response = await self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+async def gather_json(calls: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
+    """Await upstream calls concurrently.
+
+    Returns the JSON of the calls that succeeded keyed by name, plus the names
+    of the ones that failed, so callers can serve a partial result.
+    """
+    names = list(calls)
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+    data, failed = {}, []
+    for name, result in zip(names, results):
+        if isinstance(result, (httpx.HTTPError, ValueError)):
+            failed.append(name)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            data[name] = result
+    return data, failed
+
+
+auth_service = ServiceClient("auth_service", settings.AUTH_SERVICE_URL)
+post_service = ServiceClient("post_service", settings.POST_SERVICE_URL)
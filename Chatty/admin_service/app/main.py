@@ -1,10 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routers import users, content, logs, stats, activity
+from app.audit import audit_writer
+from app.clients import start_http_client, close_http_client
 from app.utils import init_sentry
 
 init_sentry()
 
-app = FastAPI(title="Admin Service", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    await audit_writer.start()
+    yield
+    await audit_writer.stop()
+    await close_http_client()
+
+
+app = FastAPI(title="Admin Service", version="1.0.0", lifespan=lifespan)
 
 app.include_router(users.router)
 app.include_router(content.router)
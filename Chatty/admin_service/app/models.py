@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from app.database import Base
 from datetime import datetime
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_log_admin_id_timestamp_id", "admin_id", "timestamp", "id"),
+        Index("ix_audit_log_action_timestamp_id", "action", "timestamp", "id"),
+        Index("ix_audit_log_target_id_timestamp_id", "target_id", "timestamp", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     admin_id = Column(Integer, nullable=False)
     action = Column(String, nullable=False)
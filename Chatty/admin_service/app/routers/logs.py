@@ -1,14 +1,109 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.schemas import AuditLogList
+import base64
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_
+from app.schemas import AuditLogList, AuditLogEntry
 from app.dependencies import get_current_admin, TokenData
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models import AuditLog
+from app.audit import audit_writer
 
 router = APIRouter(prefix="/admin", tags=["Audit Logs"])
 
+EXPORT_FIELDS = ["id", "admin_id", "action", "target_id", "reason", "timestamp"]
+
+
+def encode_cursor(log: AuditLog) -> str:
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        timestamp, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """AuditLog.timestamp is naive UTC; asyncpg rejects timezone-aware values for it."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def filtered_logs(
+    admin_id: int | None = None,
+    action: str | None = None,
+    target_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    # Newest first; every filter is served by a (column, timestamp, id) index
+    query = select(AuditLog).order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+    if admin_id is not None:
+        query = query.where(AuditLog.admin_id == admin_id)
+    if action is not None:
+        query = query.where(AuditLog.action == action)
+    if target_id is not None:
+        query = query.where(AuditLog.target_id == target_id)
+    if since is not None:
+        query = query.where(AuditLog.timestamp >= naive_utc(since))
+    if until is not None:
+        query = query.where(AuditLog.timestamp < naive_utc(until))
+    return query
+
+
 @router.get("/logs", response_model=AuditLogList)
-async def list_logs(token: TokenData = Depends(get_current_admin), db: Session = Depends(get_db)):
-    logs = db.execute(select(AuditLog)).scalars().all()
-    return {"logs": logs}
\ No newline at end of file
+async def list_logs(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    query=Depends(filtered_logs),
+    token: TokenData = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    # Write out buffered entries first so the listing includes the latest actions
+    await audit_writer.flush()
+    if cursor is not None:
+        timestamp, log_id = decode_cursor(cursor)
+        query = query.where(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(timestamp, log_id))
+    result = await db.execute(query.limit(limit + 1))
+    logs = result.scalars().all()
+    next_cursor = encode_cursor(logs[limit - 1]) if len(logs) > limit else None
+    return {"logs": logs[:limit], "next_cursor": next_cursor}
+
+
+@router.get("/logs/export")
+async def export_logs(
+    format: Literal["csv", "ndjson"] = "ndjson",
+    query=Depends(filtered_logs),
+    token: TokenData = Depends(get_current_admin)
+):
+    await audit_writer.flush()
+
+    async def rows():
+        # Own session: the body is streamed after request dependencies have been closed
+        async with SessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=1000))
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(EXPORT_FIELDS)
+                async for log in result.scalars():
+                    writer.writerow([getattr(log, field) for field in EXPORT_FIELDS])
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            else:
+                async for log in result.scalars():
+                    yield AuditLogEntry.model_validate(log, from_attributes=True).model_dump_json() + "\n"
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f"attachment; filename=audit_log.{format}"}
+    return StreamingResponse(rows(), media_type=media_type, headers=headers)
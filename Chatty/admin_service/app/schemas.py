@@ -12,6 +12,7 @@ class User(BaseModel):
 
 class UserList(BaseModel):
     users: List[User]
+    next_cursor: int | None = None
 
 class RoleUpdate(BaseModel):
     role: int
@@ -40,6 +41,7 @@ class AuditLogEntry(BaseModel):
 
 class AuditLogList(BaseModel):
     logs: List[AuditLogEntry]
+    next_cursor: str | None = None
 
 class AdminStats(BaseModel):
     total_users: int
@@ -47,6 +49,7 @@ class AdminStats(BaseModel):
     active_users: int
     total_posts: int
     total_comments: int
+    unavailable: List[str] = []  # upstream services that did not answer; their counters are 0
 
 # New schema for user activity statistics
 class UserActivityStats(BaseModel):
@@ -0,0 +1,27 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.audit import audit_writer
+from app.database import engine
+
+
+async def _flush_audit_log():
+    await audit_writer.flush()
+    # Each asyncio.run() gets a new loop; pooled connections can't outlive theirs
+    await engine.dispose()
+
+
+@pytest.fixture
+def flush_audit_log():
+    """Writes the buffered audit entries, so a test can query AuditLog right after a request."""
+    return lambda: asyncio.run(_flush_audit_log())
+
+
+@pytest.fixture
+def make_response():
+    """Builds the httpx.Response that a mocked upstream service call returns."""
+    def build(status_code: int, json=None) -> httpx.Response:
+        return httpx.Response(status_code, json=json, request=httpx.Request("GET", "http://test"))
+    return build
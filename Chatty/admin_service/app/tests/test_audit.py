@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from app.audit import AuditLogWriter
+
+
+class FakeSession:
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.sink.append(statement.compile().params)
+
+    async def commit(self):
+        pass
+
+
+def make_writer(statements, **kwargs):
+    return AuditLogWriter(session_factory=lambda: FakeSession(statements), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_entries_are_buffered_until_flush():
+    statements = []
+    writer = make_writer(statements, batch_size=10)
+    writer.add(1, "block_user", 2)
+    writer.add(1, "unblock_user", 2)
+    assert writer.pending == 2
+    assert statements == []
+
+    await writer.flush()
+    assert writer.pending == 0
+    assert len(statements) == 1  # one multi-row INSERT
+    assert statements[0]["action_m0"] == "block_user"
+    assert statements[0]["action_m1"] == "unblock_user"
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_flush():
+    statements = []
+    writer = make_writer(statements, batch_size=2)
+    writer.add(1, "delete_post", 5)
+    writer.add(1, "delete_post", 6)
+    await asyncio.sleep(0)
+    assert writer.pending == 0
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_entries():
+    statements = []
+    writer = make_writer(statements, batch_size=100, flush_interval=60)
+    await writer.start()
+    writer.add(1, "delete_user", 2, reason="Violation of terms")
+    await writer.stop()
+    assert writer.pending == 0
+    assert statements[0]["reason_m0"] == "Violation of terms"
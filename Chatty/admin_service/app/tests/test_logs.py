@@ -1,17 +1,26 @@
+import csv
+import io
+import json
+import random
+
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from app.main import app
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
+import httpx
 import jwt
 from datetime import datetime, timedelta
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine
 from app.models import AuditLog
 
 client = TestClient(app)
 
 def create_token(user_id: int, role: int):
     payload = {
-        "sub": user_id,
+        "sub": str(user_id),
         "role": role,
         "exp": datetime.utcnow() + timedelta(hours=1)
     }
@@ -20,37 +29,40 @@ def create_token(user_id: int, role: int):
 admin_token = create_token(1, 0)
 user_token = create_token(2, 1)
 
-@patch("requests.post")
-def test_block_user_logs(mock_post, db: Session):
-    mock_post.return_value.status_code = 200
+@patch("app.clients.auth_service.post", new_callable=AsyncMock)
+def test_block_user_logs(mock_post, db: Session, flush_audit_log, make_response):
+    mock_post.return_value = make_response(200)
     response = client.post("/admin/users/2/block", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
+    flush_audit_log()
     log = db.query(AuditLog).filter(AuditLog.action == "block_user", AuditLog.target_id == 2).first()
     assert log is not None
     assert log.admin_id == 1
     assert log.action == "block_user"
     assert log.target_id == 2
 
-@patch("requests.delete")
-def test_delete_post_logs(mock_delete, db: Session):
-    mock_delete.return_value.status_code = 200
+@patch("app.clients.post_service.delete", new_callable=AsyncMock)
+def test_delete_post_logs(mock_delete, db: Session, flush_audit_log, make_response):
+    mock_delete.return_value = make_response(200)
     response = client.delete("/admin/posts/1", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
+    flush_audit_log()
     log = db.query(AuditLog).filter(AuditLog.action == "delete_post", AuditLog.target_id == 1).first()
     assert log is not None
     assert log.admin_id == 1
     assert log.action == "delete_post"
     assert log.target_id == 1
 
-@patch("requests.delete")
-def test_delete_user_logs(mock_delete, db: Session):
-    mock_delete.return_value.status_code = 200
+@patch("app.clients.auth_service.delete", new_callable=AsyncMock)
+def test_delete_user_logs(mock_delete, db: Session, flush_audit_log, make_response):
+    mock_delete.return_value = make_response(200)
     response = client.delete(
         "/admin/users/2",
         json={"reason": "Violation of terms"},
         headers={"Authorization": f"Bearer {admin_token}"}
     )
     assert response.status_code == 200
+    flush_audit_log()
     log = db.query(AuditLog).filter(AuditLog.action == "delete_user", AuditLog.target_id == 2).first()
     assert log is not None
     assert log.admin_id == 1
@@ -75,4 +87,130 @@ def test_list_logs_success(db: Session):
 def test_list_logs_unauthorized():
     response = client.get("/admin/logs", headers={"Authorization": f"Bearer {user_token}"})
     assert response.status_code == 403
-    assert response.json()["detail"] == "Admin access required"
\ No newline at end of file
+    assert response.json()["detail"] == "Admin access required"
+
+
+@pytest_asyncio.fixture
+async def api():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                 headers={"Authorization": f"Bearer {admin_token}"}) as api_client:
+        yield api_client
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def seeded_logs(api):
+    """Eight entries of one admin id of their own; the first three share a timestamp."""
+    admin_id = random.randint(10 ** 6, 10 ** 9)
+    start = datetime(2024, 1, 1, 12, 0)
+    minutes = [0, 0, 0, 1, 2, 3, 4, 5]
+    async with SessionLocal() as db:
+        logs = [
+            AuditLog(admin_id=admin_id, action="block_user" if i % 2 else "delete_post",
+                     target_id=admin_id + i % 3, reason=f"r{i}", timestamp=start + timedelta(minutes=minute))
+            for i, minute in enumerate(minutes)
+        ]
+        db.add_all(logs)
+        await db.commit()
+    yield admin_id, logs
+    async with SessionLocal() as db:
+        await db.execute(delete(AuditLog).where(AuditLog.admin_id == admin_id))
+        await db.commit()
+
+
+def newest_first(logs):
+    return [log.id for log in sorted(logs, key=lambda log: (log.timestamp, log.id), reverse=True)]
+
+
+async def list_ids(api, **params):
+    response = await api.get("/admin/logs", params=params)
+    assert response.status_code == 200, response.text
+    return [log["id"] for log in response.json()["logs"]]
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_next_cursor_without_gaps(api, seeded_logs):
+    admin_id, logs = seeded_logs
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"admin_id": admin_id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await api.get("/admin/logs", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen += [log["id"] for log in page["logs"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Entries with equal timestamps are split across pages by id
+    assert seen == newest_first(logs)
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_400(api):
+    for cursor in ("not-a-cursor", "bm90fGFuLWlk"):  # the second one is base64 of "not|an-id"
+        response = await api.get("/admin/logs", params={"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_filters(api, seeded_logs):
+    admin_id, logs = seeded_logs
+    start = datetime(2024, 1, 1, 12, 0)
+
+    assert await list_ids(api, admin_id=admin_id) == newest_first(logs)
+    assert await list_ids(api, admin_id=admin_id, action="block_user") == newest_first(
+        [log for log in logs if log.action == "block_user"])
+    assert await list_ids(api, target_id=admin_id + 1) == newest_first(
+        [log for log in logs if log.target_id == admin_id + 1])
+    # since is inclusive, until is exclusive
+    assert await list_ids(api, admin_id=admin_id, since=(start + timedelta(minutes=1)).isoformat(),
+                          until=(start + timedelta(minutes=4)).isoformat()) == newest_first(
+        [log for log in logs if start + timedelta(minutes=1) <= log.timestamp < start + timedelta(minutes=4)])
+
+
+@pytest.mark.asyncio
+async def test_time_filters_accept_timezone_aware_values(api, seeded_logs):
+    admin_id, logs = seeded_logs
+    # 15:01+03:00 is 12:01 UTC
+    ids = await list_ids(api, admin_id=admin_id, since="2024-01-01T15:01:00+03:00", until="2024-01-01T12:03:00Z")
+    assert ids == newest_first([log for log in logs if log.timestamp.minute in (1, 2)])
+
+
+@pytest.mark.asyncio
+async def test_export_csv(api, seeded_logs):
+    admin_id, logs = seeded_logs
+    response = await api.get("/admin/logs/export", params={"format": "csv", "admin_id": admin_id})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "admin_id", "action", "target_id", "reason", "timestamp"]
+    assert [int(row[0]) for row in rows[1:]] == newest_first(logs)
+    by_id = {log.id: log for log in logs}
+    for row in rows[1:]:
+        log = by_id[int(row[0])]
+        assert row[1:5] == [str(admin_id), log.action, str(log.target_id), log.reason]
+        assert datetime.fromisoformat(row[5]) == log.timestamp
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(api, seeded_logs):
+    admin_id, logs = seeded_logs
+    response = await api.get("/admin/logs/export", params={"format": "ndjson", "admin_id": admin_id,
+                                                           "action": "delete_post"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert [entry["id"] for entry in entries] == newest_first([log for log in logs if log.action == "delete_post"])
+    assert all(entry["admin_id"] == admin_id and entry["action"] == "delete_post" for entry in entries)
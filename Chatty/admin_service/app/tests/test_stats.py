@@ -1,7 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
+import httpx
 import jwt
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -34,28 +35,11 @@ mock_post_stats = {
 }
 
 
-@patch("requests.get")
-def test_get_stats_success(mock_get, db: Session):
-    def mock_get_side_effect(url):
-        class MockResponse:
-            def __init__(self, json_data, status_code):
-                self.json_data = json_data
-                self.status_code = status_code
-
-            def json(self):
-                return self.json_data
-
-            def raise_for_status(self):
-                if self.status_code != 200:
-                    raise requests.RequestException
-
-        if "auth_service" in url:
-            return MockResponse(mock_user_stats, 200)
-        if "post_service" in url:
-            return MockResponse(mock_post_stats, 200)
-        return MockResponse({}, 404)
-
-    mock_get.side_effect = mock_get_side_effect
+@patch("app.clients.post_service.get_json", new_callable=AsyncMock)
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
+def test_get_stats_success(mock_auth, mock_post, db: Session, flush_audit_log):
+    mock_auth.return_value = mock_user_stats
+    mock_post.return_value = mock_post_stats
     response = client.get("/admin/stats", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
     assert response.json() == {
@@ -63,8 +47,10 @@ def test_get_stats_success(mock_get, db: Session):
         "blocked_users": 10,
         "active_users": 90,
         "total_posts": 500,
-        "total_comments": 1000
+        "total_comments": 1000,
+        "unavailable": []
     }
+    flush_audit_log()
     log = db.query(AuditLog).filter(AuditLog.action == "view_stats").first()
     assert log is not None
     assert log.admin_id == 1
@@ -72,16 +58,30 @@ def test_get_stats_success(mock_get, db: Session):
     assert log.target_id == 0
 
 
-@patch("requests.get")
+@patch("app.clients.post_service.get_json", new_callable=AsyncMock)
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
+def test_get_stats_partial(mock_auth, mock_post):
+    mock_auth.return_value = mock_user_stats
+    mock_post.side_effect = httpx.ConnectTimeout("Post Service timed out")
+    response = client.get("/admin/stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json()["total_users"] == 100
+    assert response.json()["total_posts"] == 0
+    assert response.json()["unavailable"] == ["post_service"]
+
+
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
 def test_get_stats_unauthorized(mock_get):
     response = client.get("/admin/stats", headers={"Authorization": f"Bearer {user_token}"})
     assert response.status_code == 403
     assert response.json()["detail"] == "Admin access required"
 
 
-@patch("requests.get")
-def test_get_stats_service_unavailable(mock_get):
-    mock_get.side_effect = requests.RequestException("Service down")
+@patch("app.clients.post_service.get_json", new_callable=AsyncMock)
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
+def test_get_stats_service_unavailable(mock_auth, mock_post):
+    mock_auth.side_effect = httpx.ConnectError("Service down")
+    mock_post.side_effect = httpx.ConnectError("Service down")
     response = client.get("/admin/stats", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 503
-    assert response.json()["detail"] == "Service unavailable"
\ No newline at end of file
+    assert response.json()["detail"] == "Service unavailable"
@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 import jwt
 from datetime import datetime, timedelta
 
@@ -25,37 +25,36 @@ mock_users = [
     {"id": 2, "username": "user", "email": "user@example.com", "role": 1, "is_blocked": False}
 ]
 
-@patch("requests.get")
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
 def test_list_users_success(mock_get):
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = mock_users
+    mock_get.return_value = {"users": mock_users, "next_cursor": 2}
     response = client.get("/admin/users", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
-    assert response.json() == {"users": mock_users}
+    assert response.json() == {"users": mock_users, "next_cursor": 2}
 
-@patch("requests.get")
+@patch("app.clients.auth_service.get_json", new_callable=AsyncMock)
 def test_list_users_unauthorized(mock_get):
     response = client.get("/admin/users", headers={"Authorization": f"Bearer {user_token}"})
     assert response.status_code == 403
     assert response.json()["detail"] == "Admin access required"
 
-@patch("requests.post")
-def test_block_user_success(mock_post):
-    mock_post.return_value.status_code = 200
+@patch("app.clients.auth_service.post", new_callable=AsyncMock)
+def test_block_user_success(mock_post, make_response):
+    mock_post.return_value = make_response(200)
     response = client.post("/admin/users/2/block", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
     assert response.json()["message"] == "User 2 blocked"
 
-@patch("requests.post")
-def test_unblock_user_success(mock_post):
-    mock_post.return_value.status_code = 200
+@patch("app.clients.auth_service.post", new_callable=AsyncMock)
+def test_unblock_user_success(mock_post, make_response):
+    mock_post.return_value = make_response(200)
     response = client.post("/admin/users/2/unblock", headers={"Authorization": f"Bearer {admin_token}"})
     assert response.status_code == 200
     assert response.json()["message"] == "User 2 unblocked"
 
-@patch("requests.patch")
-def test_update_role_success(mock_patch):
-    mock_patch.return_value.status_code = 200
+@patch("app.clients.auth_service.patch", new_callable=AsyncMock)
+def test_update_role_success(mock_patch, make_response):
+    mock_patch.return_value = make_response(200)
     response = client.patch(
         "/admin/users/2/role",
         json={"role": 1},
@@ -64,7 +63,7 @@ def test_update_role_success(mock_patch):
     assert response.status_code == 200
     assert response.json()["message"] == "User 2 role updated to 1"
 
-@patch("requests.patch")
+@patch("app.clients.auth_service.patch", new_callable=AsyncMock)
 def test_update_role_invalid(mock_patch):
     response = client.patch(
         "/admin/users/2/role",
@@ -74,9 +73,9 @@ def test_update_role_invalid(mock_patch):
     assert response.status_code == 400
     assert response.json()["detail"] == "Role must be 0, 1, or 2"
 
-@patch("requests.delete")
-def test_delete_user_success(mock_delete):
-    mock_delete.return_value.status_code = 200
+@patch("app.clients.auth_service.delete", new_callable=AsyncMock)
+def test_delete_user_success(mock_delete, make_response):
+    mock_delete.return_value = make_response(200)
     response = client.delete(
         "/admin/users/2",
         json={"reason": "Violation of terms"},
@@ -12,5 +12,16 @@ def init_sentry():
         environment="development"
     )
 
-def log_to_sentry(error: Exception):
-    sentry_sdk.capture_exception(error)
\ No newline at end of file
+def log_to_sentry(admin_id: int, action: str, target_id: int, error: str | None = None):
+    # Routers call this for every admin action: successes become breadcrumbs, failures events
+    if error is None:
+        sentry_sdk.add_breadcrumb(
+            category="admin",
+            message=f"{action} target={target_id}",
+            data={"admin_id": admin_id},
+        )
+    else:
+        sentry_sdk.capture_message(
+            f"{action} failed for target={target_id} (admin_id={admin_id}): {error}",
+            level="error",
+        )
\ No newline at end of file
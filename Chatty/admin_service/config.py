@@ -11,12 +11,29 @@ class AdminSettings(BaseSettings):
     DB_NAME: str = "AdminDB"
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_RECYCLE: int = 1800
+
+    # Audit log writer
+    AUDIT_BATCH_SIZE: int = 100
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    AUDIT_MAX_BUFFER: int = 10000
 
     # External services
     POST_SERVICE_URL: str = "http://post_service:8006"
     AUTH_SERVICE_URL: str = "http://auth_service:8003"
     SUBSCRIPTION_SERVICE_URL: str = "http://subscription_service:8007"
 
+    # Shared HTTP connection pool (common/http_client.py reads these names in every service)
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 5.0
+    http_connect_timeout: float = 3.0
+    http2: bool = False
+
     # RabbitMQ
     RABBITMQ_HOST: str = "rabbitmq"
     RABBITMQ_PORT: int = 5672
@@ -0,0 +1,26 @@
+"""add outbox table
+
+Revision ID: 3_add_outbox
+Revises: 2_add_email_and_is_active
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '3_add_outbox'
+down_revision = '2_add_email_and_is_active'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+def downgrade() -> None:
+    op.drop_table('outbox')
@@ -0,0 +1,51 @@
+"""
+Пропускная способность логина (bcrypt verify) в зависимости от числа воркеров.
+
+Запуск из каталога auth_service:
+    python -m benchmarks.bench_hashing --kind process --requests 64
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from utils.hashing import PasswordHasher, pwd_context
+
+
+async def run(kind: str, workers: int, requests: int, hashed: str) -> float:
+    hasher = PasswordHasher(kind=kind, max_workers=workers, max_pending=requests)
+    hasher.start()
+    try:
+        # Прогрев пула, чтобы не мерить создание процессов
+        await asyncio.gather(*(hasher.verify("password", hashed) for _ in range(workers)))
+        started = time.perf_counter()
+        await asyncio.gather(*(hasher.verify("password", hashed) for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+    finally:
+        hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", choices=["thread", "process"], default="thread")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hashed = pwd_context.hash("password")
+
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        pwd_context.verify("password", hashed)
+    baseline = args.requests / (time.perf_counter() - started)
+    print(f"inline (event loop):  {baseline:8.1f} logins/s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        rate = asyncio.run(run(args.kind, workers, args.requests, hashed))
+        print(f"{args.kind:7} x {workers:<3}         {rate:8.1f} logins/s  ({rate / baseline:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,24 @@ class AuthSettings(BaseSettings):
     db_user: str = 'postgres'
     db_password: str = 'postgres'
     jwt_secret_key: str
+    users_page_size: int = 50
+    users_page_size_max: int = 500
+    users_export_chunk_size: int = 1000
+    users_batch_max: int = 500
+    rabbitmq_host: str = 'rabbitmq'
+    rabbitmq_port: int = 5672
+    rabbitmq_user: str = 'guest'
+    rabbitmq_password: str = 'guest'
+    events_queue: str = 'events'
+    outbox_poll_interval: float = 0.5
+    outbox_batch_size: int = 100
 
     @property
     def async_database_url(self) -> str:
         return f'postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}'
 
+    @property
+    def rabbitmq_url(self) -> str:
+        return f'amqp://{self.rabbitmq_user}:{self.rabbitmq_password}@{self.rabbitmq_host}:{self.rabbitmq_port}/'
+
 settings = AuthSettings()
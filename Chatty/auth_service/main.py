@@ -1,12 +1,28 @@
 
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from routers.auth import router as auth_router
-from routers.users import router as users_router
-import models
+from routers.users import router as users_router, get_users_page
 import schemas
+from config import settings
 from database import get_db
+from utils.events import event_publisher
+from utils.outbox import outbox_relay
+from utils.security import password_hasher, mail_dispatcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    password_hasher.start()
+    await mail_dispatcher.start()
+    await outbox_relay.start()
+    yield
+    await outbox_relay.stop()
+    await event_publisher.close()
+    await mail_dispatcher.stop()
+    password_hasher.shutdown()
+
 
 app = FastAPI(
     title="Chatty",
@@ -16,7 +32,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     root_path="",
-    root_path_in_servers=True
+    root_path_in_servers=True,
+    lifespan=lifespan
 )
 
 app.include_router(auth_router, prefix="/auth", tags=["Авторизация"])
@@ -25,9 +42,32 @@ app.include_router(users_router, prefix="/users")
 @app.get("/",
          response_model=list[schemas.UserRead],
          summary="Для Теста",
-         description="Все пользователи",
+         description="Пользователи постранично (after_id, limit)",
          tags=["База данных"])
-async def read_root(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.User))
-    users = result.scalars().all()
-    return users
\ No newline at end of file
+async def read_root(
+        after_id: int | None = None,
+        limit: int = Query(settings.users_page_size, ge=1, le=settings.users_page_size_max),
+        db: AsyncSession = Depends(get_db)
+):
+    page = await get_users_page(db, after_id, limit)
+    return page.users
+
+
+@app.get("/metrics/hashing",
+         summary="Метрики хеширования паролей",
+         description="Количество вызовов bcrypt, задержка и число отклонённых запросов",
+         tags=["Мониторинг"])
+async def hashing_metrics():
+    return {**password_hasher.metrics.as_dict(), "pending": password_hasher.pending}
+
+
+@app.get("/metrics/events",
+         summary="Метрики публикации событий",
+         description="Подтверждено и не подтверждено брокером, сколько строк outbox опубликовано",
+         tags=["Мониторинг"])
+async def events_metrics():
+    return {
+        "published": event_publisher.published,
+        "failed": event_publisher.failed,
+        "relayed": outbox_relay.relayed,
+    }
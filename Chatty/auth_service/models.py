@@ -1,5 +1,7 @@
 
-from sqlalchemy import Column, Integer, String, Boolean
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Boolean, BigInteger, JSON, func
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
 
 Base = declarative_base()
@@ -12,3 +14,13 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=True)  # Email может быть null
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)  # По умолчанию False
+
+
+class OutboxEvent(Base):
+    """Событие, записанное в одной транзакции с пользователем; публикует его relay из utils/outbox.py."""
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String)
+    payload: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
@@ -1,17 +1,85 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, or_
 import models, schemas
-from database import get_db
+from config import settings
+from database import get_db, AsyncSessionLocal
 from utils.security import (
     get_password_hash, get_current_user, create_email_token, verify_email_token, send_email,
-    verify_password
+    verify_password, invalidate_user
 )
+from utils.events import UserRegisteredEvent
+from utils.outbox import add_event
 
 router = APIRouter()
 
 
+async def get_users_page(db: AsyncSession, after_id: int | None, limit: int) -> schemas.UserPage:
+    # Keyset-пагинация по id: без OFFSET, каждая страница читается по индексу первичного ключа
+    query = select(models.User).order_by(models.User.id).limit(limit + 1)
+    if after_id is not None:
+        query = query.where(models.User.id > after_id)
+    result = await db.execute(query)
+    users = result.scalars().all()
+    next_cursor = users[limit - 1].id if len(users) > limit else None
+    return schemas.UserPage(users=users[:limit], next_cursor=next_cursor)
+
+
+@router.get("",
+            response_model=schemas.UserPage,
+            summary="Список пользователей",
+            description="Постраничный список пользователей. Для следующей страницы передайте next_cursor в after_id.",
+            tags=["Пользователи"])
+async def list_users(
+        after_id: int | None = None,
+        limit: int = Query(settings.users_page_size, ge=1, le=settings.users_page_size_max),
+        db: AsyncSession = Depends(get_db)
+):
+    return await get_users_page(db, after_id, limit)
+
+
+@router.get("/export",
+            summary="Выгрузка пользователей",
+            description="Все пользователи в формате NDJSON, по одной записи на строку.",
+            tags=["Пользователи"])
+async def export_users():
+    async def rows():
+        # Своя сессия: ответ стримится уже после выхода из зависимостей запроса
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(
+                select(models.User)
+                .order_by(models.User.id)
+                .execution_options(yield_per=settings.users_export_chunk_size)
+            )
+            async for user in result.scalars():
+                yield schemas.UserRead.model_validate(user).model_dump_json() + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@router.post("/batch",
+             response_model=schemas.UserBatch,
+             summary="Пакетный поиск пользователей",
+             description="Возвращает пользователей по списку id и/или username одним запросом. Ненайденные просто отсутствуют в ответе.",
+             tags=["Пользователи"])
+async def get_users_batch(request: schemas.UserBatchRequest, db: AsyncSession = Depends(get_db)):
+    if len(request.ids) + len(request.usernames) > settings.users_batch_max:
+        raise HTTPException(status_code=400, detail=f"Не больше {settings.users_batch_max} пользователей за запрос")
+
+    conditions = []
+    if request.ids:
+        conditions.append(models.User.id.in_(set(request.ids)))
+    if request.usernames:
+        conditions.append(models.User.username.in_(set(request.usernames)))
+    if not conditions:
+        return {"users": []}
+
+    result = await db.execute(select(models.User).where(or_(*conditions)))
+    return {"users": result.scalars().all()}
+
+
 @router.post("/register",
              summary="Регистрация пользователя",
              description="Создает нового пользователя с указанным именем и паролем.",
@@ -24,9 +92,11 @@ async def create_user(user_in: schemas.UserCreate, db: AsyncSession = Depends(ge
 
     user = models.User(
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password)
+        hashed_password=await get_password_hash(user_in.password)
     )
     db.add(user)
+    await db.flush()  # нужен user.id для события
+    add_event(db, "UserRegistered", UserRegisteredEvent(user_id=user.id, username=user.username).model_dump())
     await db.commit()
     await db.refresh(user)
     return user
@@ -84,6 +154,7 @@ async def confirm_email(token: str, db: AsyncSession = Depends(get_db)):
     user.email = email
     user.is_active = True
     await db.commit()
+    invalidate_user(user.username)
     return {"message": "Email успешно добавлен и подтвержден"}
 
 
@@ -125,6 +196,7 @@ async def confirm_delete_email(token: str, db: AsyncSession = Depends(get_db)):
     user.email = None
     user.is_active = False
     await db.commit()
+    invalidate_user(user.username)
     return {"message": "Email успешно удален"}
 
 
@@ -147,10 +219,11 @@ async def delete_user(
         )
         return {"message": "Ссылка для удаления аккаунта отправлена"}
     else:
-        if not password or not verify_password(password.password, user.hashed_password):
+        if not password or not await verify_password(password.password, user.hashed_password):
             raise HTTPException(status_code=401, detail="Неверный пароль")
         await db.execute(delete(models.User).where(models.User.id == user.id))
         await db.commit()
+        invalidate_user(user.username)
         return {"message": "Аккаунт удален"}
 
 
@@ -167,6 +240,7 @@ async def confirm_delete_user(token: str, db: AsyncSession = Depends(get_db)):
 
     await db.execute(delete(models.User).where(models.User.id == user.id))
     await db.commit()
+    invalidate_user(user.username)
     return {"message": "Аккаунт успешно удален"}
 
 
@@ -179,6 +253,7 @@ async def edit_user(
         user: models.User = Depends(get_current_user),
         db: AsyncSession = Depends(get_db)
 ):
+    old_username = user.username
     if user_data.username and user_data.username != user.username:
         existing_user = await db.execute(select(models.User).where(models.User.username == user_data.username))
         if existing_user.scalar_one_or_none():
@@ -186,5 +261,6 @@ async def edit_user(
         user.username = user_data.username
 
     await db.commit()
+    invalidate_user(old_username)
     await db.refresh(user)
     return user
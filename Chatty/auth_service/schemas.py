@@ -16,6 +16,17 @@ class UserRead(BaseModel):
     class Config:
         from_attributes = True
 
+class UserPage(BaseModel):
+    users: list[UserRead]
+    next_cursor: int | None = None
+
+class UserBatchRequest(BaseModel):
+    ids: list[int] = []
+    usernames: list[str] = []
+
+class UserBatch(BaseModel):
+    users: list[UserRead]
+
 class EmailAdd(BaseModel):
     email: EmailStr
 
@@ -0,0 +1,41 @@
+import time
+
+from utils.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entry_expires_at_deadline():
+    cache = LRUCache(maxsize=10)
+    cache.set("token", "alice", expires_at=time.time() - 1)
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_ttl_caps_explicit_deadline():
+    cache = LRUCache(maxsize=10, ttl=0)
+    cache.set("user", {"id": 1}, expires_at=time.time() + 3600)
+    assert cache.get("user") is None
+
+
+def test_pop_invalidates():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("alice", {"id": 1})
+    cache.pop("alice")
+    cache.pop("missing")
+    assert cache.get("alice") is None
+
+
+def test_ttl_applies_when_no_deadline_given():
+    cache = LRUCache(maxsize=10, ttl=0)
+    cache.set("token", "alice")
+    assert cache.get("token") is None
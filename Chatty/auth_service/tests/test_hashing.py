@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from utils.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify():
+    hasher = PasswordHasher(kind="thread", max_workers=2)
+    hashed = await hasher.hash("secret")
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("wrong", hashed)
+    assert hasher.metrics.calls == 3
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_returns_503():
+    hasher = PasswordHasher(kind="thread", max_workers=1, max_pending=2)
+    hashed = await hasher.hash("secret")
+    results = await asyncio.gather(
+        *(hasher.verify("secret", hashed) for _ in range(4)), return_exceptions=True
+    )
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 2
+    assert rejected[0].status_code == 503
+    assert hasher.metrics.rejected == 2
+    assert hasher.pending == 0
+    hasher.shutdown()
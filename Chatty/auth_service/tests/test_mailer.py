@@ -0,0 +1,132 @@
+from email.mime.text import MIMEText
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from utils.mailer import MailDispatcher
+
+
+class RecordingHandler(Sink):
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+        self.reject = 0
+        self.reject_permanently = 0
+        self.refused = set()
+        self.rcpt_attempts = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.rcpt_attempts += 1
+        if address in self.refused:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.reject:
+            self.reject -= 1
+            return "451 Try again later"
+        if self.reject_permanently:
+            self.reject_permanently -= 1
+            return "554 Rejected"
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+class EphemeralController(Controller):
+    """Слушает на порту, выбранном ОС (port=0); настоящий порт — в self.port."""
+
+    def _trigger_server(self):
+        self.port = self.server.sockets[0].getsockname()[1]
+        super()._trigger_server()
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = EphemeralController(handler, hostname="127.0.0.1", port=0)
+    controller.start()
+    handler.port = controller.port
+    yield handler
+    controller.stop()
+
+
+def make_message(to: str) -> MIMEText:
+    msg = MIMEText("body")
+    msg["Subject"] = "test"
+    msg["From"] = "noreply@chatty.local"
+    msg["To"] = to
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_messages_reuse_one_session(smtp_server):
+    dispatcher = MailDispatcher("127.0.0.1", smtp_server.port, starttls=False, workers=1)
+    await dispatcher.start()
+    for i in range(5):
+        dispatcher.enqueue(make_message(f"user{i}@example.com"))
+    await dispatcher.stop()
+
+    assert dispatcher.sent == 5
+    assert len(smtp_server.messages) == 5
+    assert len(smtp_server.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried(smtp_server):
+    # Первые две попытки сервер отклоняет временной ошибкой
+    smtp_server.reject = 2
+    dispatcher = MailDispatcher("127.0.0.1", smtp_server.port, starttls=False, max_retries=3, backoff=0.05)
+    await dispatcher.start()
+    dispatcher.enqueue(make_message("user@example.com"))
+    # stop() дожидается и повторов, отложенных через call_later
+    await dispatcher.stop()
+
+    assert dispatcher.sent == 1
+    assert len(smtp_server.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_refused_recipient_is_not_retried(smtp_server):
+    smtp_server.refused.add("ghost@example.com")
+    dispatcher = MailDispatcher("127.0.0.1", smtp_server.port, starttls=False, max_retries=3, backoff=0.05)
+    await dispatcher.start()
+    dispatcher.enqueue(make_message("ghost@example.com"))
+    dispatcher.enqueue(make_message("user@example.com"))
+    await dispatcher.stop()
+
+    assert smtp_server.rcpt_attempts == 2
+    assert dispatcher.failed == 1
+    assert dispatcher.sent == 1
+    assert len(smtp_server.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_permanent_data_error_is_not_retried(smtp_server):
+    smtp_server.reject_permanently = 1
+    dispatcher = MailDispatcher("127.0.0.1", smtp_server.port, starttls=False, max_retries=3, backoff=0.05)
+    await dispatcher.start()
+    dispatcher.enqueue(make_message("user@example.com"))
+    await dispatcher.stop()
+
+    assert smtp_server.rcpt_attempts == 1
+    assert dispatcher.failed == 1
+    assert dispatcher.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_unencodable_message_does_not_stop_worker(smtp_server):
+    # Не-ASCII текст без charset: send_message падает с UnicodeEncodeError
+    broken = make_message("user@example.com")
+    broken.set_payload("тест \udcff")
+    dispatcher = MailDispatcher("127.0.0.1", smtp_server.port, starttls=False, workers=1)
+    await dispatcher.start()
+    dispatcher.enqueue(broken)
+    dispatcher.enqueue(make_message("other@example.com"))
+    await dispatcher.stop()
+
+    assert dispatcher.failed == 1
+    assert dispatcher.sent == 1
+    assert [e.rcpt_tos for e in smtp_server.messages] == [["other@example.com"]]
@@ -0,0 +1,102 @@
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Функции верхнего уровня, чтобы их можно было передать в ProcessPoolExecutor
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class PasswordHasher:
+    """Выполняет bcrypt в пуле воркеров, не блокируя event loop."""
+
+    def __init__(self, kind: str = "thread", max_workers: int | None = None, max_pending: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError("kind должен быть 'thread' или 'process'")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.metrics = HashingMetrics()
+        self._pending = 0
+        self._executor: Executor | None = None
+
+    def start(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, func, *args):
+        # Ограничиваем глубину очереди: лучше быстро отдать 503, чем копить запросы
+        if self._pending >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис перегружен, попробуйте позже",
+                headers={"Retry-After": "1"},
+            )
+        self.start()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.metrics.observe(elapsed_ms)
+            logger.debug("bcrypt %s took %.1f ms", func.__name__, elapsed_ms)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify_password, plain_password, hashed_password)
@@ -0,0 +1,194 @@
+
+import asyncio
+import logging
+import smtplib
+from email.message import Message
+
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+
+class MailDispatcher:
+    """Очередь исходящих писем с фоновыми воркерами и переиспользуемыми SMTP-сессиями.
+
+    Обработчики кладут письмо в очередь и сразу отвечают клиенту. Каждый воркер держит
+    своё авторизованное соединение, отправляет письма пачками в отдельном потоке и
+    повторяет временные ошибки с экспоненциальной задержкой. Постоянные отказы (5xx,
+    отклонённые получатели, письма, которые нельзя закодировать) не повторяются и
+    попадают в failed.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        workers: int = 1,
+        batch_size: int = 20,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        idle_timeout: float = 60.0,
+        queue_size: int = 1000,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.queue_size = queue_size
+        self.sent = 0
+        self.failed = 0
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._retrying = 0
+
+    def enqueue(self, msg: Message):
+        if self._queue is None:
+            raise RuntimeError("MailDispatcher не запущен")
+        try:
+            self._queue.put_nowait((msg, 0))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Очередь писем переполнена, попробуйте позже",
+            )
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0):
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Mail queue not drained on shutdown, %d messages dropped",
+                self._queue.qsize() + self._retrying,
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            server.starttls()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP | None):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _is_permanent(exc: Exception) -> bool:
+        """Ошибки, которые повтор не исправит: 5xx, отказ всем получателям, нет SMTPUTF8."""
+        if isinstance(exc, (smtplib.SMTPRecipientsRefused, smtplib.SMTPNotSupportedError)):
+            return True
+        return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+    def _send_batch(self, server: smtplib.SMTP | None, batch: list[tuple[Message, int]]):
+        """Возвращает соединение, письма для повтора и число отклонённых насовсем."""
+        # Выполняется в потоке: блокирующий smtplib не трогает event loop
+        failed = []
+        rejected = 0
+        for msg, attempt in batch:
+            try:
+                if server is None:
+                    server = self._connect()
+                server.send_message(msg)
+            except (smtplib.SMTPException, OSError) as exc:
+                if self._is_permanent(exc):
+                    # smtplib уже сбросил транзакцию (RSET), сессия остаётся рабочей
+                    logger.error("Mail to %s rejected: %s", msg["To"], exc)
+                    rejected += 1
+                    continue
+                logger.warning("Failed to send mail to %s (attempt %d): %s", msg["To"], attempt + 1, exc)
+                self._close(server)
+                server = None
+                failed.append((msg, attempt + 1))
+            except Exception:
+                # Письмо не собрать, например не-ASCII текст без кодировки: повтор не поможет.
+                # Где оборвалась SMTP-транзакция, неизвестно, поэтому соединение закрываем
+                logger.exception("Cannot send mail to %s", msg["To"])
+                self._close(server)
+                server = None
+                rejected += 1
+        return server, failed, rejected
+
+    async def _drain(self):
+        # Отложенные повторы ещё не в очереди, join() их не видит
+        while True:
+            await self._queue.join()
+            if not self._retrying:
+                return
+            await asyncio.sleep(self.backoff)
+
+    def _requeue(self, item: tuple[Message, int]):
+        self._retrying -= 1
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.failed += 1
+            logger.error("Mail queue full, dropping retry for %s", item[0]["To"])
+
+    async def _worker(self):
+        server = None
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    # Сервер всё равно закроет простаивающее соединение
+                    await asyncio.to_thread(self._close, server)
+                    server = None
+                    continue
+
+                batch = [item]
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                try:
+                    server, failed, rejected = await asyncio.to_thread(self._send_batch, server, batch)
+                    self.sent += len(batch) - len(failed) - rejected
+                    self.failed += rejected
+                    for msg, attempt in failed:
+                        if attempt >= self.max_retries:
+                            self.failed += 1
+                            logger.error("Giving up on mail to %s after %d attempts", msg["To"], attempt)
+                        else:
+                            self._retrying += 1
+                            loop.call_later(self.backoff * 2 ** (attempt - 1), self._requeue, (msg, attempt))
+                except Exception:
+                    # Упавший воркер больше не разбирает очередь, а обработчики продолжают в неё писать
+                    logger.exception("Mail worker failed on a batch of %d messages", len(batch))
+                    self.failed += len(batch)
+                    await asyncio.to_thread(self._close, server)
+                    server = None
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            await asyncio.to_thread(self._close, server)
@@ -0,0 +1,21 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from common.outbox import OutboxRelay
+from config import settings
+from database import AsyncSessionLocal
+from utils.events import event_publisher
+
+
+def add_event(db: AsyncSession, event_type: str, payload: dict):
+    """Кладёт событие в outbox. Не коммитит: строка уходит вместе с транзакцией обработчика."""
+    db.add(models.OutboxEvent(event_type=event_type, payload=payload))
+
+
+outbox_relay = OutboxRelay(
+    models.OutboxEvent,
+    event_publisher,
+    session_factory=AsyncSessionLocal,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+)
@@ -1,17 +1,20 @@
 
 import os
+import hashlib
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 import models
 import schemas
 from database import get_db
-import smtplib
+from utils.hashing import PasswordHasher
+from utils.cache import LRUCache
+from utils.mailer import MailDispatcher
 from email.mime.text import MIMEText
 
 # Загружаем .env.local
@@ -24,7 +27,25 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 EMAIL_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Пул для bcrypt: thread или process, размер пула и лимит очереди
+password_hasher = PasswordHasher(
+    kind=os.getenv("PASSWORD_HASH_EXECUTOR", "thread"),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+)
+
+# Кеш проверенных токенов (sha256 токена -> username), запись живёт не дольше exp токена
+# и не дольше TOKEN_CACHE_TTL_SECONDS: токен без exp не должен оставаться в кеше навсегда
+token_cache = LRUCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", str(ACCESS_TOKEN_EXPIRE_MINUTES * 60))),
+)
+# Кеш строк пользователей по username. Кеш локален для процесса, поэтому TTL держим коротким:
+# инвалидация из обработчиков не видна другим воркерам uvicorn
+user_cache = LRUCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
 
 # SMTP настройки из переменных окружения
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -36,11 +57,23 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 if not SMTP_USER or not SMTP_PASSWORD:
     raise ValueError("SMTP_USER и SMTP_PASSWORD должны быть заданы в .env.local")
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# Письма уходят из фоновых воркеров, каждый держит своё SMTP-соединение
+mail_dispatcher = MailDispatcher(
+    host=SMTP_HOST,
+    port=SMTP_PORT,
+    user=SMTP_USER,
+    password=SMTP_PASSWORD,
+    starttls=os.getenv("SMTP_STARTTLS", "true").lower() == "true",
+    workers=int(os.getenv("SMTP_WORKERS", "2")),
+    batch_size=int(os.getenv("SMTP_BATCH_SIZE", "20")),
+    max_retries=int(os.getenv("SMTP_MAX_RETRIES", "5")),
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -66,11 +99,19 @@ def verify_email_token(token: str) -> dict:
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     user = await db.execute(select(models.User).where(models.User.username == username))
     user = user.scalar_one_or_none()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password(password, user.hashed_password):
         return False
     return user
 
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_token(token: str) -> schemas.TokenData:
+    digest = _token_digest(token)
+    username = token_cache.get(digest)
+    if username is not None:
+        return schemas.TokenData(username=username)
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -81,16 +122,43 @@ def verify_token(token: str) -> schemas.TokenData:
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
+        token_cache.set(digest, username, expires_at=payload.get("exp"))
         return schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
 
+def cache_user(user: models.User):
+    user_cache.set(user.username, {
+        "id": user.id,
+        "username": user.username,
+        "hashed_password": user.hashed_password,
+        "email": user.email,
+        "is_active": user.is_active,
+    })
+
+def invalidate_user(username: str):
+    user_cache.pop(username)
+
+def _user_from_cache(db: AsyncSession, username: str) -> models.User | None:
+    row = user_cache.get(username)
+    if row is None:
+        return None
+    # Присоединяем к сессии без SELECT, чтобы обработчики могли менять и удалять пользователя
+    user = models.User(**row)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     token_data = verify_token(token)
+    user = _user_from_cache(db, token_data.username)
+    if user is not None:
+        return user
     user = await db.execute(select(models.User).where(models.User.username == token_data.username))
     user = user.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    cache_user(user)
     return user
 
 def send_email(to_email: str, subject: str, body: str):
@@ -98,8 +166,4 @@ def send_email(to_email: str, subject: str, body: str):
     msg["Subject"] = subject
     msg["From"] = SMTP_USER
     msg["To"] = to_email
-
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(msg)
+    mail_dispatcher.enqueue(msg)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import aio_pika
+
+
+class EventPublisher:
+    """Publishes events to RabbitMQ over one long-lived connection.
+
+    Services don't publish from request handlers: events are written to the
+    transactional outbox and the outbox relay hands them over here in batches.
+    A batch goes out on a channel with publisher confirms and all the confirms
+    are awaited together, so the relay only deletes rows the broker accepted.
+    """
+
+    def __init__(self, url: str, queue_name: str = "events", confirm_timeout: float = 10.0):
+        self.url = url
+        self.queue_name = queue_name
+        self.confirm_timeout = confirm_timeout
+        self.published = 0
+        self.failed = 0
+        self._connection: aio_pika.abc.AbstractRobustConnection | None = None
+        self._channel: aio_pika.abc.AbstractChannel | None = None
+        self._lock = asyncio.Lock()
+
+    async def publish_confirmed(self, events: list[dict]) -> list[bool]:
+        """Publish a batch and wait for the broker.
+
+        Returns one flag per event: True when the broker confirmed the message.
+        Connection errors are raised; the caller retries the whole batch later.
+        """
+        async with self._lock:
+            try:
+                if self._channel is None or self._channel.is_closed:
+                    self._channel = await self._open_channel()
+                results = await asyncio.gather(
+                    *(
+                        self._channel.default_exchange.publish(
+                            self._message(event), routing_key=self.queue_name, timeout=self.confirm_timeout
+                        )
+                        for event in events
+                    ),
+                    return_exceptions=True,
+                )
+            except (aio_pika.exceptions.AMQPError, OSError):
+                self._channel = None
+                raise
+        confirmed = [not isinstance(result, Exception) for result in results]
+        self.published += sum(confirmed)
+        self.failed += len(confirmed) - sum(confirmed)
+        return confirmed
+
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+            self._channel = None
+
+    async def _open_channel(self) -> aio_pika.abc.AbstractChannel:
+        if self._connection is None:
+            # connect_robust reconnects and restores channels after a drop. The connection is
+            # opened on the first publish, so the service starts even if the broker isn't up yet
+            connection = await aio_pika.connect_robust(self.url)
+            channel = await connection.channel()
+            # Same arguments as the consumers, otherwise the broker rejects the redeclaration
+            await channel.declare_queue(self.queue_name)
+            await channel.close()
+            self._connection = connection
+        return await self._connection.channel(publisher_confirms=True)
+
+    def _message(self, event: dict) -> aio_pika.Message:
+        return aio_pika.Message(
+            body=json.dumps(event).encode(),
+            content_type="application/json",
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            type=event.get("event"),
+            # Consumers drop redeliveries by event_id (the outbox row id)
+            message_id=str(event["event_id"]) if "event_id" in event else None,
+        )
@@ -0,0 +1,40 @@
+import httpx
+
+
+class HttpClientPool:
+    """One pooled httpx client per process, shared by every inter-service client.
+
+    `settings` is the service's settings object; only its http_* fields are read.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._client: httpx.AsyncClient | None = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            http2=settings.http2,  # requires the optional `h2` package
+        )
+
+    async def start(self) -> None:
+        """Create the connection pool; called from the app lifespan."""
+        if self._client is None:
+            self._client = self._build_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it lazily when running outside the app lifespan."""
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.events import EventPublisher
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Publishes rows of a transactional outbox table to RabbitMQ.
+
+    `model` is the service's outbox model with `id`, `event_type` and `payload`
+    columns. Every `poll_interval` seconds the relay takes a batch of rows with
+    FOR UPDATE SKIP LOCKED, so several service instances drain the table in
+    parallel without publishing the same rows, publishes it with confirms and
+    deletes the confirmed rows in the same transaction. Delivery is at least
+    once: if the process dies after publishing but before the commit, the batch
+    goes out again and consumers drop the repeats by event_id.
+    """
+
+    def __init__(
+        self,
+        model,
+        publisher: EventPublisher,
+        session_factory,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+    ):
+        self.model = model
+        self.publisher = publisher
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.relayed = 0
+        self._task: asyncio.Task | None = None
+
+    async def relay_batch(self, db: AsyncSession) -> int:
+        model = self.model
+        result = await db.execute(
+            select(model)
+            .order_by(model.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return 0
+        confirmed = await self.publisher.publish_confirmed(
+            [{"event": row.event_type, "event_id": row.id, **row.payload} for row in rows]
+        )
+        published_ids = [row.id for row, ok in zip(rows, confirmed) if ok]
+        if published_ids:
+            await db.execute(delete(model).where(model.id.in_(published_ids)))
+        await db.commit()
+        # Unconfirmed rows stay and go out on the next pass
+        self.relayed += len(published_ids)
+        return len(published_ids)
+
+    async def relay(self) -> int:
+        """Publish everything that has built up in the outbox."""
+        relayed = 0
+        while True:
+            async with self.session_factory() as db:
+                batch_relayed = await self.relay_batch(db)
+            relayed += batch_relayed
+            if batch_relayed < self.batch_size:
+                return relayed
+
+    async def _run(self):
+        while True:
+            try:
+                await self.relay()
+            except Exception:
+                logger.exception("Outbox relay failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
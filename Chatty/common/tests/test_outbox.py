@@ -0,0 +1,74 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import JSON, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from common.outbox import OutboxRelay
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_type: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSON)
+
+
+class FakePublisher:
+    """Confirms every event except those whose ids are listed in `rejected`."""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.batches = []
+
+    async def publish_confirmed(self, events):
+        self.batches.append(events)
+        return [event["event_id"] not in self.rejected for event in events]
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add_all(OutboxEvent(event_type="PostCreated", payload={"post_id": i}) for i in range(1, 6))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def remaining_ids(session_factory) -> list[int]:
+    async with session_factory() as db:
+        return list(await db.scalars(select(OutboxEvent.id).order_by(OutboxEvent.id)))
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_batches_and_deletes_published_rows(session_factory):
+    publisher = FakePublisher()
+    relay = OutboxRelay(OutboxEvent, publisher, session_factory, batch_size=2)
+
+    assert await relay.relay() == 5
+    assert [len(batch) for batch in publisher.batches] == [2, 2, 1]
+    assert publisher.batches[0][0] == {"event": "PostCreated", "event_id": 1, "post_id": 1}
+    assert await remaining_ids(session_factory) == []
+    assert relay.relayed == 5
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_rows_stay_for_the_next_pass(session_factory):
+    relay = OutboxRelay(OutboxEvent, FakePublisher(rejected={2, 4}), session_factory)
+
+    assert await relay.relay() == 3
+    assert await remaining_ids(session_factory) == [2, 4]
+
+    relay.publisher = FakePublisher()
+    assert await relay.relay() == 2
+    assert await remaining_ids(session_factory) == []
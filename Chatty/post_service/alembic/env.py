@@ -17,7 +17,9 @@ sys.path.append(str(BASE_DIR / "post_service"))
 
 from core.config import settings
 from models.comment import Base
+from models.image_blob import Base
 from models.like import Base
+from models.outbox import Base
 from models.post import Base
 
 # ========== Alembic config ==========
@@ -45,6 +47,12 @@ def run_migrations_offline():
 
 # ========== Online migrations ==========
 
+def _run_migrations_in_transaction(connection):
+    # Без begin_transaction изменения откатываются при закрытии соединения
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 async def run_migrations_online():
     connectable = async_engine_from_config(
         config.get_section(config.config_ini_section),
@@ -59,7 +67,7 @@ async def run_migrations_online():
                 compare_type=True,
             )
         )
-        await connection.run_sync(lambda conn: context.run_migrations())
+        await connection.run_sync(_run_migrations_in_transaction)
 
 
 
@@ -0,0 +1,29 @@
+"""posts (user_id, created_at DESC, id DESC) index
+
+Revision ID: 8f4e2b6d1a07
+Revises: 3c1d7a9e52b4
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4e2b6d1a07'
+down_revision: Union[str, None] = '3c1d7a9e52b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_posts_user_id_created_at',
+        'posts',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+def downgrade():
+    op.drop_index('ix_posts_user_id_created_at', table_name='posts')
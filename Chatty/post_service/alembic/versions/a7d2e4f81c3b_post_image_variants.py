@@ -0,0 +1,25 @@
+"""posts.image_variants
+
+Revision ID: a7d2e4f81c3b
+Revises: f3a8c1e5b920
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e4f81c3b'
+down_revision: Union[str, None] = 'f3a8c1e5b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('image_variants', sa.JSON(), nullable=True))
+
+def downgrade():
+    op.drop_column('posts', 'image_variants')
@@ -0,0 +1,34 @@
+"""image_blobs: content-addressed images with reference counts
+
+Revision ID: b3e9c7d15a42
+Revises: a7d2e4f81c3b
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9c7d15a42'
+down_revision: Union[str, None] = 'a7d2e4f81c3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'image_blobs',
+        sa.Column('object_key', sa.String(), primary_key=True),
+        sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('released_at', sa.DateTime(), nullable=True),
+        sa.Column('variants', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_image_blobs_released_at', 'image_blobs', ['released_at'])
+
+def downgrade():
+    op.drop_index('ix_image_blobs_released_at', table_name='image_blobs')
+    op.drop_table('image_blobs')
@@ -0,0 +1,33 @@
+"""posts like_count and comment_count
+
+Revision ID: c52a9f3e7d18
+Revises: 8f4e2b6d1a07
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52a9f3e7d18'
+down_revision: Union[str, None] = '8f4e2b6d1a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    # Заполняем счётчики для уже существующих постов
+    op.execute(
+        "UPDATE posts SET "
+        "like_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id), "
+        "comment_count = (SELECT count(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+
+def downgrade():
+    op.drop_column('posts', 'comment_count')
+    op.drop_column('posts', 'like_count')
@@ -0,0 +1,31 @@
+"""outbox: domain events written with the data change
+
+Revision ID: d7f1a3c9e264
+Revises: b3e9c7d15a42
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f1a3c9e264'
+down_revision: Union[str, None] = 'b3e9c7d15a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+def downgrade():
+    op.drop_table('outbox')
@@ -0,0 +1,33 @@
+"""likes unique (post_id, user_id)
+
+Revision ID: e91b4d2c6f35
+Revises: c52a9f3e7d18
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b4d2c6f35'
+down_revision: Union[str, None] = 'c52a9f3e7d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Дубликаты могли появиться из-за гонки SELECT-then-INSERT: оставляем самый ранний лайк
+    op.execute(
+        "DELETE FROM likes a USING likes b "
+        "WHERE a.post_id = b.post_id AND a.user_id = b.user_id AND a.id > b.id"
+    )
+    op.execute(
+        "UPDATE posts SET like_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id)"
+    )
+    op.create_unique_constraint('uq_likes_post_id_user_id', 'likes', ['post_id', 'user_id'])
+
+def downgrade():
+    op.drop_constraint('uq_likes_post_id_user_id', 'likes', type_='unique')
@@ -0,0 +1,25 @@
+"""comments (post_id, created_at, id) index
+
+Revision ID: f3a8c1e5b920
+Revises: e91b4d2c6f35
+Create Date: 2026-10-18 17:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1e5b920'
+down_revision: Union[str, None] = 'e91b4d2c6f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index('ix_comments_post_id_created_at', 'comments', ['post_id', 'created_at', 'id'])
+
+def downgrade():
+    op.drop_index('ix_comments_post_id_created_at', table_name='comments')
@@ -0,0 +1,78 @@
+"""
+Sustained like throughput on a handful of "viral" posts: one SELECT + INSERT +
+COMMIT per like (LIKES_WRITE_BEHIND=false) versus the write-behind LikeBuffer.
+
+Needs a migrated database at POST_DB_URL; the benchmark creates its own posts
+and deletes them afterwards. Run from the post_service dir:
+
+    python -m benchmarks.bench_likes --seconds 10 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import delete, func, select
+
+from core.config import settings
+from db.session import AsyncSessionLocal, engine
+from models.like import Like
+from models.post import Post
+from services.like_buffer import like_buffer
+from services.like_service import LikeService
+
+
+async def worker(post_ids: list[int], deadline: float, counter: list[int]):
+    async with AsyncSessionLocal() as db:
+        while time.perf_counter() < deadline:
+            # Уникальные пользователи: каждая операция — настоящий новый лайк
+            user_id = random.randrange(1, 2**31 - 1)
+            await LikeService.like_post(db, random.choice(post_ids), user_id)
+            counter[0] += 1
+
+
+async def run(mode: str, post_ids: list[int], seconds: float, concurrency: int):
+    settings.likes_write_behind = mode == "write-behind"
+    if settings.likes_write_behind:
+        await like_buffer.start()
+    counter = [0]
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(worker(post_ids, deadline, counter) for _ in range(concurrency)))
+    if settings.likes_write_behind:
+        await like_buffer.stop()
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        stored = await db.scalar(select(func.count()).select_from(Like).where(Like.post_id.in_(post_ids)))
+        counted = await db.scalar(select(func.sum(Post.like_count)).where(Post.id.in_(post_ids)))
+        await db.execute(delete(Like).where(Like.post_id.in_(post_ids)))
+        await db.execute(Post.__table__.update().where(Post.id.in_(post_ids)).values(like_count=0))
+        await db.commit()
+    print(f"{mode:13} {counter[0] / elapsed:9.0f} likes/s  stored={stored} like_count={counted}")
+
+
+async def main(seconds: float, concurrency: int, posts: int):
+    engine.echo = False
+    async with AsyncSessionLocal() as db:
+        created = [Post(user_id=0, title="bench", content="bench") for _ in range(posts)]
+        db.add_all(created)
+        await db.commit()
+        post_ids = [post.id for post in created]
+    try:
+        await run("direct", post_ids, seconds, concurrency)
+        await run("write-behind", post_ids, seconds, concurrency)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Post).where(Post.id.in_(post_ids)))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.concurrency, args.posts))
@@ -0,0 +1,96 @@
+"""
+Image upload throughput and peak Python memory: the old path (await file.read(),
+bytes() copy, put_object on the event loop, bucket_exists per upload) versus the
+streaming uploader, for distinct images and for the same image uploaded again
+(content-addressed keys skip the PUT).
+
+Needs object storage at S3_ENDPOINT (e.g. `docker compose up minio`); uploaded
+objects are removed afterwards. Run from the post_service dir:
+
+    python -m benchmarks.bench_upload --size-mb 8 --uploads 10 --concurrency 4
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from core.config import settings
+from storage.image_uploader import client, object_key_from_url, upload_image_to_s3
+
+
+async def upload_buffered(file: UploadFile) -> str:
+    # Прежняя реализация upload_image_to_s3; bytes обёрнуты в BytesIO, иначе put_object их не примет
+    unique_name = f"{uuid.uuid4()}.{file.filename.split('.')[-1]}"
+    file_data = await file.read()
+    if not client.bucket_exists(settings.s3_bucket_name):
+        client.make_bucket(settings.s3_bucket_name)
+    client.put_object(
+        bucket_name=settings.s3_bucket_name,
+        object_name=unique_name,
+        data=io.BytesIO(bytes(file_data)),
+        length=len(file_data),
+        content_type=file.content_type,
+    )
+    return f"{settings.s3_endpoint}/{settings.s3_bucket_name}/{unique_name}"
+
+
+def make_upload(payload: bytes) -> UploadFile:
+    # Как у Starlette: тело запроса уже во временном файле (SpooledTemporaryFile, 1 МиБ в памяти)
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(payload)
+    spool.seek(0)
+    return UploadFile(
+        spool, size=len(payload), filename="bench.jpg", headers=Headers({"content-type": "image/jpeg"})
+    )
+
+
+async def run(name: str, upload, payloads: list[bytes], concurrency: int):
+    files = [make_upload(payload) for payload in payloads]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(file: UploadFile) -> str:
+        async with semaphore:
+            return await upload(file)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    urls = await asyncio.gather(*(one(file) for file in files))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for file in files:
+        await file.close()
+    for url in set(urls):
+        client.remove_object(settings.s3_bucket_name, object_key_from_url(url))
+    megabytes = sum(map(len, payloads)) / 2**20
+    print(
+        f"{name:16} {megabytes / elapsed:8.1f} MB/s  {len(payloads) / elapsed:6.1f} uploads/s  "
+        f"peak={peak / 2**20:7.1f} MiB  objects={len(set(urls))}"
+    )
+
+
+async def main(size_mb: float, uploads: int, concurrency: int):
+    distinct = [os.urandom(int(size_mb * 2**20)) for _ in range(uploads)]
+    same = [distinct[0]] * uploads
+    settings.upload_max_bytes = max(settings.upload_max_bytes, len(distinct[0]))
+    await run("buffered", upload_buffered, distinct, concurrency)
+    await run("streaming", upload_image_to_s3, distinct, concurrency)
+    await run("buffered same", upload_buffered, same, concurrency)
+    await run("streaming same", upload_image_to_s3, same, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.size_mb, args.uploads, args.concurrency))
@@ -10,15 +10,73 @@ class Settings(BaseSettings):
     s3_bucket_name: str
     s3_access_key: str
     s3_secret_key: str
+    s3_region: str = "us-east-1"  # задан явно, чтобы клиент не запрашивал location бакета
+    s3_public_endpoint: str | None = None  # адрес хранилища для браузера, если отличается от s3_endpoint
+    s3_presign_expires: int = 900  # секунды
+    s3_upload_expire_days: int = 1  # через сколько дней хранилище удаляет неподтверждённые загрузки
+    s3_part_size: int = 5 * 1024 * 1024  # минимум для multipart-загрузки S3
+    s3_parallel_uploads: int = 1  # частей в полёте на одну загрузку; память ≈ (N + 1) * s3_part_size
+    upload_max_bytes: int = 10 * 1024 * 1024
+
+    # ---------- IMAGE VARIANTS ----------
+    image_variants_enabled: bool = True
+    image_variant_widths: list[int] = [320, 640, 1080]
+    image_variant_formats: list[str] = ["webp", "jpeg"]
+    image_webp_quality: int = 75
+    image_jpeg_quality: int = 80
+    image_workers: int = 2  # процессов в пуле
+    image_queue_max: int = 1000
+
+    # ---------- IMAGE GC ----------
+    image_gc_interval: float = 600  # секунды; 0 — сборка только вручную
+    image_gc_grace: float = 3600  # сколько объект без ссылок живёт до удаления
+    image_gc_batch_size: int = 100
 
     # ---------- JWT ----------
     jwt_secret: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # ---------- RABBITMQ ----------
+    rabbitmq_host: str = "rabbitmq"
+    rabbitmq_port: int = 5672
+    rabbitmq_user: str = "guest"
+    rabbitmq_password: str = "guest"
+    events_queue: str = "events"
+    outbox_poll_interval: float = 0.5  # секунды между опросами пустого outbox
+    outbox_batch_size: int = 100
+
     # ---------- SERVICE URLs ----------
     auth_service_url: str
 
+    # ---------- POSTS ----------
+    posts_batch_max: int = 500
+    posts_authors_max: int = 500
+    posts_per_author: int = 20
+    posts_per_author_max: int = 100
+
+    # ---------- COMMENTS ----------
+    comments_page_size: int = 50
+    comments_page_size_max: int = 200
+
+    # ---------- LIKES ----------
+    likes_write_behind: bool = True  # копить лайки в памяти и писать пачками
+    likes_flush_interval: float = 0.5
+    likes_max_pending: int = 10000
+    likes_status_max: int = 500
+
+    # ---------- COUNTERS ----------
+    counters_reconcile_interval: float = 0  # секунды; 0 — фоновая сверка выключена
+    counters_reconcile_batch_size: int = 1000
+
+    # ---------- HTTP CLIENT ----------
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 3.0
+    http2: bool = False
+
     # ---------- DEBUG ----------
     debug: bool = False
 
@@ -33,6 +91,10 @@ class Settings(BaseSettings):
     def async_database_url(self) -> str:
         return self.post_db_url
 
+    @property
+    def rabbitmq_url(self) -> str:
+        return f"amqp://{self.rabbitmq_user}:{self.rabbitmq_password}@{self.rabbitmq_host}:{self.rabbitmq_port}/"
+
 
 settings = Settings()
 
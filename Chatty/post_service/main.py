@@ -1,13 +1,51 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from routes import posts, comments, likes
+from services.counter_service import start_counter_reconciler, stop_counter_reconciler
+from services.image_blob_service import start_image_gc, stop_image_gc
+from services.image_variant_worker import image_variant_worker
+from services.outbox_service import outbox_relay
+from services.like_buffer import like_buffer
+from storage.image_uploader import ensure_bucket
+from utils.events import event_publisher
+from utils.http_client import start_http_client, close_http_client
 
-app = FastAPI(openapi_url="/openapi.json")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    try:
+        await asyncio.to_thread(ensure_bucket)
+    except Exception:
+        # MinIO может подняться позже сервиса — бакет проверится при первой загрузке
+        logger.warning("Object storage is not available at startup", exc_info=True)
+    await start_counter_reconciler()
+    await like_buffer.start()
+    await image_variant_worker.start()
+    await start_image_gc()
+    await outbox_relay.start()
+    yield
+    await outbox_relay.stop()
+    await stop_image_gc()
+    await image_variant_worker.stop()
+    await like_buffer.stop()
+    await stop_counter_reconciler()
+    await event_publisher.close()
+    await close_http_client()
+
+
+app = FastAPI(openapi_url="/openapi.json", lifespan=lifespan)
 
 # Подключаем маршруты
-app.include_router(posts.router, prefix="/posts", tags=["Posts"])
-app.include_router(comments.router, prefix="/comments", tags=["Comments"])
-app.include_router(likes.router, prefix="/likes", tags=["Likes"])
+# Префиксы задаются в самих роутерах
+app.include_router(posts.router)
+app.include_router(comments.router)
+app.include_router(likes.router)
 
 # Swagger поддержка JWT
 @app.get("/openapi.json", include_in_schema=False)
@@ -1,6 +1,7 @@
 from .post import Post
 from .comment import Comment
 from .like import Like
+from .image_blob import ImageBlob
+from .outbox import OutboxEvent
 
-__all__ = ["Post", "Comment", "Like"]
-
+__all__ = ["Post", "Comment", "Like", "ImageBlob", "OutboxEvent"]
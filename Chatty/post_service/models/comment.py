@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, ForeignKey, Text, func
+from sqlalchemy import Index, Integer, ForeignKey, Text, func
 from db.base import Base
 from datetime import datetime
 
@@ -14,3 +14,6 @@ class Comment(Base):
 
     post: Mapped["Post"] = relationship(back_populates="comments")
 
+
+# Комментарии поста по порядку: WHERE post_id = ? ORDER BY created_at, id
+Index("ix_comments_post_id_created_at", Comment.post_id, Comment.created_at, Comment.id)
@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, func
+from db.base import Base
+from datetime import datetime
+
+class ImageBlob(Base):
+    """Объект картинки в хранилище и число постов, которые на него ссылаются.
+
+    Одинаковые картинки хранятся один раз под ключом из SHA-256 содержимого.
+    Когда ссылок не остаётся, released_at фиксирует момент, и через
+    image_gc_grace секунд сборщик удаляет объект вместе с вариантами. Строка
+    появляется ещё до загрузки (ref_count=0), так что объект, пост для которого
+    не был создан, тоже будет удалён.
+    """
+    __tablename__ = "image_blobs"
+
+    object_key: Mapped[str] = mapped_column(primary_key=True)
+    ref_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    released_at: Mapped[datetime | None] = mapped_column(nullable=True, index=True)
+    # Уменьшенные копии строятся один раз на объект и переиспользуются всеми его постами
+    variants: Mapped[list | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, BigInteger, func
+from db.base import Base
+from datetime import datetime
+
+class OutboxEvent(Base):
+    """Доменное событие, записанное в той же транзакции, что и изменение данных.
+
+    Relay (services/outbox_service.py) публикует строки в RabbitMQ и удаляет их
+    после подтверждения брокера: событие уходит, только если транзакция
+    закоммичена, и уходит хотя бы один раз.
+    """
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
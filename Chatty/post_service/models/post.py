@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, Text, func
+from sqlalchemy import JSON, Index, Integer, Text, func
 from db.base import Base
 from typing import List
 from datetime import datetime
@@ -12,8 +12,16 @@ class Post(Base):
     title: Mapped[str] = mapped_column()
     content: Mapped[str] = mapped_column(Text)
     image_url: Mapped[str | None] = mapped_column(nullable=True)
+    # Уменьшенные копии image_url: [{"width", "format", "url", "size"}], заполняет воркер вариантов
+    image_variants: Mapped[list | None] = mapped_column(JSON(none_as_null=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    # Денормализованные счётчики: меняются в той же транзакции, что и лайк/комментарий
+    like_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    comment_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     comments: Mapped[List["Comment"]] = relationship(back_populates="post", cascade="all, delete")
     likes: Mapped[List["Like"]] = relationship(back_populates="post", cascade="all, delete")
 
+
+# Лента автора и выборка последних постов по авторам: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+Index("ix_posts_user_id_created_at", Post.user_id, Post.created_at.desc(), Post.id.desc())
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional
 
 from api.deps import get_db, get_current_user
-from schemas.comment import CommentCreate, CommentUpdate, CommentRead
+from core.config import settings
+from schemas.comment import CommentCreate, CommentUpdate, CommentRead, CommentPage
 from services.comment_service import CommentService
+from utils.cursor import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 security_scheme = HTTPBearer()
@@ -18,9 +20,19 @@ async def create_comment(
 ):
     return await CommentService.create_comment(db, comment_in, user_id)
 
-@router.get("/", response_model=List[CommentRead])
-async def get_comments(post_id: int, db: AsyncSession = Depends(get_db)):
-    return await CommentService.get_comments_for_post(db, post_id)
+@router.get("/", response_model=CommentPage)
+async def get_comments(
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.comments_page_size, ge=1, le=settings.comments_page_size_max),
+    db: AsyncSession = Depends(get_db),
+):
+    """Комментарии поста от старых к новым; next_cursor передаётся в cursor следующего запроса."""
+    comments, last = await CommentService.get_comments_for_post(
+        db, post_id, limit, decode_cursor(cursor) if cursor else None
+    )
+    next_cursor = encode_cursor(last.created_at, last.id) if last else None
+    return {"comments": comments, "next_cursor": next_cursor}
 
 @router.patch("/{comment_id}", response_model=CommentRead, dependencies=[Depends(security_scheme)])
 async def update_comment(
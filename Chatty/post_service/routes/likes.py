@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
 
 from api.deps import get_db, get_current_user
-from schemas.like import LikeCreate
+from core.config import settings
+from schemas.like import LikeCreate, LikeStatus
 from services.like_service import LikeService
 
 router = APIRouter(prefix="/likes", tags=["Likes"])
@@ -15,8 +17,9 @@ async def like_post(
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user),
 ):
-    await LikeService.like_post(db, like_in.post_id, user_id)
-    return {"detail": "Liked"}
+    changed = await LikeService.like_post(db, like_in.post_id, user_id)
+    # changed: True — лайк поставлен, False — уже был, None — принят в очередь на запись
+    return {"detail": "Liked", "changed": changed}
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(security_scheme)])
 async def unlike_post(
@@ -26,3 +29,14 @@ async def unlike_post(
 ):
     await LikeService.unlike_post(db, like_in.post_id, user_id)
     return None
+
+@router.get("/status", response_model=LikeStatus, dependencies=[Depends(security_scheme)])
+async def get_like_status(
+    post_ids: List[int] = Query(...),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """Какие из переданных постов текущий пользователь уже лайкнул."""
+    if len(post_ids) > settings.likes_status_max:
+        raise HTTPException(status_code=400, detail=f"Не больше {settings.likes_status_max} постов за запрос")
+    return {"liked_post_ids": await LikeService.get_liked_post_ids(db, post_ids, user_id)}
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from api.deps import get_db, get_current_user
-from schemas.post import PostCreate, PostUpdate, PostRead
+from core.config import settings
+from schemas.post import (
+    PostCreate, PostUpdate, PostRead, PostBatchRequest, PostPage,
+    ImageUploadRequest, ImageUploadTicket, ImageUploadConfirm,
+)
+from services.image_blob_service import ImageBlobService
+from services.image_variant_worker import image_variant_worker
 from services.post_service import PostService
-from storage.image_uploader import upload_image_to_s3
+from storage.image_uploader import upload_image_to_s3, presign_image_upload, confirm_image_upload
+from utils.cursor import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 security_scheme = HTTPBearer()
@@ -19,9 +26,47 @@ async def create_post(
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user),
 ):
-    image_url = await upload_image_to_s3(file) if file else None
+    image_url = await upload_image_to_s3(file, reserve=ImageBlobService.reserve) if file else None
     post_data = PostCreate(title=title, content=content, image_url=image_url)
-    return await PostService.create_post(db, post_data, user_id)
+    post = await PostService.create_post(db, post_data, user_id)
+    if image_url:
+        image_variant_worker.submit(post.id, image_url)
+    return post
+
+async def _latest_posts_page(db: AsyncSession, user_ids: List[int], per_author: int, cursor: Optional[str]):
+    if len(user_ids) > settings.posts_authors_max:
+        raise HTTPException(status_code=400, detail=f"Не больше {settings.posts_authors_max} авторов за запрос")
+    posts, next_key = await PostService.get_latest_posts_by_authors(
+        db, user_ids, per_author, decode_cursor(cursor) if cursor else None
+    )
+    return {"posts": posts, "next_cursor": encode_cursor(*next_key) if next_key else None}
+
+@router.get("", response_model=PostPage)
+async def get_latest_posts(
+    user_ids: List[int] = Query(...),
+    per_author: int = Query(settings.posts_per_author, ge=1, le=settings.posts_per_author_max),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Последние посты нескольких авторов (по per_author на каждого), от новых к старым."""
+    return await _latest_posts_page(db, user_ids, per_author, cursor)
+
+@router.get("/users/{user_id}/posts", response_model=PostPage)
+async def get_user_posts(
+    user_id: int,
+    limit: int = Query(settings.posts_per_author, ge=1, le=settings.posts_per_author_max),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Посты одного автора постранично; next_cursor передаётся в cursor следующего запроса."""
+    return await _latest_posts_page(db, [user_id], limit, cursor)
+
+@router.post("/batch", response_model=List[PostRead])
+async def get_posts_batch(request: PostBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Посты по списку id одним запросом; удалённые просто отсутствуют в ответе."""
+    if len(request.ids) > settings.posts_batch_max:
+        raise HTTPException(status_code=400, detail=f"Не больше {settings.posts_batch_max} постов за запрос")
+    return await PostService.get_posts_by_ids(db, request.ids)
 
 @router.get("/{post_id}", response_model=PostRead)
 async def get_post(post_id: int, db: AsyncSession = Depends(get_db)):
@@ -36,6 +81,32 @@ async def update_post(
 ):
     return await PostService.update_post(db, post_id, post_update, user_id)
 
+@router.post("/{post_id}/image/upload-url", response_model=ImageUploadTicket, dependencies=[Depends(security_scheme)])
+async def create_image_upload_url(
+    post_id: int,
+    request: ImageUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """Шаг 1: presigned PUT для картинки поста. Файл грузится прямо в хранилище, минуя сервис."""
+    await PostService.get_own_post(db, post_id, user_id)
+    object_key, upload_url = presign_image_upload(post_id, request.filename)
+    return {"object_key": object_key, "upload_url": upload_url, "expires_in": settings.s3_presign_expires}
+
+@router.post("/{post_id}/image", response_model=PostRead, dependencies=[Depends(security_scheme)])
+async def confirm_image(
+    post_id: int,
+    request: ImageUploadConfirm,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """Шаг 2: после PUT проверяет объект в хранилище и прикрепляет его к посту."""
+    post = await PostService.get_own_post(db, post_id, user_id)
+    image_url = await confirm_image_upload(post_id, request.object_key)
+    post = await PostService.set_image_url(db, post, image_url)
+    image_variant_worker.submit(post.id, image_url)
+    return post
+
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(security_scheme)])
 async def delete_post(
     post_id: int,
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class CommentCreate(BaseModel):
@@ -10,6 +13,11 @@ class CommentUpdate(BaseModel):
 class CommentRead(CommentCreate):
     id: int
     user_id: int
+    created_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
+
+class CommentPage(BaseModel):
+    comments: List[CommentRead]
+    next_cursor: Optional[str] = None
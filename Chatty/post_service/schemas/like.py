@@ -1,4 +1,9 @@
+from typing import List
+
 from pydantic import BaseModel
 
 class LikeCreate(BaseModel):
     post_id: int
+
+class LikeStatus(BaseModel):
+    liked_post_ids: List[int]
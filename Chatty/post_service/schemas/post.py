@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 class PostCreate(BaseModel):
     title: str
@@ -10,9 +11,37 @@ class PostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
 
+class ImageVariant(BaseModel):
+    width: int
+    format: str
+    url: str
+    size: int
+
 class PostRead(PostCreate):
     id: int
     user_id: int
+    image_variants: Optional[List[ImageVariant]] = None
+    created_at: Optional[datetime] = None
+    like_count: int = 0
+    comment_count: int = 0
 
     class Config:
         orm_mode = True
+
+class PostBatchRequest(BaseModel):
+    ids: List[int]
+
+class PostPage(BaseModel):
+    posts: List[PostRead]
+    next_cursor: Optional[str] = None
+
+class ImageUploadRequest(BaseModel):
+    filename: str
+
+class ImageUploadTicket(BaseModel):
+    object_key: str
+    upload_url: str
+    expires_in: int
+
+class ImageUploadConfirm(BaseModel):
+    object_key: str
@@ -1,23 +1,48 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import select, tuple_, update
 from fastapi import HTTPException
 
-from models import Comment
+from models import Comment, Post
 from schemas.comment import CommentCreate, CommentUpdate
+from services.outbox_service import OutboxService
 
 class CommentService:
     @staticmethod
     async def create_comment(db: AsyncSession, comment_in: CommentCreate, user_id: int):
         comment = Comment(**comment_in.dict(), user_id=user_id)
         db.add(comment)
+        await db.execute(
+            update(Post).where(Post.id == comment.post_id).values(comment_count=Post.comment_count + 1)
+        )
+        await db.flush()
+        OutboxService.add(
+            db, "CommentCreated", {"comment_id": comment.id, "post_id": comment.post_id, "user_id": user_id}
+        )
         await db.commit()
         await db.refresh(comment)
         return comment
 
     @staticmethod
-    async def get_comments_for_post(db: AsyncSession, post_id: int):
-        result = await db.execute(select(Comment).where(Comment.post_id == post_id))
-        return result.scalars().all()
+    async def get_comments_for_post(
+        db: AsyncSession, post_id: int, limit: int, after: tuple[datetime, int] | None = None
+    ) -> tuple[list[Comment], Comment | None]:
+        """Страница комментариев от старых к новым и последний комментарий страницы,
+        если дальше есть ещё (по нему строится курсор)."""
+        # Keyset по индексу (post_id, created_at, id): время не зависит от глубины страницы
+        query = (
+            select(Comment)
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+        result = await db.execute(query)
+        comments = result.scalars().all()
+        last = comments[limit - 1] if len(comments) > limit else None
+        return comments[:limit], last
 
     @staticmethod
     async def update_comment(db: AsyncSession, comment_id: int, comment_in: CommentUpdate, user_id: int):
@@ -35,4 +60,7 @@ class CommentService:
         if not comment or comment.user_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
         await db.delete(comment)
+        await db.execute(
+            update(Post).where(Post.id == comment.post_id).values(comment_count=Post.comment_count - 1)
+        )
         await db.commit()
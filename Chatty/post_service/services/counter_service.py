@@ -0,0 +1,114 @@
+import asyncio
+import logging
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.session import AsyncSessionLocal
+from models import Comment, Like, Post
+
+logger = logging.getLogger(__name__)
+
+_task: asyncio.Task | None = None
+
+
+class CounterService:
+    @staticmethod
+    async def reconcile_batch(db: AsyncSession, after_id: int, batch_size: int) -> tuple[int | None, int]:
+        """Пересчитывает like_count/comment_count для следующей пачки постов с id > after_id.
+
+        Возвращает id последнего поста в пачке (None, если посты закончились)
+        и число исправленных постов.
+        """
+        # Блокируем пачку: конкурентный лайк ждёт нашего коммита и прибавит единицу уже
+        # к пересчитанному значению, а его ещё не закоммиченная строка в подсчёт не попадёт
+        result = await db.execute(
+            select(Post.id).where(Post.id > after_id).order_by(Post.id).limit(batch_size).with_for_update()
+        )
+        post_ids = result.scalars().all()
+        if not post_ids:
+            return None, 0
+        first_id, last_id = post_ids[0], post_ids[-1]
+
+        likes = (
+            select(Like.post_id, func.count().label("n"))
+            .where(Like.post_id.between(first_id, last_id))
+            .group_by(Like.post_id)
+            .subquery()
+        )
+        comments = (
+            select(Comment.post_id, func.count().label("n"))
+            .where(Comment.post_id.between(first_id, last_id))
+            .group_by(Comment.post_id)
+            .subquery()
+        )
+        actual = (
+            select(
+                Post.id,
+                func.coalesce(likes.c.n, 0).label("like_count"),
+                func.coalesce(comments.c.n, 0).label("comment_count"),
+            )
+            .outerjoin(likes, likes.c.post_id == Post.id)
+            .outerjoin(comments, comments.c.post_id == Post.id)
+            .where(Post.id.between(first_id, last_id))
+            .subquery()
+        )
+        result = await db.execute(
+            update(Post)
+            .where(
+                Post.id == actual.c.id,
+                or_(Post.like_count != actual.c.like_count, Post.comment_count != actual.c.comment_count),
+            )
+            .values(like_count=actual.c.like_count, comment_count=actual.c.comment_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return last_id, result.rowcount
+
+    @staticmethod
+    async def reconcile_all(batch_size: int = settings.counters_reconcile_batch_size) -> int:
+        """Проходит по всем постам пачками, каждая в своей короткой транзакции."""
+        fixed = 0
+        after_id = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                last_id, batch_fixed = await CounterService.reconcile_batch(db, after_id, batch_size)
+            if last_id is None:
+                break
+            fixed += batch_fixed
+            after_id = last_id
+        if fixed:
+            logger.warning("Reconciled like/comment counters of %d posts", fixed)
+        return fixed
+
+
+async def _reconcile_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await CounterService.reconcile_all()
+        except Exception:
+            logger.exception("Counter reconciliation failed")
+
+
+async def start_counter_reconciler():
+    global _task
+    if settings.counters_reconcile_interval > 0 and _task is None:
+        _task = asyncio.create_task(_reconcile_periodically(settings.counters_reconcile_interval))
+
+
+async def stop_counter_reconciler():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+
+if __name__ == "__main__":
+    # Разовый запуск: python -m services.counter_service
+    print(f"Fixed {asyncio.run(CounterService.reconcile_all())} posts")
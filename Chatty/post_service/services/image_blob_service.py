@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.session import AsyncSessionLocal
+from models.image_blob import ImageBlob
+from storage.image_uploader import object_key_from_url
+from storage.image_variants import remove_image
+
+logger = logging.getLogger(__name__)
+
+_task: asyncio.Task | None = None
+
+
+class ImageBlobService:
+    """Счётчики ссылок постов на объекты картинок.
+
+    acquire/release не коммитят: они выполняются в транзакции, которая меняет
+    сам пост, поэтому счётчик не расходится с posts.image_url.
+    """
+
+    @staticmethod
+    async def reserve(object_key: str):
+        """Откладывает удаление объекта на image_gc_grace секунд, считая от этого момента.
+
+        Вызывается загрузкой до HEAD, который может пропустить PUT, и коммитится сразу:
+        если сборщик уже удаляет объект, reserve дождётся его коммита и HEAD объекта
+        не найдёт. Если пост так и не будет создан, объект без ссылок уберёт сборщик.
+        """
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                insert(ImageBlob)
+                .values(object_key=object_key, ref_count=0, released_at=func.now())
+                .on_conflict_do_update(
+                    index_elements=[ImageBlob.object_key],
+                    set_={"released_at": case((ImageBlob.ref_count <= 0, func.now()), else_=None)},
+                )
+            )
+            await db.commit()
+
+    @staticmethod
+    async def acquire(db: AsyncSession, image_url: str):
+        await db.execute(
+            insert(ImageBlob)
+            .values(object_key=object_key_from_url(image_url), ref_count=1)
+            .on_conflict_do_update(
+                index_elements=[ImageBlob.object_key],
+                set_={"ref_count": ImageBlob.ref_count + 1, "released_at": None},
+            )
+        )
+
+    @staticmethod
+    async def release(db: AsyncSession, image_url: str):
+        # Картинки, загруженные до появления таблицы, в ней не значатся и не удаляются
+        await db.execute(
+            update(ImageBlob)
+            .where(ImageBlob.object_key == object_key_from_url(image_url))
+            .values(
+                ref_count=ImageBlob.ref_count - 1,
+                released_at=case((ImageBlob.ref_count <= 1, func.now()), else_=None),
+            )
+        )
+
+    @staticmethod
+    async def get_variants(db: AsyncSession, image_url: str) -> list | None:
+        return await db.scalar(
+            select(ImageBlob.variants).where(ImageBlob.object_key == object_key_from_url(image_url))
+        )
+
+    @staticmethod
+    async def set_variants(db: AsyncSession, image_url: str, variants: list):
+        await db.execute(
+            update(ImageBlob)
+            .where(ImageBlob.object_key == object_key_from_url(image_url))
+            .values(variants=variants)
+        )
+
+    @staticmethod
+    async def collect_batch(db: AsyncSession, grace: float, batch_size: int) -> int:
+        """Удаляет из хранилища и из таблицы пачку объектов, на которые давно никто не ссылается.
+
+        Задержка в `grace` секунд нужна загрузке, которая уже увидела объект в хранилище
+        и пропустила PUT, но ещё не закоммитила пост: её reserve перед HEAD сдвинул
+        released_at, а acquire вернёт объекту ссылку. Строки блокируются на время
+        удаления, так что параллельный reserve дождётся его.
+        """
+        result = await db.execute(
+            select(ImageBlob.object_key)
+            .where(
+                ImageBlob.ref_count <= 0,
+                ImageBlob.released_at < func.now() - timedelta(seconds=grace),
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        object_keys = result.scalars().all()
+        if not object_keys:
+            return 0
+        for object_key in object_keys:
+            await asyncio.to_thread(remove_image, object_key)
+        await db.execute(delete(ImageBlob).where(ImageBlob.object_key.in_(object_keys)))
+        await db.commit()
+        return len(object_keys)
+
+    @staticmethod
+    async def collect_garbage(
+        grace: float = settings.image_gc_grace,
+        batch_size: int = settings.image_gc_batch_size,
+    ) -> int:
+        removed = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch_removed = await ImageBlobService.collect_batch(db, grace, batch_size)
+            if not batch_removed:
+                break
+            removed += batch_removed
+        if removed:
+            logger.info("Removed %d unreferenced images", removed)
+        return removed
+
+
+async def _collect_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ImageBlobService.collect_garbage()
+        except Exception:
+            logger.exception("Image garbage collection failed")
+
+
+async def start_image_gc():
+    global _task
+    if settings.image_gc_interval > 0 and _task is None:
+        _task = asyncio.create_task(_collect_periodically(settings.image_gc_interval))
+
+
+async def stop_image_gc():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+
+if __name__ == "__main__":
+    # Разовый запуск: python -m services.image_blob_service
+    print(f"Removed {asyncio.run(ImageBlobService.collect_garbage())} images")
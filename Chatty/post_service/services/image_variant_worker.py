@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, update
+
+from core.config import settings
+from db.session import AsyncSessionLocal
+from models.post import Post
+from services.image_blob_service import ImageBlobService
+from storage.image_uploader import object_key_from_url
+from storage.image_variants import render_variants
+
+logger = logging.getLogger(__name__)
+
+
+class ImageVariantWorker:
+    """Строит уменьшенные копии картинок постов вне пути запроса.
+
+    После загрузки картинки пост ставится в очередь; несколько задач разбирают её и
+    отдают тяжёлую работу (декодирование, ресайз, сжатие) пулу процессов. Готовые
+    варианты записываются в Post.image_variants, только если картинка поста за это
+    время не сменилась.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        workers: int = settings.image_workers,
+        max_queued: int = settings.image_queue_max,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.processed = 0
+        self._queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue(max_queued)
+        self._pool: ProcessPoolExecutor | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, post_id: int, image_url: str) -> bool:
+        """Ставит картинку поста в очередь, не дожидаясь обработки. False — очередь переполнена."""
+        if not settings.image_variants_enabled:
+            return False
+        try:
+            self._queue.put_nowait((post_id, image_url))
+            return True
+        except asyncio.QueueFull:
+            # Пост останется без вариантов и отдаст оригинал; догоняется `python -m services.image_variant_worker`
+            logger.warning("Image variant queue is full, skipping post %d", post_id)
+            return False
+
+    async def process(self, post_id: int, image_url: str):
+        async with self.session_factory() as db:
+            # Та же картинка у другого поста: варианты уже построены
+            variants = await ImageBlobService.get_variants(db, image_url)
+        if variants is None:
+            loop = asyncio.get_running_loop()
+            variants = await loop.run_in_executor(
+                self._pool,
+                render_variants,
+                object_key_from_url(image_url),
+                settings.image_variant_widths,
+                settings.image_variant_formats,
+            )
+        async with self.session_factory() as db:
+            await ImageBlobService.set_variants(db, image_url, variants)
+            await db.execute(
+                update(Post)
+                .where(Post.id == post_id, Post.image_url == image_url)
+                .values(image_variants=variants)
+            )
+            await db.commit()
+        self.processed += 1
+
+    async def _run(self):
+        while True:
+            post_id, image_url = await self._queue.get()
+            try:
+                await self.process(post_id, image_url)
+            except Exception:
+                logger.exception("Failed to build image variants for post %d", post_id)
+            finally:
+                self._queue.task_done()
+
+    async def join(self):
+        """Ждёт, пока очередь не опустеет."""
+        await self._queue.join()
+
+    async def start(self):
+        if self._tasks or not settings.image_variants_enabled:
+            return
+        # spawn: дочерние процессы не наследуют сокеты и event loop родителя
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+image_variant_worker = ImageVariantWorker()
+
+
+async def build_missing_variants(batch_size: int = 100) -> int:
+    """Разовая догонка: варианты для постов с картинкой, но без вариантов."""
+    await image_variant_worker.start()
+    done = 0
+    after_id = 0
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Post.id, Post.image_url)
+                    .where(Post.id > after_id, Post.image_url.is_not(None), Post.image_variants.is_(None))
+                    .order_by(Post.id)
+                    .limit(batch_size)
+                )
+                rows = result.all()
+            if not rows:
+                break
+            for post_id, image_url in rows:
+                await image_variant_worker._queue.put((post_id, image_url))
+            await image_variant_worker.join()
+            done += len(rows)
+            after_id = rows[-1][0]
+    finally:
+        await image_variant_worker.stop()
+    return done
+
+
+if __name__ == "__main__":
+    # Разовый запуск: python -m services.image_variant_worker
+    print(f"Processed {asyncio.run(build_missing_variants())} posts")
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections import Counter
+
+from sqlalchemy import Integer, column, delete, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from core.config import settings
+from db.session import AsyncSessionLocal
+from models.like import Like
+from models.post import Post
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """Копит намерения лайкнуть/снять лайк в памяти и пишет их в БД пачками.
+
+    Для каждой пары (post_id, user_id) остаётся только последнее намерение, поэтому
+    «лайк-анлайк-лайк» превращается в одну вставку. Раз в `flush_interval` секунд все
+    лайки вставляются одним INSERT ... ON CONFLICT DO NOTHING, а снятые — одним DELETE;
+    счётчики постов меняются в той же транзакции на фактическое число изменённых строк.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        flush_interval: float = settings.likes_flush_interval,
+        max_pending: int = settings.likes_max_pending,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.flushed = 0
+        self._pending: dict[tuple[int, int], bool] = {}
+        self._writing: dict[tuple[int, int], bool] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def intent(self, post_id: int, user_id: int) -> bool | None:
+        """Последнее ещё не записанное намерение пользователя по посту, если есть."""
+        key = (post_id, user_id)
+        return self._pending.get(key, self._writing.get(key))
+
+    async def add(self, post_id: int, user_id: int, liked: bool):
+        self._pending[(post_id, user_id)] = liked
+        if len(self._pending) >= self.max_pending:
+            # Обратное давление: запрос подождёт, пока буфер не сбросится
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            intents, self._pending = self._pending, {}
+            self._writing = intents
+            try:
+                await self._write(intents)
+                self.flushed += len(intents)
+            except Exception:
+                logger.exception("Failed to write %d like intents, will retry", len(intents))
+                # Более свежие намерения, пришедшие во время записи, важнее возвращаемых
+                self._pending = {**intents, **self._pending}
+            finally:
+                self._writing = {}
+
+    async def _write(self, intents: dict[tuple[int, int], bool]):
+        liked = [key for key, value in intents.items() if value]
+        unliked = [key for key, value in intents.items() if not value]
+        deltas: Counter[int] = Counter()
+
+        async with self.session_factory() as db:
+            for start in range(0, len(liked), self.CHUNK_SIZE):
+                rows = values(column("post_id", Integer), column("user_id", Integer), name="intents").data(
+                    liked[start:start + self.CHUNK_SIZE]
+                )
+                # JOIN posts отбрасывает лайки удалённых постов вместо ошибки внешнего ключа на всю пачку
+                result = await db.execute(
+                    insert(Like)
+                    .from_select(
+                        ["post_id", "user_id"],
+                        select(rows.c.post_id, rows.c.user_id).join(Post, Post.id == rows.c.post_id),
+                    )
+                    .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+                    .returning(Like.post_id)
+                )
+                deltas.update(result.scalars().all())
+
+            for start in range(0, len(unliked), self.CHUNK_SIZE):
+                result = await db.execute(
+                    delete(Like)
+                    .where(tuple_(Like.post_id, Like.user_id).in_(unliked[start:start + self.CHUNK_SIZE]))
+                    .returning(Like.post_id)
+                )
+                deltas.subtract(result.scalars().all())
+
+            changed = [(post_id, delta) for post_id, delta in deltas.items() if delta]
+            for start in range(0, len(changed), self.CHUNK_SIZE):
+                counts = values(column("post_id", Integer), column("delta", Integer), name="deltas").data(
+                    changed[start:start + self.CHUNK_SIZE]
+                )
+                await db.execute(
+                    update(Post)
+                    .where(Post.id == counts.c.post_id)
+                    .values(like_count=Post.like_count + counts.c.delta)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+like_buffer = LikeBuffer()
@@ -1,22 +1,73 @@
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 from models.like import Like
+from models.post import Post
+from core.config import settings
+from services.like_buffer import like_buffer
 
 class LikeService:
     @staticmethod
-    async def like_post(db: AsyncSession, post_id: int, user_id: int):
+    async def _apply(db: AsyncSession, change, delta: int) -> bool:
+        # Одна инструкция: WITH change AS (INSERT/DELETE ... RETURNING post_id)
+        # UPDATE posts SET like_count = like_count ± 1 ... — без гонки SELECT-then-INSERT
+        changed = change.returning(Like.post_id).cte("change")
         result = await db.execute(
-            select(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+            update(Post)
+            .where(Post.id.in_(select(changed.c.post_id)))
+            .values(like_count=Post.like_count + delta)
+            .returning(Post.id)
+            .execution_options(synchronize_session=False)
         )
-        like = result.scalar_one_or_none()
-        if not like:
-            like = Like(post_id=post_id, user_id=user_id)
-            db.add(like)
-            await db.commit()
+        updated = result.scalar_one_or_none() is not None
+        await db.commit()
+        return updated
 
     @staticmethod
-    async def unlike_post(db: AsyncSession, post_id: int, user_id: int):
-        await db.execute(
-            delete(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+    async def like_post(db: AsyncSession, post_id: int, user_id: int) -> bool | None:
+        """Ставит лайк идемпотентно. Возвращает True, если лайка ещё не было,
+        и None, если лайк поставлен в очередь на запись (LIKES_WRITE_BEHIND).
+
+        В очереди запрос не ходит в БД: лайк несуществующего поста отбросит
+        JOIN posts при записи пачки (LikeBuffer._write)."""
+        if settings.likes_write_behind:
+            await like_buffer.add(post_id, user_id, liked=True)
+            return None
+        change = (
+            insert(Like)
+            .values(post_id=post_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
         )
-        await db.commit()
+        try:
+            return await LikeService._apply(db, change, +1)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Post not found")
+
+    @staticmethod
+    async def unlike_post(db: AsyncSession, post_id: int, user_id: int) -> bool | None:
+        if settings.likes_write_behind:
+            await like_buffer.add(post_id, user_id, liked=False)
+            return None
+        change = delete(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+        return await LikeService._apply(db, change, -1)
+
+    @staticmethod
+    async def get_liked_post_ids(db: AsyncSession, post_ids: list[int], user_id: int) -> list[int]:
+        """Какие из постов пользователь лайкнул — одним запросом по индексу (post_id, user_id)."""
+        if not post_ids:
+            return []
+        result = await db.execute(
+            select(Like.post_id).where(Like.post_id.in_(set(post_ids)), Like.user_id == user_id)
+        )
+        liked = set(result.scalars().all())
+        # Ещё не записанные намерения из буфера важнее состояния в БД
+        for post_id in post_ids:
+            intent = like_buffer.intent(post_id, user_id)
+            if intent is True:
+                liked.add(post_id)
+            elif intent is False:
+                liked.discard(post_id)
+        return [post_id for post_id in dict.fromkeys(post_ids) if post_id in liked]
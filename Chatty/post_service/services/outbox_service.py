@@ -0,0 +1,29 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.outbox import OutboxRelay
+from core.config import settings
+from db.session import AsyncSessionLocal
+from models.outbox import OutboxEvent
+from utils.events import event_publisher
+
+
+class OutboxService:
+    """Transactional outbox: события пишутся в БД вместе с данными и публикуются отдельно.
+
+    add() не коммитит: строка попадает в транзакцию, которая создаёт пост или
+    комментарий, поэтому событие не потеряется и не уйдёт раньше коммита.
+    Публикует строки outbox_relay.
+    """
+
+    @staticmethod
+    def add(db: AsyncSession, event_type: str, payload: dict):
+        db.add(OutboxEvent(event_type=event_type, payload=payload))
+
+
+outbox_relay = OutboxRelay(
+    OutboxEvent,
+    event_publisher,
+    session_factory=AsyncSessionLocal,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+)
@@ -1,15 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from sqlalchemy import Integer, func, literal, select, true, tuple_
 from fastapi import HTTPException
 
 from models.post import Post
 from schemas.post import PostCreate, PostUpdate
+from services.image_blob_service import ImageBlobService
+from services.outbox_service import OutboxService
 
 class PostService:
     @staticmethod
     async def create_post(db: AsyncSession, post_in: PostCreate, user_id: int):
         post = Post(**post_in.dict(), user_id=user_id)
         db.add(post)
+        if post.image_url:
+            await ImageBlobService.acquire(db, post.image_url)
+        await db.flush()  # нужен post.id для события
+        OutboxService.add(db, "PostCreated", {"post_id": post.id, "user_id": user_id})
         await db.commit()
         await db.refresh(post)
         return post
@@ -21,6 +31,76 @@ class PostService:
             raise HTTPException(status_code=404, detail="Post not found")
         return post
 
+    @staticmethod
+    async def get_posts_by_ids(db: AsyncSession, post_ids: list[int]):
+        if not post_ids:
+            return []
+        result = await db.execute(select(Post).where(Post.id.in_(set(post_ids))))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_latest_posts_by_authors(
+        db: AsyncSession,
+        user_ids: list[int],
+        per_author: int,
+        cursor: tuple[datetime, int] | None = None,
+    ) -> tuple[list[Post], tuple[datetime, int] | None]:
+        """Последние `per_author` постов каждого автора старше курсора, от новых к старым.
+
+        Возвращает посты и курсор следующей страницы. Если у кого-то из авторов окно
+        заполнено, ответ обрезается по самому новому концу таких окон: всё, что новее
+        курсора, гарантированно присутствует, а остальное придёт на следующей странице.
+        """
+        if not user_ids:
+            return [], None
+
+        # FROM unnest(:ids) JOIN LATERAL (... LIMIT :per_author): по одному проходу
+        # индекса (user_id, created_at DESC, id DESC) на автора
+        authors = func.unnest(literal(sorted(set(user_ids)), ARRAY(Integer))).table_valued("user_id").render_derived(name="authors")
+        latest = select(Post).where(Post.user_id == authors.c.user_id)
+        if cursor is not None:
+            latest = latest.where(tuple_(Post.created_at, Post.id) < tuple_(*cursor))
+        latest = latest.order_by(Post.created_at.desc(), Post.id.desc()).limit(per_author).lateral("latest")
+        latest_post = aliased(Post, latest)
+        result = await db.execute(
+            select(latest_post)
+            .select_from(authors)
+            .join(latest, true())
+            .order_by(latest_post.created_at.desc(), latest_post.id.desc())
+        )
+        posts = result.scalars().all()
+
+        counts: dict[int, int] = {}
+        window_ends: dict[int, tuple[datetime, int]] = {}
+        for post in posts:
+            counts[post.user_id] = counts.get(post.user_id, 0) + 1
+            window_ends[post.user_id] = (post.created_at, post.id)
+        full = [window_ends[user_id] for user_id, count in counts.items() if count == per_author]
+        if not full:
+            return posts, None
+        next_cursor = max(full)
+        return [post for post in posts if (post.created_at, post.id) >= next_cursor], next_cursor
+
+    @staticmethod
+    async def get_own_post(db: AsyncSession, post_id: int, user_id: int):
+        post = await db.get(Post, post_id)
+        if not post or post.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return post
+
+    @staticmethod
+    async def set_image_url(db: AsyncSession, post: Post, image_url: str):
+        if post.image_url == image_url:
+            return post
+        if post.image_url:
+            await ImageBlobService.release(db, post.image_url)
+        await ImageBlobService.acquire(db, image_url)
+        post.image_url = image_url
+        post.image_variants = None  # старые варианты относятся к прежней картинке
+        await db.commit()
+        await db.refresh(post)
+        return post
+
     @staticmethod
     async def update_post(db: AsyncSession, post_id: int, post_in: PostUpdate, user_id: int):
         post = await db.get(Post, post_id)
@@ -37,5 +117,7 @@ class PostService:
         post = await db.get(Post, post_id)
         if not post or post.user_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
+        if post.image_url:
+            await ImageBlobService.release(db, post.image_url)
         await db.delete(post)
         await db.commit()
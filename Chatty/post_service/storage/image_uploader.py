@@ -1,38 +1,234 @@
+import asyncio
+import hashlib
+import logging
+import re
+import uuid
+from datetime import timedelta
+from typing import Awaitable, BinaryIO, Callable
+
 from fastapi import UploadFile, HTTPException
 from core.config import settings
 from minio import Minio
+from minio.commonconfig import ENABLED, CopySource, Filter
+from minio.datatypes import Object
 from minio.error import S3Error
-import uuid
+from minio.lifecycleconfig import Expiration, LifecycleConfig, Rule
+
+logger = logging.getLogger(__name__)
+
+
+def _make_client(endpoint: str) -> Minio:
+    return Minio(
+        endpoint.replace("http://", "").replace("https://", ""),
+        access_key=settings.s3_access_key,
+        secret_key=settings.s3_secret_key,
+        secure=endpoint.startswith("https://"),
+        region=settings.s3_region,
+    )
+
+
+client = _make_client(settings.s3_endpoint)
+# Подпись presigned-ссылки включает хост, поэтому ссылки для браузера подписываются публичным адресом
+public_client = _make_client(settings.s3_public_endpoint) if settings.s3_public_endpoint else client
+
+_bucket_ready = False
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Сюда браузер кладёт картинки по presigned-ссылкам; что не подтверждено, удаляет правило жизненного цикла
+UPLOAD_PREFIX = "uploads/"
+UPLOAD_LIFECYCLE_RULE_ID = "expire-unconfirmed-uploads"
+
+
+class UploadTooLarge(Exception):
+    pass
+
 
-client = Minio(
-    settings.s3_endpoint.replace("http://", ""),
-    access_key=settings.s3_access_key,
-    secret_key=settings.s3_secret_key,
-    secure=False
-)
+def _hash_file(stream: BinaryIO, max_bytes: int) -> tuple[str, int]:
+    """SHA-256 и размер файла за один проход; обрывается, как только файл превысил `max_bytes`."""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := stream.read(HASH_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge
+        digest.update(chunk)
+    return digest.hexdigest(), size
 
-async def upload_image_to_s3(file: UploadFile) -> str:
-    ext = file.filename.split(".")[-1]
-    unique_name = f"{uuid.uuid4()}.{ext}"
 
+def ensure_bucket():
+    """Создаёт бакет, если его нет, и правило удаления неподтверждённых загрузок.
+
+    Проверка делается один раз на процесс, а не на каждую загрузку.
+    """
+    global _bucket_ready
+    if _bucket_ready:
+        return
+    if not client.bucket_exists(settings.s3_bucket_name):
+        client.make_bucket(settings.s3_bucket_name)
     try:
-        file_data = await file.read()
-        file_size = len(file_data)
-
-        # ensure bucket exists
-        found = client.bucket_exists(settings.s3_bucket_name)
-        if not found:
-            client.make_bucket(settings.s3_bucket_name)
-
-        client.put_object(
-            bucket_name=settings.s3_bucket_name,
-            object_name=unique_name,
-            data=bytes(file_data),
-            length=file_size,
-            content_type=file.content_type
+        _ensure_upload_lifecycle()
+    except S3Error:
+        # Загрузки работают и без правила, неподтверждённые просто не удаляются
+        logger.warning("Failed to set the lifecycle rule for %s", UPLOAD_PREFIX, exc_info=True)
+    _bucket_ready = True
+
+
+def _ensure_upload_lifecycle():
+    # Остальные правила бакета сохраняются, наше заменяется по rule_id
+    current = client.get_bucket_lifecycle(settings.s3_bucket_name)
+    rules = [rule for rule in (current.rules if current else []) if rule.rule_id != UPLOAD_LIFECYCLE_RULE_ID]
+    rules.append(
+        Rule(
+            ENABLED,
+            rule_filter=Filter(prefix=UPLOAD_PREFIX),
+            rule_id=UPLOAD_LIFECYCLE_RULE_ID,
+            expiration=Expiration(days=settings.s3_upload_expire_days),
         )
+    )
+    client.set_bucket_lifecycle(settings.s3_bucket_name, LifecycleConfig(rules))
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Файл больше {settings.upload_max_bytes} байт",
+    )
+
+
+def image_url(object_key: str) -> str:
+    return f"{settings.s3_endpoint}/{settings.s3_bucket_name}/{object_key}"
+
+
+def object_key_from_url(url: str) -> str:
+    return url.removeprefix(f"{settings.s3_endpoint}/{settings.s3_bucket_name}/")
+
+
+def content_key(digest: str) -> str:
+    return f"images/{digest[:2]}/{digest}"
+
+
+def _hash_content(stream: BinaryIO) -> tuple[str, int]:
+    # Хешируем локальную копию до загрузки: ключ нужен до начала PUT, а чтение
+    # временного файла на порядки дешевле отправки его по сети
+    stream.seek(0)
+    digest, size = _hash_file(stream, settings.upload_max_bytes)
+    return content_key(digest), size
+
 
-        return f"{settings.s3_endpoint}/{settings.s3_bucket_name}/{unique_name}"
+def _store_content(stream: BinaryIO, object_key: str, size: int, content_type: str):
+    ensure_bucket()
+    if _stat_object(object_key) is not None:
+        # Такая картинка уже есть — загружать нечего
+        return
 
+    # Поток читается частями по part_size и уходит multipart-загрузкой;
+    # в памяти держится не больше s3_parallel_uploads + 1 частей
+    stream.seek(0)
+    client.put_object(
+        bucket_name=settings.s3_bucket_name,
+        object_name=object_key,
+        data=stream,
+        length=size,
+        part_size=settings.s3_part_size,
+        num_parallel_uploads=settings.s3_parallel_uploads,
+        content_type=content_type,
+    )
+
+
+async def upload_image_to_s3(file: UploadFile, reserve: Callable[[str], Awaitable[None]] | None = None) -> str:
+    """Сохраняет картинку под ключом из SHA-256 содержимого и возвращает её URL.
+
+    Повторно загруженная картинка (репост мема) не отправляется в хранилище второй раз.
+    `reserve(object_key)` вызывается до проверки, есть ли объект в хранилище: он
+    защищает объект от сборщика мусора, пока пост с этой картинкой не закоммичен.
+    """
+    # Размер из multipart-заголовков известен заранее — отказываем, не трогая S3
+    if file.size is not None and file.size > settings.upload_max_bytes:
+        raise _too_large()
+
+    try:
+        # Весь блокирующий ввод-вывод — в отдельном потоке, event loop не ждёт
+        object_key, size = await asyncio.to_thread(_hash_content, file.file)
+        if reserve is not None:
+            await reserve(object_key)
+        await asyncio.to_thread(
+            _store_content, file.file, object_key, size, file.content_type or "application/octet-stream"
+        )
+        return image_url(object_key)
+
+    except UploadTooLarge:
+        raise _too_large()
     except S3Error as err:
         raise HTTPException(status_code=500, detail=f"S3 upload failed: {err}")
+
+
+# ---------- Прямая загрузка из браузера ----------
+
+def _post_image_prefix(post_id: int) -> str:
+    return f"posts/{post_id}/"
+
+
+def _upload_prefix(post_id: int) -> str:
+    return f"{UPLOAD_PREFIX}{post_id}/"
+
+
+def presign_image_upload(post_id: int, filename: str) -> tuple[str, str]:
+    """Резервирует ключ объекта под картинку поста и выдаёт на него presigned PUT.
+
+    Ссылки выдаются только автору поста, так что всё, что лежит под uploads/{post_id}/,
+    загружено им. Подпись считается локально, без запроса к хранилищу. Загрузку,
+    которую так и не подтвердили, через s3_upload_expire_days удалит хранилище.
+    """
+    ext = re.sub(r"[^A-Za-z0-9]", "", filename.rsplit(".", 1)[-1])[:10] if "." in filename else ""
+    object_key = f"{_upload_prefix(post_id)}{uuid.uuid4()}" + (f".{ext}" if ext else "")
+    upload_url = public_client.presigned_put_object(
+        settings.s3_bucket_name,
+        object_key,
+        expires=timedelta(seconds=settings.s3_presign_expires),
+    )
+    return object_key, upload_url
+
+
+def _stat_object(object_key: str) -> Object | None:
+    try:
+        return client.stat_object(settings.s3_bucket_name, object_key)
+    except S3Error as err:
+        if err.code in ("NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+def _promote_upload(object_key: str, post_key: str):
+    # Копирование внутри хранилища: данные не проходят через сервис
+    client.copy_object(settings.s3_bucket_name, post_key, CopySource(settings.s3_bucket_name, object_key))
+    client.remove_object(settings.s3_bucket_name, object_key)
+
+
+async def confirm_image_upload(post_id: int, object_key: str) -> str:
+    """Проверяет HEAD-запросом, что картинка поста действительно загружена, и возвращает её URL.
+
+    Presigned PUT не ограничивает ни размер, ни тип, поэтому неподходящий объект
+    удаляется здесь же. Подходящий переносится из uploads/ в posts/{post_id}/,
+    куда правило жизненного цикла не распространяется.
+    """
+    prefix = _upload_prefix(post_id)
+    if not object_key.startswith(prefix) or "/" in object_key[len(prefix):]:
+        raise HTTPException(status_code=400, detail="Ключ не относится к этому посту")
+    post_key = _post_image_prefix(post_id) + object_key[len(prefix):]
+
+    try:
+        stat = await asyncio.to_thread(_stat_object, object_key)
+        if stat is None:
+            raise HTTPException(status_code=400, detail="Изображение ещё не загружено")
+        if stat.size > settings.upload_max_bytes:
+            await asyncio.to_thread(client.remove_object, settings.s3_bucket_name, object_key)
+            raise _too_large()
+        if not (stat.content_type or "").startswith("image/"):
+            await asyncio.to_thread(client.remove_object, settings.s3_bucket_name, object_key)
+            raise HTTPException(status_code=415, detail="Загруженный файл не является изображением")
+        await asyncio.to_thread(_promote_upload, object_key, post_key)
+    except S3Error as err:
+        raise HTTPException(status_code=500, detail=f"S3 check failed: {err}")
+
+    return image_url(post_key)
@@ -0,0 +1,87 @@
+import io
+
+from minio.deleteobjects import DeleteObject
+from PIL import Image, ImageOps
+
+from core.config import settings
+from storage.image_uploader import client, image_url
+
+ORIENTATION_TAG = 0x0112
+
+# формат -> (расширение, Content-Type, параметры сохранения Pillow)
+FORMATS = {
+    "webp": ("webp", "image/webp", {"quality": settings.image_webp_quality, "method": 4}),
+    "jpeg": ("jpg", "image/jpeg", {"quality": settings.image_jpeg_quality, "optimize": True, "progressive": True}),
+}
+
+
+def _variant_prefix(object_key: str) -> str:
+    stem = object_key.rsplit(".", 1)[0] if "." in object_key.rsplit("/", 1)[-1] else object_key
+    return f"{stem}.w"
+
+
+def variant_key(object_key: str, width: int, fmt: str) -> str:
+    """Варианты лежат рядом с оригиналом: posts/1/abc.png -> posts/1/abc.w320.webp."""
+    return f"{_variant_prefix(object_key)}{width}.{FORMATS[fmt][0]}"
+
+
+def remove_image(object_key: str):
+    """Удаляет оригинал вместе со всеми его вариантами."""
+    names = [object_key] + [
+        obj.object_name
+        for obj in client.list_objects(settings.s3_bucket_name, prefix=_variant_prefix(object_key))
+    ]
+    errors = list(client.remove_objects(settings.s3_bucket_name, [DeleteObject(name) for name in names]))
+    if errors:
+        raise RuntimeError(f"Failed to remove {object_key}: {errors[0]}")
+
+
+def _target_widths(original_width: int, widths: list[int]) -> list[int]:
+    # Не увеличиваем: маленький оригинал даёт один вариант в своём размере, но уже сжатый
+    return [width for width in sorted(widths) if width <= original_width] or [original_width]
+
+
+def render_variants(object_key: str, widths: list[int], formats: list[str]) -> list[dict]:
+    """Скачивает оригинал, строит уменьшенные копии и кладёт их в хранилище.
+
+    Выполняется в дочернем процессе пула: декодирование и сжатие занимают CPU
+    на сотни миллисекунд и не должны держать event loop и GIL веб-воркера.
+    """
+    response = client.get_object(settings.s3_bucket_name, object_key)
+    try:
+        data = response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+    image = Image.open(io.BytesIO(data))
+    # JPEG умеет декодироваться сразу в уменьшенном масштабе (1/2, 1/4, 1/8) — это в разы быстрее
+    rotated = image.getexif().get(ORIENTATION_TAG, 1) in (5, 6, 7, 8)
+    # После поворота ширина кадра — это высота в файле
+    width, height = image.size[::-1] if rotated else image.size
+    largest = max(widths)
+    requested = (largest, max(1, largest * height // max(width, 1)))
+    image.draft("RGB", requested[::-1] if rotated else requested)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = []
+    aspect = image.height / image.width
+    # От большего к меньшему: каждая копия уменьшается из предыдущей, а не из оригинала
+    for width in reversed(_target_widths(image.width, widths)):
+        if width != image.width:
+            height = max(1, round(width * aspect))
+            image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        for fmt in formats:
+            ext, content_type, options = FORMATS[fmt]
+            frame = image.convert("RGB") if fmt == "jpeg" and image.mode != "RGB" else image
+            buffer = io.BytesIO()
+            frame.save(buffer, format=fmt.upper(), **options)
+            size = buffer.tell()
+            buffer.seek(0)
+            key = variant_key(object_key, width, fmt)
+            client.put_object(settings.s3_bucket_name, key, buffer, size, content_type=content_type)
+            variants.append({"width": width, "format": fmt, "url": image_url(key), "size": size})
+    return sorted(variants, key=lambda variant: variant["width"])
@@ -11,4 +11,21 @@ async def test_create_comment():
             headers={"Authorization": "Bearer 1"}
         )
     assert response.status_code == 200
-    assert response.json()["content"] == "Nice post!"
\ No newline at end of file
+    assert response.json()["content"] == "Nice post!"
+
+@pytest.mark.asyncio
+async def test_comments_are_paginated_in_order():
+    headers = {"Authorization": "Bearer 1"}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        post = await ac.post("/posts/", data={"title": "Thread", "content": "Discuss"}, headers=headers)
+        post_id = post.json()["id"]
+        for i in range(5):
+            await ac.post("/comments/", json={"post_id": post_id, "content": f"#{i}"}, headers=headers)
+
+        first = (await ac.get("/comments/", params={"post_id": post_id, "limit": 3})).json()
+        second = (await ac.get(
+            "/comments/", params={"post_id": post_id, "limit": 3, "cursor": first["next_cursor"]}
+        )).json()
+    contents = [c["content"] for c in first["comments"] + second["comments"]]
+    assert contents == [f"#{i}" for i in range(5)]
+    assert second["next_cursor"] is None
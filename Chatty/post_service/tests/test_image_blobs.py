@@ -0,0 +1,124 @@
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from sqlalchemy import select, update
+from starlette.datastructures import Headers
+
+from core.config import settings
+from db.session import AsyncSessionLocal, engine
+from models.image_blob import ImageBlob
+from services.image_blob_service import ImageBlobService
+from storage import image_uploader
+from storage.image_uploader import _stat_object, object_key_from_url, upload_image_to_s3
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fresh_connections():
+    yield
+    # У каждого теста свой event loop, а соединения asyncpg привязаны к нему
+    await engine.dispose()
+
+
+def make_upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), size=len(data), headers=Headers({"content-type": "image/png"}))
+
+
+async def get_blob(object_key: str) -> ImageBlob | None:
+    async with AsyncSessionLocal() as db:
+        return await db.get(ImageBlob, object_key)
+
+
+async def set_released_at(object_key: str, released_at: datetime):
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(ImageBlob).where(ImageBlob.object_key == object_key).values(released_at=released_at))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_same_content_is_uploaded_once(monkeypatch):
+    puts = []
+    put_object = image_uploader.client.put_object
+    monkeypatch.setattr(image_uploader.client, "put_object", lambda **kw: puts.append(kw) or put_object(**kw))
+    data = os.urandom(1024)
+
+    first = await upload_image_to_s3(make_upload(data), reserve=ImageBlobService.reserve)
+    second = await upload_image_to_s3(make_upload(data), reserve=ImageBlobService.reserve)
+
+    assert first == second
+    assert object_key_from_url(first).startswith("images/")
+    assert len(puts) == 1
+    # До создания поста объект ничей, но строка уже есть — иначе его некому было бы удалить
+    blob = await get_blob(object_key_from_url(first))
+    assert blob.ref_count == 0
+    assert blob.released_at is not None
+
+
+@pytest.mark.asyncio
+async def test_ref_count_follows_posts():
+    url = await upload_image_to_s3(make_upload(os.urandom(1024)), reserve=ImageBlobService.reserve)
+    object_key = object_key_from_url(url)
+
+    for _ in range(2):
+        async with AsyncSessionLocal() as db:
+            await ImageBlobService.acquire(db, url)
+            await db.commit()
+    blob = await get_blob(object_key)
+    assert (blob.ref_count, blob.released_at) == (2, None)
+
+    async with AsyncSessionLocal() as db:
+        await ImageBlobService.release(db, url)
+        await db.commit()
+    blob = await get_blob(object_key)
+    assert (blob.ref_count, blob.released_at) == (1, None)
+
+    async with AsyncSessionLocal() as db:
+        await ImageBlobService.release(db, url)
+        await db.commit()
+    blob = await get_blob(object_key)
+    assert blob.ref_count == 0
+    assert blob.released_at is not None
+
+
+@pytest.mark.asyncio
+async def test_gc_removes_only_blobs_released_longer_than_grace():
+    kept = await upload_image_to_s3(make_upload(os.urandom(1024)), reserve=ImageBlobService.reserve)
+    removed = await upload_image_to_s3(make_upload(os.urandom(1024)), reserve=ImageBlobService.reserve)
+    referenced = await upload_image_to_s3(make_upload(os.urandom(1024)), reserve=ImageBlobService.reserve)
+    async with AsyncSessionLocal() as db:
+        await ImageBlobService.acquire(db, referenced)
+        await db.commit()
+    long_ago = datetime.utcnow() - timedelta(seconds=2 * settings.image_gc_grace)
+    for url in (removed, referenced):
+        await set_released_at(object_key_from_url(url), long_ago)
+
+    await ImageBlobService.collect_garbage(grace=settings.image_gc_grace)
+
+    assert await get_blob(object_key_from_url(removed)) is None
+    assert _stat_object(object_key_from_url(removed)) is None
+    for url in (kept, referenced):
+        assert await get_blob(object_key_from_url(url)) is not None
+        assert _stat_object(object_key_from_url(url)) is not None
+
+
+@pytest.mark.asyncio
+async def test_reupload_protects_released_blob_from_gc():
+    data = os.urandom(1024)
+    url = await upload_image_to_s3(make_upload(data), reserve=ImageBlobService.reserve)
+    object_key = object_key_from_url(url)
+    # Последний пост с картинкой удалён давно: объект уже подлежит сборке
+    await set_released_at(object_key, datetime.utcnow() - timedelta(seconds=2 * settings.image_gc_grace))
+
+    # Загрузка видит объект и пропускает PUT; пост ещё не закоммичен
+    assert await upload_image_to_s3(make_upload(data), reserve=ImageBlobService.reserve) == url
+    await ImageBlobService.collect_garbage(grace=settings.image_gc_grace)
+
+    assert _stat_object(object_key) is not None
+    async with AsyncSessionLocal() as db:
+        await ImageBlobService.acquire(db, url)
+        await db.commit()
+        ref_count = await db.scalar(select(ImageBlob.ref_count).where(ImageBlob.object_key == object_key))
+    assert ref_count == 1
@@ -0,0 +1,137 @@
+import io
+
+import pytest
+import pytest_asyncio
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from core.config import settings
+from db.base import Base
+from models import ImageBlob, Post
+from services.image_variant_worker import ImageVariantWorker
+from storage import image_variants
+from storage.image_uploader import image_url
+from storage.image_variants import _target_widths, render_variants, variant_key
+
+ORIENTATION_TAG = 0x0112
+
+
+class FakeResponse:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self) -> bytes:
+        return self.data
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FakeStorage:
+    """Вместо клиента MinIO: объекты в словаре."""
+
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, str | None]] = {}
+
+    def get_object(self, bucket_name: str, object_name: str) -> FakeResponse:
+        return FakeResponse(self.objects[object_name][0])
+
+    def put_object(self, bucket_name: str, object_name: str, data, length: int, content_type: str | None = None):
+        self.objects[object_name] = (data.read(length), content_type)
+
+
+@pytest.fixture
+def storage(monkeypatch) -> FakeStorage:
+    fake = FakeStorage()
+    monkeypatch.setattr(image_variants, "client", fake)
+    return fake
+
+
+def make_jpeg(width: int, height: int, orientation: int | None = None) -> bytes:
+    image = Image.new("RGB", (width, height), (200, 30, 30))
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[ORIENTATION_TAG] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_variant_key_sits_next_to_original():
+    assert variant_key("posts/1/abc.png", 320, "webp") == "posts/1/abc.w320.webp"
+    assert variant_key("posts/1/abc", 640, "jpeg") == "posts/1/abc.w640.jpg"
+    # Точка в «каталоге» не принимается за расширение
+    assert variant_key("images/v1.2/abc", 320, "jpeg") == "images/v1.2/abc.w320.jpg"
+
+
+def test_target_widths_never_upscale():
+    assert _target_widths(2000, [1080, 320, 640]) == [320, 640, 1080]
+    assert _target_widths(700, [320, 640, 1080]) == [320, 640]
+    # Оригинал меньше всех размеров: один вариант в своём размере
+    assert _target_widths(100, [320, 640]) == [100]
+
+
+def test_render_variants_applies_exif_orientation(storage):
+    # В файле 400x200, но orientation=6 (поворот на 90°): на экране кадр 200x400
+    storage.objects["posts/1/photo.jpg"] = (make_jpeg(400, 200, orientation=6), "image/jpeg")
+
+    variants = render_variants("posts/1/photo.jpg", [100, 150, 320], ["jpeg"])
+
+    assert [variant["width"] for variant in variants] == [100, 150]
+    for variant in variants:
+        key = variant_key("posts/1/photo.jpg", variant["width"], "jpeg")
+        assert variant["url"] == image_url(key)
+        data, content_type = storage.objects[key]
+        assert content_type == "image/jpeg"
+        assert Image.open(io.BytesIO(data)).size == (variant["width"], variant["width"] * 2)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_process_keeps_variants_of_replaced_image(storage, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "image_variant_widths", [50])
+    monkeypatch.setattr(settings, "image_variant_formats", ["jpeg"])
+    old_url, new_url = image_url("posts/1/old.jpg"), image_url("posts/1/new.jpg")
+    storage.objects["posts/1/old.jpg"] = (make_jpeg(100, 100), "image/jpeg")
+    async with session_factory() as db:
+        db.add(Post(id=1, user_id=1, title="t", content="c", image_url=new_url))
+        db.add(Post(id=2, user_id=2, title="t", content="c", image_url=old_url))
+        db.add(ImageBlob(object_key="posts/1/old.jpg", ref_count=0))
+        await db.commit()
+
+    worker = ImageVariantWorker(session_factory=session_factory)
+    # Пока строились варианты старой картинки, автор поста 1 её заменил
+    await worker.process(1, old_url)
+    # У поста 2 та же картинка: варианты берутся у объекта, а не строятся заново
+    del storage.objects["posts/1/old.jpg"]
+    await worker.process(2, old_url)
+
+    async with session_factory() as db:
+        replaced = await db.get(Post, 1)
+        unchanged = await db.get(Post, 2)
+        blob = await db.get(ImageBlob, "posts/1/old.jpg")
+    assert replaced.image_variants is None
+    assert [variant["width"] for variant in unchanged.image_variants] == [50]
+    assert blob.variants == unchanged.image_variants
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_false_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(settings, "image_variants_enabled", True)
+    worker = ImageVariantWorker(max_queued=1)
+
+    assert worker.submit(1, image_url("posts/1/a.jpg"))
+    assert not worker.submit(2, image_url("posts/2/b.jpg"))
+    assert worker.queued == 1
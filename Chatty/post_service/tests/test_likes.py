@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
+from core.config import settings
 from main import app
+from services.like_buffer import like_buffer
 
 @pytest.mark.asyncio
 async def test_like_post():
@@ -10,4 +12,71 @@ async def test_like_post():
             json={"post_id": 1},
             headers={"Authorization": "Bearer 1"}
         )
-    assert response.status_code == 201
\ No newline at end of file
+    assert response.status_code == 201
+
+@pytest.mark.asyncio
+async def test_like_updates_post_counter():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        post = await ac.post(
+            "/posts/",
+            data={"title": "Counter", "content": "Like me"},
+            headers={"Authorization": "Bearer 1"}
+        )
+        post_id = post.json()["id"]
+        for user_id in (1, 2, 2):
+            await ac.post("/likes/", json={"post_id": post_id}, headers={"Authorization": f"Bearer {user_id}"})
+        await like_buffer.flush()
+
+        response = await ac.get(f"/posts/{post_id}")
+    assert response.json()["like_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_buffered_intents_are_deduplicated(monkeypatch):
+    monkeypatch.setattr(settings, "likes_write_behind", True)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        post = await ac.post(
+            "/posts/",
+            data={"title": "Buffer", "content": "Like, unlike, like"},
+            headers={"Authorization": "Bearer 1"}
+        )
+        post_id = post.json()["id"]
+        headers = {"Authorization": "Bearer 5"}
+        await ac.post("/likes/", json={"post_id": post_id}, headers=headers)
+        await ac.request("DELETE", "/likes/", json={"post_id": post_id}, headers=headers)
+        await ac.post("/likes/", json={"post_id": post_id}, headers=headers)
+        assert like_buffer.pending >= 1
+        await like_buffer.flush()
+
+        response = await ac.get(f"/posts/{post_id}")
+    assert response.json()["like_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_buffered_like_of_missing_post_is_dropped_on_flush(monkeypatch):
+    monkeypatch.setattr(settings, "likes_write_behind", True)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/likes/", json={"post_id": 10 ** 9}, headers={"Authorization": "Bearer 1"})
+        # Принят в очередь без похода в БД; JOIN posts отбросит его при записи
+        assert response.status_code == 201
+        assert response.json()["changed"] is None
+        await like_buffer.flush()
+        assert like_buffer.intent(10 ** 9, 1) is None
+
+        status = await ac.get("/likes/status", params={"post_ids": [10 ** 9]}, headers={"Authorization": "Bearer 1"})
+    assert status.json()["liked_post_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_like_status_for_many_posts():
+    headers = {"Authorization": "Bearer 9"}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        post_ids = []
+        for _ in range(3):
+            post = await ac.post("/posts/", data={"title": "Status", "content": "?"}, headers=headers)
+            post_ids.append(post.json()["id"])
+        await ac.post("/likes/", json={"post_id": post_ids[1]}, headers=headers)
+
+        response = await ac.get("/likes/status", params={"post_ids": post_ids}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["liked_post_ids"] == [post_ids[1]]
@@ -11,4 +11,89 @@ async def test_create_post():
             headers={"Authorization": "Bearer 1"}
         )
     assert response.status_code == 200
-    assert response.json()["title"] == "Test"
\ No newline at end of file
+    assert response.json()["title"] == "Test"
+
+@pytest.mark.asyncio
+async def test_latest_posts_by_authors_paginates():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for user_id in (101, 101, 101, 102):
+            await ac.post(
+                "/posts/",
+                data={"title": "Feed", "content": f"by {user_id}"},
+                headers={"Authorization": f"Bearer {user_id}"}
+            )
+
+        first = await ac.get("/posts", params={"user_ids": [101, 102], "per_author": 2})
+        assert first.status_code == 200
+        page = first.json()
+        assert page["next_cursor"] is not None
+        assert [p["user_id"] for p in page["posts"]].count(101) == 2
+
+        second = await ac.get(
+            "/posts",
+            params={"user_ids": [101, 102], "per_author": 2, "cursor": page["next_cursor"]}
+        )
+        ids = [p["id"] for p in page["posts"] + second.json()["posts"]]
+        assert len(ids) == len(set(ids)) == 4
+
+@pytest.mark.asyncio
+async def test_create_post_rejects_too_large_image(monkeypatch):
+    from core.config import settings
+    monkeypatch.setattr(settings, "upload_max_bytes", 1024)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/posts/",
+            data={"title": "Big", "content": "image"},
+            files={"file": ("big.jpg", b"\0" * 2048, "image/jpeg")},
+            headers={"Authorization": "Bearer 1"}
+        )
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_image_upload_url_only_for_author():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        post = await ac.post(
+            "/posts/",
+            data={"title": "Photo", "content": "soon"},
+            headers={"Authorization": "Bearer 1"}
+        )
+        post_id = post.json()["id"]
+
+        foreign = await ac.post(
+            f"/posts/{post_id}/image/upload-url",
+            json={"filename": "cat.png"},
+            headers={"Authorization": "Bearer 2"}
+        )
+        assert foreign.status_code == 403
+
+        ticket = await ac.post(
+            f"/posts/{post_id}/image/upload-url",
+            json={"filename": "cat.png"},
+            headers={"Authorization": "Bearer 1"}
+        )
+        assert ticket.status_code == 200
+        assert ticket.json()["object_key"].startswith(f"uploads/{post_id}/")
+
+        wrong_key = await ac.post(
+            f"/posts/{post_id}/image",
+            json={"object_key": "posts/0/cat.png"},
+            headers={"Authorization": "Bearer 1"}
+        )
+        assert wrong_key.status_code == 400
+
+@pytest.mark.asyncio
+async def test_create_post_writes_outbox_event():
+    from sqlalchemy import select
+    from db.session import AsyncSessionLocal
+    from models import OutboxEvent
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/posts/",
+            data={"title": "Outbox", "content": "event"},
+            headers={"Authorization": "Bearer 5"}
+        )
+    post_id = response.json()["id"]
+    async with AsyncSessionLocal() as db:
+        events = (await db.execute(select(OutboxEvent).where(OutboxEvent.event_type == "PostCreated"))).scalars().all()
+    assert {"post_id": post_id, "user_id": 5} in [e.payload for e in events]
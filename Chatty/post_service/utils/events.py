@@ -0,0 +1,4 @@
+from common.events import EventPublisher
+from core.config import settings
+
+event_publisher = EventPublisher(url=settings.rabbitmq_url, queue_name=settings.events_queue)
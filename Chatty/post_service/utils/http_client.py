@@ -0,0 +1,8 @@
+from common.http_client import HttpClientPool
+from core.config import settings
+
+http_client = HttpClientPool(settings)
+
+start_http_client = http_client.start
+close_http_client = http_client.close
+get_http_client = http_client.get
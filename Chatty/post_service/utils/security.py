@@ -6,7 +6,7 @@ from sqlalchemy import select
 from db.session import get_db
 from core.config import settings
 import models
-import httpx
+from utils.http_client import get_http_client
 
 security = HTTPBearer()
 
@@ -15,14 +15,14 @@ class AuthClient:
         self.base_url = base_url
 
     async def verify_token(self, token: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/internal/verify-token",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid token")
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/internal/verify-token",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code != 200:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return response.json()
 
 auth_client = AuthClient(base_url=settings.AUTH_SERVICE_URL)
 
@@ -1,17 +1,23 @@
-import httpx
+import asyncio
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.clients.http import get_http_client
 
 class AuthClient:
-    def __init__(self, base_url: str = settings.url_auth_service):
+    def __init__(self, base_url: str = settings.url_auth_service, batch_window: float = 0.005, max_batch_size: int = 100):
         self.base_url = base_url
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
 
     async def get_user_id_by_username(self, username: str) -> int:
         """Fetch user ID by username from Auth Service (public endpoint)."""
         try:
             url = f"{self.base_url}/auth/user-id-by-username"  # Без internal
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params={"username": username})
+            client = get_http_client()
+            response = await client.get(url, params={"username": username})
             if response.status_code == 200:
                 return response.json()["user_id"]
             elif response.status_code == 404:
@@ -26,8 +32,8 @@ class AuthClient:
         try:
             url = f"{self.base_url}/auth/internal/user-id"
             headers = {"Authorization": f"Bearer {token}"}
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
+            client = get_http_client()
+            response = await client.get(url, headers=headers)
             if response.status_code == 200:
                 return response.json()["user_id"]
             elif response.status_code == 401:
@@ -37,17 +43,83 @@ class AuthClient:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Auth service error: {str(e)}")
 
-    async def get_all_users(self) -> list[dict]:
-        """Fetch all users from Auth Service."""
+    async def get_all_users(self, after_id: int | None = None, limit: int = 50) -> tuple[list[dict], int | None]:
+        """Fetch one keyset page of users from Auth Service.
+
+        Returns the users and the cursor to pass as `after_id` for the next page
+        (None on the last page).
+        """
         try:
-            url = f"{self.base_url}/auth/users"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
+            url = f"{self.base_url}/users"
+            params = {"limit": limit}
+            if after_id is not None:
+                params["after_id"] = after_id
+            client = get_http_client()
+            response = await client.get(url, params=params)
             if response.status_code == 200:
-                return response.json()["users"]  # Предполагается, что в ответе ключ "users"
+                page = response.json()
+                return page["users"], page.get("next_cursor")
             else:
                 raise HTTPException(status_code=response.status_code, detail="Failed to fetch users from Auth Service")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error fetching all users: {str(e)}")
 
+    async def get_users_batch(self, ids: list[int] | None = None, usernames: list[str] | None = None) -> list[dict]:
+        """Resolve many users by ID and/or username with a single Auth Service request."""
+        try:
+            url = f"{self.base_url}/users/batch"
+            client = get_http_client()
+            response = await client.post(url, json={"ids": ids or [], "usernames": usernames or []})
+            if response.status_code == 200:
+                return response.json()["users"]
+            raise HTTPException(status_code=500, detail="Auth service error")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to resolve users: {str(e)}")
+
+    async def load_user_id(self, username: str) -> int:
+        """Resolve a username to a user ID.
+
+        Lookups issued within `batch_window` seconds of each other are coalesced
+        into one `get_users_batch` call (DataLoader style).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(username, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        task = asyncio.create_task(self._flush(pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, pending: dict[str, list[asyncio.Future]]):
+        try:
+            users = await self.get_users_batch(usernames=list(pending))
+        except HTTPException as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
 
+        ids = {user["username"]: user["id"] for user in users}
+        for username, futures in pending.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if username in ids:
+                    future.set_result(ids[username])
+                else:
+                    future.set_exception(HTTPException(status_code=404, detail="User not found"))
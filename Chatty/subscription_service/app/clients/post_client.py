@@ -1,31 +1,51 @@
-import httpx
 from fastapi import HTTPException
 from app.core.config import settings
-from typing import List, Dict
+from app.clients.http import get_http_client
+from typing import List, Dict, Optional
 
 class PostClient:
     def __init__(self, base_url: str = settings.url_post_service):
         self.base_url = base_url
 
-    async def fetch_posts(self, user_ids: List[int]) -> List[Dict]:
-        """Fetch posts for a list of user IDs."""
+    async def fetch_posts(
+        self, user_ids: List[int], per_author: int, cursor: Optional[str] = None
+    ) -> List[Dict]:
+        """Fetch the newest `per_author` posts of each user older than the cursor, newest first."""
         try:
             url = f"{self.base_url}/posts"
             params = [("user_ids", str(uid)) for uid in user_ids]
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
+            params.append(("per_author", str(per_author)))
+            if cursor is not None:
+                params.append(("cursor", cursor))
+            client = get_http_client()
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                return response.json()["posts"]
+            raise HTTPException(status_code=500, detail=f"Post service error: {response.text}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Post service error: {str(e)}")
+
+    async def fetch_posts_by_ids(self, post_ids: List[int]) -> List[Dict]:
+        """Fetch posts by their IDs in one request; deleted posts are absent from the result."""
+        try:
+            url = f"{self.base_url}/posts/batch"
+            client = get_http_client()
+            response = await client.post(url, json={"ids": post_ids})
             if response.status_code == 200:
                 return response.json()
             raise HTTPException(status_code=500, detail=f"Post service error: {response.text}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Post service error: {str(e)}")
 
-    async def get_user_posts(self, user_id: int) -> List[Dict]:
-        """Fetch all posts of a specific user."""
+    async def get_user_posts(self, user_id: int, limit: int, cursor: Optional[str] = None) -> Dict:
+        """Fetch a page of a specific user's posts, newest first."""
         try:
             url = f"{self.base_url}/posts/users/{user_id}/posts"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
+            params = {"limit": limit}
+            if cursor is not None:
+                params["cursor"] = cursor
+            client = get_http_client()
+            response = await client.get(url, params=params)
             if response.status_code == 200:
                 return response.json()
             raise HTTPException(status_code=500, detail=f"Post service error: {response.text}")
@@ -14,11 +14,52 @@ class Settings(BaseSettings):
     # ---------- RABBITMQ ----------
     rabbitmq_host: str = Field(alias="RABBITMQ_HOST")
     rabbitmq_port: int = Field(alias="RABBITMQ_PORT")
+    rabbitmq_user: str = Field(default="guest", alias="RABBITMQ_USER")
+    rabbitmq_password: str = Field(default="guest", alias="RABBITMQ_PASSWORD")
+
+    # ---------- EVENT CONSUMER ----------
+    events_consumer_enabled: bool = Field(default=True, alias="EVENTS_CONSUMER_ENABLED")
+    events_queue: str = Field(default="events", alias="EVENTS_QUEUE")
+    events_prefetch: int = Field(default=200, alias="EVENTS_PREFETCH")
+    events_concurrency: int = Field(default=16, alias="EVENTS_CONCURRENCY")
+    events_coalesce_window: float = Field(default=0.2, alias="EVENTS_COALESCE_WINDOW")  # seconds
+    events_ack_interval: float = Field(default=0.1, alias="EVENTS_ACK_INTERVAL")  # seconds
+    events_ack_batch: int = Field(default=100, alias="EVENTS_ACK_BATCH")
+
+    # ---------- FEED CACHE ----------
+    # memory is per process: only for a single worker, each worker consumes a share of the events
+    feed_cache_backend: str = Field(default="redis", alias="FEED_CACHE_BACKEND")  # redis | memory
+    feed_cache_ttl: int = Field(default=60, alias="FEED_CACHE_TTL")
+    feed_cache_max_entries: int = Field(default=10000, alias="FEED_CACHE_MAX_ENTRIES")
+    redis_host: str = Field(default="redis", alias="REDIS_HOST")
+    redis_port: int = Field(default=6379, alias="REDIS_PORT")
+
+    # ---------- TIMELINE ----------
+    timeline_backend: str = Field(default="redis", alias="TIMELINE_BACKEND")  # redis | memory
+    timeline_max_length: int = Field(default=800, alias="TIMELINE_MAX_LENGTH")
+    timeline_claim_ttl: int = Field(default=86400, alias="TIMELINE_CLAIM_TTL")  # seconds a fanned-out post is remembered
+    feed_celebrity_threshold: int = Field(default=10000, alias="FEED_CELEBRITY_THRESHOLD")
+    feed_page_size: int = Field(default=50, alias="FEED_PAGE_SIZE")
+    feed_page_size_max: int = Field(default=100, alias="FEED_PAGE_SIZE_MAX")
+    feed_authors_per_request: int = Field(default=500, alias="FEED_AUTHORS_PER_REQUEST")
+
+    # ---------- FOLLOW GRAPH ----------
+    follow_graph_enabled: bool = Field(default=False, alias="FOLLOW_GRAPH_ENABLED")
+    follow_graph_reload_interval: float = Field(default=600, alias="FOLLOW_GRAPH_RELOAD_INTERVAL")  # seconds
+    follow_graph_compact_threshold: int = Field(default=10000, alias="FOLLOW_GRAPH_COMPACT_THRESHOLD")
 
     # ---------- SERVICES ----------
     url_auth_service: str = Field(alias="AUTH_SERVICE_URL")
     url_post_service: str = Field(alias="POST_SERVICE_URL")
 
+    # ---------- HTTP CLIENT ----------
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY")
+    http_timeout: float = Field(default=10.0, alias="HTTP_TIMEOUT")
+    http_connect_timeout: float = Field(default=3.0, alias="HTTP_CONNECT_TIMEOUT")
+    http2: bool = Field(default=False, alias="HTTP2")
+
     # ---------- JWT ----------
     jwt_secret: str = Field(alias="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
@@ -37,5 +78,9 @@ class Settings(BaseSettings):
     def async_database_url(self) -> str:
         return self.subscription_db_url
 
+    @property
+    def rabbitmq_url(self) -> str:
+        return f"amqp://{self.rabbitmq_user}:{self.rabbitmq_password}@{self.rabbitmq_host}:{self.rabbitmq_port}/"
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from typing import List
+from typing import List, Optional
 
 from app.core.config import settings
 from app.clients.auth_client import AuthClient
@@ -10,9 +10,12 @@ from app.clients.post_client import PostClient
 from app.core.deps import get_current_user
 from app.database import get_db
 from app.models import Subscription
-from app.schemas import Post, SubscriptionOut, User
-from app.utils.cache import get_cached_feed, set_cached_feed
-from app.services.subscription_service import get_user_id_by_username
+from app.schemas import FeedPage, SubscriptionOut, UserPage
+from app.utils.cache import get_or_set_feed, feed_cache
+from app.services.subscription_service import (
+    get_followers_ids, get_following, get_user_id_by_username, record_subscription
+)
+from app.services.timeline_service import read_feed, reset_timeline
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 security_scheme = HTTPBearer()
@@ -20,12 +23,19 @@ auth_client = AuthClient()
 post_client = PostClient()
 
 
-@router.get("/users", response_model=List[User], summary="Get all users")
-async def get_all_users(current_user: int = Depends(get_current_user)):
-    """Retrieve a list of all registered users."""
+@router.get("/users", response_model=UserPage, summary="Get all users")
+async def get_all_users(
+        after_id: Optional[int] = None,
+        limit: int = Query(50, ge=1, le=500),
+        current_user: int = Depends(get_current_user)
+):
+    """Retrieve a page of registered users ordered by ID, starting after `after_id`.
+
+    Pass `next_cursor` from the response as `after_id` to get the next page.
+    """
     try:
-        users = await auth_client.get_all_users()
-        return users
+        users, next_cursor = await auth_client.get_all_users(after_id=after_id, limit=limit)
+        return UserPage(users=users, next_cursor=next_cursor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch users: {str(e)}")
 
@@ -52,6 +62,8 @@ async def subscribe_to_user(
     subscription = Subscription(user_id=current_user, target_user_id=user_id)
     db.add(subscription)
     await db.commit()
+    record_subscription(current_user, user_id, subscribed=True)
+    await reset_timeline(current_user)
     return {"detail": "Subscribed successfully"}
 
 
@@ -79,6 +91,8 @@ async def subscribe_to_user_by_username(
     subscription = Subscription(user_id=current_user, target_user_id=user_id)
     db.add(subscription)
     await db.commit()
+    record_subscription(current_user, user_id, subscribed=True)
+    await reset_timeline(current_user)
     return {"detail": "Subscribed successfully"}
 
 
@@ -99,18 +113,21 @@ async def unsubscribe_from_user(
         raise HTTPException(status_code=404, detail="Subscription not found")
 
     await db.commit()
+    record_subscription(current_user, user_id, subscribed=False)
+    await reset_timeline(current_user)
     return {"detail": "Unsubscribed successfully"}
 
 
-@router.get("/users/{user_id}/posts", response_model=List[Post], summary="Get all posts of a user")
+@router.get("/users/{user_id}/posts", response_model=FeedPage, summary="Get posts of a user")
 async def get_user_posts(
         user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = Query(settings.feed_page_size, ge=1, le=settings.feed_page_size_max),
         current_user: int = Depends(get_current_user)
 ):
-    """Retrieve all posts of a specific user by their user ID."""
+    """Retrieve a page of posts of a specific user by their user ID."""
     try:
-        posts = await post_client.get_user_posts(user_id)
-        return posts
+        return await post_client.get_user_posts(user_id, limit, cursor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch posts: {str(e)}")
 
@@ -133,10 +150,7 @@ async def get_following_users(
         db: AsyncSession = Depends(get_db)
 ):
     """Retrieve a list of user IDs that the current user follows."""
-    result = await db.execute(
-        select(Subscription.target_user_id).where(Subscription.user_id == current_user)
-    )
-    return result.scalars().all()
+    return await get_following(current_user, db)
 
 
 @router.get("/followers", response_model=List[int], summary="List followers")
@@ -145,30 +159,27 @@ async def get_followers(
         db: AsyncSession = Depends(get_db)
 ):
     """Retrieve a list of user IDs that follow the current user."""
-    result = await db.execute(
-        select(Subscription.user_id).where(Subscription.target_user_id == current_user)
-    )
-    return result.scalars().all()
+    return await get_followers_ids(current_user, db)
 
 
-@router.get("/feed", response_model=List[Post], summary="Get user feed")
+@router.get("/feed", response_model=FeedPage, summary="Get user feed")
 async def get_user_feed(
+        cursor: Optional[str] = None,
+        limit: int = Query(settings.feed_page_size, ge=1, le=settings.feed_page_size_max),
         current_user: int = Depends(get_current_user),
         db: AsyncSession = Depends(get_db)
 ):
-    """Retrieve a feed of posts from users the current user follows."""
-    cached = await get_cached_feed(current_user)
-    if cached:
-        return cached
+    """Retrieve a page of the newest posts from users the current user follows.
 
-    result = await db.execute(
-        select(Subscription.target_user_id).where(Subscription.user_id == current_user)
-    )
-    user_ids = result.scalars().all()
+    Pass `next_cursor` from the response as `cursor` to get the next page.
+    """
+    # Only the default first page is cached; deeper pages are rarely requested twice
+    if cursor is None and limit == settings.feed_page_size:
+        return await get_or_set_feed(current_user, lambda: read_feed(current_user, limit, None, db))
+    return await read_feed(current_user, limit, cursor, db)
 
-    if not user_ids:
-        return []
 
-    posts = await post_client.fetch_posts(user_ids)
-    await set_cached_feed(current_user, posts)
-    return posts
+@router.get("/feed/cache-metrics", summary="Feed cache metrics")
+async def get_feed_cache_metrics(current_user: int = Depends(get_current_user)):
+    """Hit/miss counters of the feed cache in this worker."""
+    return feed_cache.metrics()
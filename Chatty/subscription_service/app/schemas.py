@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class Post(BaseModel):
@@ -11,6 +11,10 @@ class Post(BaseModel):
     class Config:
         from_attributes = True
 
+class FeedPage(BaseModel):
+    posts: List[Post]
+    next_cursor: Optional[str] = None
+
 class SubscriptionOut(BaseModel):
     user_id: int  # подписчик
     target_user_id: int
@@ -27,6 +31,10 @@ class User(BaseModel):
     class Config:
         from_attributes = True
 
+class UserPage(BaseModel):
+    users: List[User]
+    next_cursor: Optional[int] = None
+
 class SubscriptionCreate(BaseModel):
     username: str
 
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+
+from app.core.config import settings
+from app.services.timeline_service import handle_posts_created
+
+logger = logging.getLogger(__name__)
+
+POST_CREATED_EVENTS = ("PostCreated", "Post Created")
+
+
+class BatchAcker:
+    """Acknowledges the deliveries of one channel in batches.
+
+    Handlers finish out of order, so a single `multiple` ack can only cover the
+    longest run of finished deliveries from the oldest unacknowledged one. Failed
+    deliveries are nacked individually before that ack goes out.
+    """
+
+    def __init__(self):
+        self._unsettled: Deque[AbstractIncomingMessage] = deque()
+        self._finished: Dict[AbstractIncomingMessage, bool] = {}
+        self._rejected: List[Tuple[AbstractIncomingMessage, bool]] = []
+
+    @property
+    def finished(self) -> int:
+        return len(self._finished)
+
+    def track(self, message: AbstractIncomingMessage) -> None:
+        """Register a delivery in the order the broker sent it."""
+        self._unsettled.append(message)
+
+    def done(self, message: AbstractIncomingMessage, ok: bool = True) -> None:
+        self._finished[message] = ok
+        if not ok:
+            # Give a failed event one more delivery; if that fails too it is dropped
+            self._rejected.append((message, not message.redelivered))
+
+    async def flush(self) -> int:
+        """Settle everything that can be settled; returns the number of acknowledged messages."""
+        rejected, self._rejected = self._rejected, []
+        for message, requeue in rejected:
+            await message.nack(requeue=requeue)
+
+        last_ok = None
+        acked = 0
+        while self._unsettled and self._unsettled[0] in self._finished:
+            message = self._unsettled.popleft()
+            if self._finished.pop(message):
+                last_ok = message
+                acked += 1
+        if last_ok is not None:
+            # Also covers every earlier successful delivery; the rejected ones are already settled
+            await last_ok.ack(multiple=True)
+        return acked
+
+
+class EventConsumer:
+    """Consumes domain events from RabbitMQ inside the service's event loop.
+
+    The broker keeps up to `prefetch` unacknowledged messages in flight and at
+    most `concurrency` handlers run at once. PostCreated events of one author
+    that arrive within `coalesce_window` seconds are handled together, with one
+    follower lookup and one feed invalidation. Handled messages are acknowledged
+    every `ack_interval` seconds or every `ack_batch` messages, whichever comes
+    first. Delivery is at-least-once: messages not acknowledged before a
+    disconnect are redelivered, and the outbox relay may publish an event twice.
+    Duplicates are dropped by handle_posts_created, which claims each post id
+    once in the timeline store.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        queue_name: str = "events",
+        prefetch: int = 200,
+        concurrency: int = 16,
+        coalesce_window: float = 0.2,
+        ack_interval: float = 0.1,
+        ack_batch: int = 100,
+        reconnect_delay: float = 5.0,
+    ):
+        self.url = url
+        self.queue_name = queue_name
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        self.coalesce_window = coalesce_window
+        self.ack_interval = ack_interval
+        self.ack_batch = ack_batch
+        self.reconnect_delay = reconnect_delay
+        self.received = 0
+        self.handled = 0
+        self.failed = 0
+        self.acked = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._acker = BatchAcker()
+        self._ack_wakeup = asyncio.Event()
+        self._pending: Dict[int, List[Tuple[int, AbstractIncomingMessage]]] = {}
+        self._flush_handles: Dict[int, asyncio.TimerHandle] = {}
+        self._handlers: set = set()
+        self._connection: Optional[aio_pika.abc.AbstractConnection] = None
+        self._consume_task: Optional[asyncio.Task] = None
+        self._ack_task: Optional[asyncio.Task] = None
+
+    def metrics(self) -> dict:
+        return {
+            "received": self.received,
+            "handled": self.handled,
+            "failed": self.failed,
+            "acked": self.acked,
+            "coalescing": sum(len(group) for group in self._pending.values()),
+            "in_progress": len(self._handlers),
+        }
+
+    async def start(self) -> None:
+        if self._consume_task is not None:
+            return
+        self._consume_task = asyncio.create_task(self._run())
+        self._ack_task = asyncio.create_task(self._ack_loop())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._consume_task is None:
+            return
+        self._consume_task.cancel()
+        await asyncio.gather(self._consume_task, return_exceptions=True)
+        self._consume_task = None
+        # Finish what was already received instead of leaving it to redelivery
+        for author_id in list(self._pending):
+            self._flush_author(author_id)
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=timeout)
+        self._ack_task.cancel()
+        await asyncio.gather(self._ack_task, return_exceptions=True)
+        self._ack_task = None
+        await self._flush_acks()
+        await self._close_connection()
+
+    async def _close_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed:
+            await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                # stop() still needs the connection to acknowledge what is being handled
+                raise
+            except Exception:
+                logger.exception("Event consumer disconnected, reconnecting in %.0fs", self.reconnect_delay)
+            await self._close_connection()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self) -> None:
+        self._connection = await aio_pika.connect(self.url)
+        # Delivery tags belong to the channel: whatever the old one left unacked
+        # is redelivered, including events still waiting to be coalesced
+        self._acker = BatchAcker()
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+        self._pending.clear()
+
+        channel = await self._connection.channel()
+        await channel.set_qos(prefetch_count=self.prefetch)
+        # Same arguments as the producers, or the broker rejects the redeclaration
+        queue = await channel.declare_queue(self.queue_name)
+        async with queue.iterator() as messages:
+            async for message in messages:
+                self._dispatch(message)
+
+    def _dispatch(self, message: AbstractIncomingMessage) -> None:
+        self.received += 1
+        acker = self._acker
+        acker.track(message)
+        try:
+            event = json.loads(message.body)
+            if event.get("event") not in POST_CREATED_EVENTS:
+                # All domain events share one queue; the others need nothing from this service
+                acker.done(message)
+                return
+            author_id, post_id = int(event["user_id"]), int(event["post_id"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning("Dropping malformed event: %r", message.body[:200])
+            acker.done(message)
+            return
+
+        group = self._pending.get(author_id)
+        if group is None:
+            group = self._pending[author_id] = []
+            loop = asyncio.get_running_loop()
+            self._flush_handles[author_id] = loop.call_later(self.coalesce_window, self._flush_author, author_id)
+        group.append((post_id, message))
+
+    def _flush_author(self, author_id: int) -> None:
+        handle = self._flush_handles.pop(author_id, None)
+        if handle is not None:
+            handle.cancel()
+        group = self._pending.pop(author_id, None)
+        if not group:
+            return
+        task = asyncio.create_task(self._handle(author_id, group, self._acker))
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def _handle(
+        self, author_id: int, group: List[Tuple[int, AbstractIncomingMessage]], acker: BatchAcker
+    ) -> None:
+        async with self._semaphore:
+            try:
+                await handle_posts_created(author_id, [post_id for post_id, _ in group])
+                ok = True
+                self.handled += 1
+            except Exception:
+                logger.exception("Failed to fan out %d posts of author %d", len(group), author_id)
+                ok = False
+                self.failed += len(group)
+        for _, message in group:
+            acker.done(message, ok)
+        if acker.finished >= self.ack_batch:
+            self._ack_wakeup.set()
+
+    async def _ack_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._ack_wakeup.wait(), self.ack_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._ack_wakeup.clear()
+            await self._flush_acks()
+
+    async def _flush_acks(self) -> None:
+        try:
+            self.acked += await self._acker.flush()
+        except Exception:
+            # The channel is gone; its unacknowledged messages will be redelivered
+            logger.warning("Failed to acknowledge events", exc_info=True)
+
+
+event_consumer = EventConsumer(
+    url=settings.rabbitmq_url,
+    queue_name=settings.events_queue,
+    prefetch=settings.events_prefetch,
+    concurrency=settings.events_concurrency,
+    coalesce_window=settings.events_coalesce_window,
+    ack_interval=settings.events_ack_interval,
+    ack_batch=settings.events_ack_batch,
+)
+
+
+async def main() -> None:
+    """Run the consumer on its own, without the HTTP API."""
+    logging.basicConfig(level=logging.INFO)
+    await event_consumer.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await event_consumer.stop()
+
+
+if __name__ == "__main__":
+    # python -m app.services.event_consumer
+    asyncio.run(main())
@@ -1,27 +1,59 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import Iterable, List, Optional
 from fastapi import HTTPException
+from app.core.config import settings
 from app.models import Subscription
 from app.clients.auth_client import AuthClient
+from app.utils.follow_graph import follow_graph
 
 auth_client = AuthClient()
 
+
+def _graph_ready() -> bool:
+    return settings.follow_graph_enabled and follow_graph.loaded
+
+
 async def get_user_id_by_username(username: str) -> int:
-    """Wrapper to get user ID from Auth Service."""
-    return await auth_client.get_user_id_by_username(username)
+    """Wrapper to get user ID from Auth Service; concurrent lookups share one batch request."""
+    return await auth_client.load_user_id(username)
 
 async def get_following(user_id: int, db: AsyncSession) -> List[int]:
     """Get list of user IDs whom the given user follows."""
+    if _graph_ready():
+        return follow_graph.get_following(user_id)
     result = await db.execute(
         select(Subscription.target_user_id).where(Subscription.user_id == user_id)
     )
     return result.scalars().all()
 
-async def get_followers_ids(user_id: int, db: AsyncSession) -> List[int]:
-    """Get list of user IDs who follow the given user."""
+async def get_followers_ids(user_id: int, db: AsyncSession, limit: Optional[int] = None) -> List[int]:
+    """Get list of user IDs who follow the given user, at most `limit` of them."""
+    if _graph_ready():
+        return follow_graph.get_followers(user_id)[:limit]
+    query = select(Subscription.user_id).where(Subscription.target_user_id == user_id)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_followed_among(user_id: int, candidates: Iterable[int], db: AsyncSession) -> List[int]:
+    """Get those of `candidates` whom the given user follows."""
+    if _graph_ready():
+        return [target for target in candidates if follow_graph.is_following(user_id, target)]
     result = await db.execute(
-        select(Subscription.user_id).where(Subscription.target_user_id == user_id)
+        select(Subscription.target_user_id).where(
+            Subscription.user_id == user_id,
+            Subscription.target_user_id.in_(candidates),
+        )
     )
     return result.scalars().all()
 
+def record_subscription(user_id: int, target_user_id: int, subscribed: bool) -> None:
+    """Apply a committed subscribe/unsubscribe to this process's follow graph."""
+    if not settings.follow_graph_enabled:
+        return
+    if subscribed:
+        follow_graph.add(user_id, target_user_id)
+    else:
+        follow_graph.remove(user_id, target_user_id)
@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.post_client import PostClient
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.subscription_service import get_followed_among, get_followers_ids, get_following
+from app.utils.cache import invalidate_feeds_of_followers
+from app.utils.cursor import decode_cursor, encode_cursor, post_sort_key
+from app.utils.timeline import timeline_store
+
+post_client = PostClient()
+
+
+def merge_newest(limit: int, *streams: Iterable[int]) -> List[int]:
+    """Merge post id lists sorted newest first into one deduplicated list of at most `limit` ids."""
+    seen = set()
+    merged = []
+    for post_id in heapq.merge(*streams, reverse=True):
+        if post_id in seen:
+            continue
+        seen.add(post_id)
+        merged.append(post_id)
+        if len(merged) == limit:
+            break
+    return merged
+
+
+async def handle_post_created(author_id: int, post_id: int) -> None:
+    """Fan a new post out to followers' timelines."""
+    await handle_posts_created(author_id, [post_id])
+
+
+async def handle_posts_created(author_id: int, post_ids: List[int]) -> None:
+    """Fan new posts of one author out to followers' timelines.
+
+    Followers are looked up and their cached feeds invalidated once for the whole batch.
+    Authors with more than `feed_celebrity_threshold` followers are not fanned out:
+    their posts are kept in a per-author list and merged into the feed on read.
+
+    Events are delivered at least once; a post that was already fanned out is skipped,
+    so a redelivered PostCreated doesn't land on top of newer posts again.
+    """
+    post_ids = await timeline_store.claim(sorted(set(post_ids)))  # oldest first, so the newest ends up on top
+    if not post_ids:
+        return
+    try:
+        await _fan_out(author_id, post_ids)
+    except BaseException:
+        # Including cancellation: the redelivery has to find the posts unclaimed
+        await timeline_store.release(post_ids)
+        raise
+
+
+async def _fan_out(author_id: int, post_ids: List[int]) -> None:
+    if await timeline_store.is_celebrity(author_id):
+        for post_id in post_ids:
+            await timeline_store.push_author_post(author_id, post_id)
+        return
+
+    threshold = settings.feed_celebrity_threshold
+    async with SessionLocal() as db:
+        follower_ids = await get_followers_ids(author_id, db, limit=threshold + 1)
+
+    if len(follower_ids) > threshold:
+        # Celebrity status is sticky, so the author's earlier posts keep being merged in
+        for post_id in post_ids:
+            await timeline_store.push_author_post(author_id, post_id)
+        return
+
+    for post_id in post_ids:
+        await timeline_store.push(follower_ids, post_id)
+    await invalidate_feeds_of_followers(follower_ids)
+
+
+async def reset_timeline(user_id: int) -> None:
+    """Forget the user's materialized timeline after their subscriptions change."""
+    await timeline_store.drop([user_id])
+    await invalidate_feeds_of_followers([user_id])
+
+
+async def fetch_merged_posts(author_ids: List[int], limit: int, cursor: Optional[str] = None) -> List[dict]:
+    """Fan-out-on-read: newest `limit` posts of the authors that are older than the cursor.
+
+    post_service returns at most `limit` posts per author, newest first; the per-author
+    streams are combined with a heap so only the page itself is kept.
+    """
+    if not author_ids or limit <= 0:
+        return []
+    step = settings.feed_authors_per_request
+    responses = await asyncio.gather(*(
+        post_client.fetch_posts(author_ids[start:start + step], per_author=limit, cursor=cursor)
+        for start in range(0, len(author_ids), step)
+    ))
+    streams: Dict[int, List[dict]] = defaultdict(list)
+    for posts in responses:
+        for post in posts:
+            streams[post["user_id"]].append(post)
+    return list(islice(heapq.merge(*streams.values(), key=post_sort_key, reverse=True), limit))
+
+
+def _page(posts: List[dict], limit: int) -> dict:
+    next_cursor = encode_cursor(posts[-1]) if len(posts) == limit else None
+    return {"posts": posts, "next_cursor": next_cursor}
+
+
+async def read_feed(user_id: int, limit: int, cursor: Optional[str], db: AsyncSession) -> dict:
+    """One page of the user's feed, newest first.
+
+    The page comes from the materialized timeline merged with followed celebrities' posts.
+    Whatever the timeline can't cover (it's missing, or the page goes past its end)
+    is read from post_service directly.
+    """
+    before_id = decode_cursor(cursor)[1] if cursor else None
+    post_ids = await timeline_store.read(user_id, limit, before_id)
+    if post_ids is None:
+        following = await get_following(user_id, db)
+        posts = await fetch_merged_posts(following, limit, cursor)
+        if cursor is None:
+            celebrities = await timeline_store.celebrities()
+            await timeline_store.seed(
+                user_id, [post["id"] for post in posts if post["user_id"] not in celebrities]
+            )
+        return _page(posts, limit)
+
+    celebrities = await timeline_store.celebrities()
+    if celebrities:
+        followed = await get_followed_among(user_id, celebrities, db)
+        if followed:
+            streams = await timeline_store.read_author_posts(followed, limit, before_id)
+            post_ids = merge_newest(limit, post_ids, *streams)
+
+    posts = []
+    if post_ids:
+        by_id = {post["id"]: post for post in await post_client.fetch_posts_by_ids(post_ids)}
+        # Deleted posts are simply missing from post_service's answer
+        posts = [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+    if len(posts) < limit:
+        # The timeline only holds the newest posts; continue from where it ends
+        following = await get_following(user_id, db)
+        older_cursor = encode_cursor(posts[-1]) if posts else cursor
+        posts += await fetch_merged_posts(following, limit - len(posts), older_cursor)
+    return _page(posts, limit)
@@ -1,11 +1,164 @@
-from typing import List, Optional
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 
+from app.core.config import settings
 
-async def get_cached_feed(user_id: int) -> Optional[List[dict]]:
-    return None
+# A cached feed page: {"posts": [...], "next_cursor": ...}
+Feed = Dict[str, Any]
 
-async def set_cached_feed(user_id: int, posts: List[dict]) -> None:
-    pass
+
+class InMemoryFeedCache:
+    """Per-process LRU cache with a TTL on every entry."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[int, tuple[float, Feed]]" = OrderedDict()
+
+    async def get(self, user_id: int) -> Optional[Feed]:
+        item = self._data.get(user_id)
+        if item is None:
+            return None
+        expires_at, posts = item
+        if expires_at <= time.monotonic():
+            del self._data[user_id]
+            return None
+        self._data.move_to_end(user_id)
+        return posts
+
+    async def set(self, user_id: int, posts: Feed) -> None:
+        self._data[user_id] = (time.monotonic() + self.ttl, posts)
+        self._data.move_to_end(user_id)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete_many(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            self._data.pop(user_id, None)
+
+
+class RedisFeedCache:
+    """Feed cache shared by all workers, stored as JSON strings in Redis."""
+
+    def __init__(self, url: str = "", ttl: float = 60, prefix: str = "feed:", client=None):
+        if client is None:
+            import redis.asyncio as redis  # optional dependency, only needed for this backend
+            client = redis.from_url(url)
+        self.redis = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}{user_id}"
+
+    async def get(self, user_id: int) -> Optional[Feed]:
+        raw = await self.redis.get(self._key(user_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, user_id: int, posts: Feed) -> None:
+        await self.redis.set(self._key(user_id), json.dumps(posts, default=str), ex=int(self.ttl))
+
+    async def delete_many(self, user_ids: Iterable[int]) -> None:
+        keys = [self._key(user_id) for user_id in user_ids]
+        for start in range(0, len(keys), 1000):
+            await self.redis.delete(*keys[start:start + 1000])
+
+
+class FeedCache:
+    """Feed cache front-end: hit/miss metrics and stampede protection on top of a backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._stale: set[int] = set()
+
+    async def get(self, user_id: int) -> Optional[Feed]:
+        posts = await self.backend.get(user_id)
+        if posts is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return posts
+
+    async def set(self, user_id: int, posts: Feed) -> None:
+        await self.backend.set(user_id, posts)
+
+    async def get_or_compute(self, user_id: int, compute: Callable[[], Awaitable[Feed]]) -> Feed:
+        """Return the cached feed or build it; concurrent misses for one user compute it once."""
+        posts = await self.get(user_id)
+        if posts is not None:
+            return posts
+
+        inflight = self._inflight.get(user_id)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[user_id] = future
+        self._stale.discard(user_id)
+        try:
+            posts = await compute()
+            # Don't store a feed that was invalidated while it was being built
+            if user_id not in self._stale:
+                await self.backend.set(user_id, posts)
+            future.set_result(posts)
+            return posts
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[user_id]
+            self._stale.discard(user_id)
+
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        self._stale.update(uid for uid in user_ids if uid in self._inflight)
+        self.invalidations += len(user_ids)
+        await self.backend.delete_many(user_ids)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
+
+
+def _build_backend():
+    if settings.feed_cache_backend == "redis":
+        return RedisFeedCache(
+            url=f"redis://{settings.redis_host}:{settings.redis_port}/0",
+            ttl=settings.feed_cache_ttl,
+        )
+    return InMemoryFeedCache(max_entries=settings.feed_cache_max_entries, ttl=settings.feed_cache_ttl)
+
+
+feed_cache = FeedCache(_build_backend())
+
+
+async def get_cached_feed(user_id: int) -> Optional[Feed]:
+    return await feed_cache.get(user_id)
+
+async def set_cached_feed(user_id: int, posts: Feed) -> None:
+    await feed_cache.set(user_id, posts)
+
+async def get_or_set_feed(user_id: int, compute: Callable[[], Awaitable[Feed]]) -> Feed:
+    return await feed_cache.get_or_compute(user_id, compute)
 
 async def invalidate_feeds_of_followers(follower_ids: List[int]) -> None:
-    pass
\ No newline at end of file
+    await feed_cache.invalidate(follower_ids)
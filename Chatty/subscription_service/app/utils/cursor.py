@@ -0,0 +1,29 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+FeedCursor = Tuple[datetime, int]
+
+
+def post_sort_key(post: dict) -> FeedCursor:
+    """Feed order of a post as returned by post_service: (created_at, id), compared newest first."""
+    created_at = post.get("created_at")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return created_at or datetime.min, post["id"]
+
+
+def encode_cursor(post: dict) -> str:
+    created_at, post_id = post_sort_key(post)
+    raw = f"{created_at.isoformat()}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> FeedCursor:
+    try:
+        created_at, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
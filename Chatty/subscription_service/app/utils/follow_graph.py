@@ -0,0 +1,389 @@
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class Adjacency:
+    """One direction of the graph in CSR form.
+
+    The neighbours of `keys[i]` are `targets[offsets[i]:offsets[i + 1]]`, sorted.
+    Keys and targets are 4-byte ints, so an edge costs 4 bytes per direction.
+    """
+
+    __slots__ = ("keys", "offsets", "targets")
+
+    def __init__(self, keys: Optional[array] = None, offsets: Optional[array] = None, targets: Optional[array] = None):
+        self.keys = keys if keys is not None else array("i")
+        self.offsets = offsets if offsets is not None else array("q", [0])
+        self.targets = targets if targets is not None else array("i")
+
+    @classmethod
+    def from_sorted_pairs(cls, pairs: Iterable[Tuple[int, int]]) -> "Adjacency":
+        """Build from (key, target) pairs ordered by key, then target."""
+        builder = AdjacencyBuilder()
+        builder.extend(pairs)
+        return builder.build()
+
+    @property
+    def edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.keys, self.offsets, self.targets))
+
+    def row(self, key: int) -> Tuple[int, int]:
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.offsets[i], self.offsets[i + 1]
+        return 0, 0
+
+    def neighbours(self, key: int) -> array:
+        start, end = self.row(key)
+        return self.targets[start:end]
+
+    def contains(self, key: int, target: int) -> bool:
+        start, end = self.row(key)
+        i = bisect_left(self.targets, target, start, end)
+        return i < end and self.targets[i] == target
+
+
+class AdjacencyBuilder:
+    """Builds an Adjacency from (key, target) pairs that arrive ordered by key, then
+    target, possibly in several chunks. Duplicate pairs are skipped."""
+
+    def __init__(self):
+        self.keys, self.offsets, self.targets = array("i"), array("q", [0]), array("i")
+        self._last_key: Optional[int] = None
+        self._last_target: Optional[int] = None
+
+    def extend(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        keys, offsets, targets = self.keys, self.offsets, self.targets
+        last_key, last_target = self._last_key, self._last_target
+        for key, target in pairs:
+            if key != last_key:
+                if last_key is not None:
+                    offsets.append(len(targets))
+                keys.append(key)
+                last_key, last_target = key, None
+            if target != last_target:
+                targets.append(target)
+                last_target = target
+        self._last_key, self._last_target = last_key, last_target
+
+    def build(self) -> Adjacency:
+        if self._last_key is not None:
+            self.offsets.append(len(self.targets))
+            self._last_key = None
+        return Adjacency(self.keys, self.offsets, self.targets)
+
+
+class Delta:
+    """Edges added and removed on top of the layers below it."""
+
+    __slots__ = ("added", "removed", "size")
+
+    def __init__(self):
+        self.added: Dict[int, Set[int]] = {}
+        self.removed: Dict[int, Set[int]] = {}
+        self.size = 0
+
+    def touches(self, key: int) -> bool:
+        return bool(self.added.get(key) or self.removed.get(key))
+
+    def apply(self, key: int, row: Set[int]) -> Set[int]:
+        return (row - self.removed.get(key, set())) | self.added.get(key, set())
+
+
+class Direction:
+    """An Adjacency plus the edges added and removed since it was built.
+
+    Reads merge the base with up to two deltas: `frozen`, which is being folded
+    into a new Adjacency by a compaction, and `live`, which takes the changes
+    made meanwhile. Rows without changes are copied into the new base as slices.
+    """
+
+    def __init__(self, base: Optional[Adjacency] = None, compact_threshold: int = 10000):
+        self.base = base if base is not None else Adjacency()
+        self.compact_threshold = compact_threshold
+        self.frozen: Optional[Delta] = None
+        self.live = Delta()
+
+    @property
+    def delta_size(self) -> int:
+        return self.live.size + (self.frozen.size if self.frozen is not None else 0)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.frozen is None and self.live.size >= self.compact_threshold
+
+    def _deltas(self) -> List[Delta]:
+        return [self.live] if self.frozen is None else [self.frozen, self.live]
+
+    def get(self, key: int) -> List[int]:
+        row = self.base.neighbours(key)
+        deltas = [delta for delta in self._deltas() if delta.touches(key)]
+        if not deltas:
+            return row.tolist()
+        merged = set(row)
+        for delta in deltas:
+            merged = delta.apply(key, merged)
+        return sorted(merged)
+
+    def contains(self, key: int, target: int) -> bool:
+        for delta in reversed(self._deltas()):
+            if target in delta.added.get(key, ()):
+                return True
+            if target in delta.removed.get(key, ()):
+                return False
+        return self.base.contains(key, target)
+
+    def _contains_below_live(self, key: int, target: int) -> bool:
+        frozen = self.frozen
+        if frozen is not None:
+            if target in frozen.added.get(key, ()):
+                return True
+            if target in frozen.removed.get(key, ()):
+                return False
+        return self.base.contains(key, target)
+
+    def add(self, key: int, target: int) -> None:
+        live = self.live
+        removed = live.removed.get(key)
+        if removed and target in removed:
+            removed.discard(target)
+            live.size -= 1
+        elif not self._contains_below_live(key, target):
+            added = live.added.setdefault(key, set())
+            if target not in added:
+                added.add(target)
+                live.size += 1
+
+    def remove(self, key: int, target: int) -> None:
+        live = self.live
+        added = live.added.get(key)
+        if added and target in added:
+            added.discard(target)
+            live.size -= 1
+        elif self._contains_below_live(key, target):
+            removed = live.removed.setdefault(key, set())
+            if target not in removed:
+                removed.add(target)
+                live.size += 1
+
+    def compact(self) -> None:
+        """Fold every delta into the base right away, blocking the caller."""
+        self.base = _merge(self.base, self._deltas())
+        self.frozen, self.live = None, Delta()
+
+    async def compact_in_thread(self) -> None:
+        """Freeze the live delta, build the new base in a worker thread and swap it in.
+
+        Neither the base nor the frozen delta change while the thread reads them:
+        new edits go to a fresh live delta, which stays on top of the new base.
+        """
+        if self.frozen is not None:
+            return
+        frozen, self.live = self.live, Delta()
+        self.frozen = frozen
+        try:
+            base = await asyncio.to_thread(_merge, self.base, [frozen])
+        except BaseException:
+            if self.frozen is frozen:
+                # Put the changes back under the ones made meanwhile
+                self.frozen = None
+                self.live = _stack(frozen, self.live)
+            raise
+        if self.frozen is frozen:  # not already folded in by compact()
+            self.base, self.frozen = base, None
+
+
+def _stack(lower: Delta, upper: Delta) -> Delta:
+    """One delta equivalent to applying `lower`, then `upper`."""
+    for key, targets in upper.removed.items():
+        for target in targets:
+            if target in lower.added.get(key, ()):
+                lower.added[key].discard(target)
+                lower.size -= 1
+            else:
+                lower.removed.setdefault(key, set()).add(target)
+                lower.size += 1
+    for key, targets in upper.added.items():
+        for target in targets:
+            if target in lower.removed.get(key, ()):
+                lower.removed[key].discard(target)
+                lower.size -= 1
+            else:
+                lower.added.setdefault(key, set()).add(target)
+                lower.size += 1
+    return lower
+
+
+def _merge(base: Adjacency, deltas: List[Delta]) -> Adjacency:
+    """A new Adjacency with the deltas applied to `base`, in order."""
+    keys, offsets, targets = array("i"), array("q", [0]), array("i")
+
+    def copy_rows(lo: int, hi: int) -> None:
+        if lo >= hi:
+            return
+        start, end = base.offsets[lo], base.offsets[hi]
+        shift = len(targets) - start
+        keys.extend(base.keys[lo:hi])
+        targets.extend(base.targets[start:end])
+        offsets.extend(offset + shift for offset in base.offsets[lo + 1:hi + 1])
+
+    changed = set()
+    for delta in deltas:
+        changed |= delta.added.keys() | delta.removed.keys()
+
+    next_row = 0
+    for key in sorted(changed):
+        i = bisect_left(base.keys, key, next_row)
+        copy_rows(next_row, i)
+        merged = set(base.neighbours(key))
+        for delta in deltas:
+            merged = delta.apply(key, merged)
+        if merged:
+            keys.append(key)
+            targets.extend(sorted(merged))
+            offsets.append(len(targets))
+        next_row = i + 1 if i < len(base.keys) and base.keys[i] == key else i
+    copy_rows(next_row, len(base.keys))
+    return Adjacency(keys, offsets, targets)
+
+
+class FollowGraph:
+    """In-process index of subscriptions in both directions.
+
+    `following` maps a user to the users they follow, `followers` the other way
+    round. The index is loaded from the subscriptions table and kept current by
+    the subscribe/unsubscribe handlers of this process; changes made through
+    other workers show up after the next reload.
+
+    Once a direction collects `compact_threshold` changes it is compacted in a
+    worker thread, off the request that made the change.
+    """
+
+    def __init__(self, compact_threshold: int = 10000):
+        self.compact_threshold = compact_threshold
+        self.loaded = False
+        self.following = Direction(compact_threshold=compact_threshold)
+        self.followers = Direction(compact_threshold=compact_threshold)
+        self._replay: Optional[List[Tuple[bool, int, int]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._compactions: Set[asyncio.Task] = set()
+
+    @property
+    def edges(self) -> int:
+        return self.following.base.edges
+
+    @property
+    def nbytes(self) -> int:
+        return self.following.base.nbytes + self.followers.base.nbytes
+
+    def get_following(self, user_id: int) -> List[int]:
+        return self.following.get(user_id)
+
+    def get_followers(self, user_id: int) -> List[int]:
+        return self.followers.get(user_id)
+
+    def is_following(self, user_id: int, target_user_id: int) -> bool:
+        return self.following.contains(user_id, target_user_id)
+
+    def add(self, user_id: int, target_user_id: int) -> None:
+        self._apply(True, user_id, target_user_id)
+
+    def remove(self, user_id: int, target_user_id: int) -> None:
+        self._apply(False, user_id, target_user_id)
+
+    def _apply(self, subscribed: bool, user_id: int, target_user_id: int) -> None:
+        if self._replay is not None:
+            # A reload is reading the table; the change may be missing from what it reads
+            self._replay.append((subscribed, user_id, target_user_id))
+        if subscribed:
+            self.following.add(user_id, target_user_id)
+            self.followers.add(target_user_id, user_id)
+        else:
+            self.following.remove(user_id, target_user_id)
+            self.followers.remove(target_user_id, user_id)
+        for direction in (self.following, self.followers):
+            if direction.needs_compaction:
+                self._schedule_compaction(direction)
+
+    def _schedule_compaction(self, direction: Direction) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to keep responsive (scripts, benchmarks)
+            direction.compact()
+            return
+        task = asyncio.create_task(direction.compact_in_thread())
+        self._compactions.add(task)
+        task.add_done_callback(self._compaction_done)
+
+    def _compaction_done(self, task: asyncio.Task) -> None:
+        self._compactions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Follow graph compaction failed", exc_info=task.exception())
+
+    def replace(self, following: Adjacency, followers: Adjacency) -> None:
+        self.following = Direction(following, self.compact_threshold)
+        self.followers = Direction(followers, self.compact_threshold)
+        self.loaded = True
+
+    async def load(self, session_factory=SessionLocal, chunk_size: int = 10000) -> None:
+        """Read the whole table into a fresh index and swap it in."""
+        self._replay = []
+        try:
+            async with session_factory() as db:
+                following = await _load_adjacency(db, Subscription.user_id, Subscription.target_user_id, chunk_size)
+                followers = await _load_adjacency(db, Subscription.target_user_id, Subscription.user_id, chunk_size)
+            replay, self._replay = self._replay, None
+            self.replace(following, followers)
+            for subscribed, user_id, target_user_id in replay:
+                self._apply(subscribed, user_id, target_user_id)
+        finally:
+            self._replay = None
+        logger.info("Follow graph loaded: %d edges, %.1f MiB", self.edges, self.nbytes / 2 ** 20)
+
+    async def _reload_periodically(self, interval: float) -> None:
+        while True:
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Failed to load the follow graph")
+            await asyncio.sleep(interval)
+
+    async def start(self, reload_interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._reload_periodically(reload_interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # A running thread can't be interrupted, wait for it
+        await asyncio.gather(*self._compactions, return_exceptions=True)
+
+
+async def _load_adjacency(db, key, target, chunk_size: int) -> Adjacency:
+    # Streamed in chunks straight into the arrays: rows are never all in memory at once
+    builder = AdjacencyBuilder()
+    result = await db.stream(select(key, target).order_by(key, target).execution_options(yield_per=chunk_size))
+    async for partition in result.partitions():
+        builder.extend(partition)
+    return builder.build()
+
+
+follow_graph = FollowGraph(compact_threshold=settings.follow_graph_compact_threshold)
@@ -0,0 +1,200 @@
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from app.core.config import settings
+
+# Marks a timeline that exists but has no posts yet, so it isn't mistaken for a missing one
+_EMPTY_MARKER = 0
+
+
+def _older_than(post_ids: Iterable[int], before_id: Optional[int]) -> Iterator[int]:
+    # Post ids grow over time, so "older than the cursor" is "smaller id"
+    for post_id in post_ids:
+        if post_id == _EMPTY_MARKER:
+            continue
+        if before_id is None or post_id < before_id:
+            yield post_id
+
+
+class InMemoryTimelineStore:
+    """Per-process timelines: a bounded deque of post ids (newest first) per follower."""
+
+    def __init__(self, max_length: int = 800, claims_max: int = 100000):
+        self.max_length = max_length
+        self.claims_max = claims_max
+        self._timelines: Dict[int, deque] = {}
+        self._author_posts: Dict[int, deque] = {}
+        self._celebrities: Set[int] = set()
+        self._claimed: "OrderedDict[int, None]" = OrderedDict()
+
+    async def claim(self, post_ids: Iterable[int]) -> List[int]:
+        """Mark posts as fanned out; returns the ids that were not claimed before."""
+        claimed = []
+        for post_id in post_ids:
+            if post_id in self._claimed:
+                continue
+            self._claimed[post_id] = None
+            claimed.append(post_id)
+        while len(self._claimed) > self.claims_max:
+            self._claimed.popitem(last=False)
+        return claimed
+
+    async def release(self, post_ids: Iterable[int]) -> None:
+        for post_id in post_ids:
+            self._claimed.pop(post_id, None)
+
+    async def read(self, user_id: int, limit: int, before_id: Optional[int] = None) -> Optional[List[int]]:
+        timeline = self._timelines.get(user_id)
+        if timeline is None:
+            return None
+        return list(islice(_older_than(timeline, before_id), limit))
+
+    async def seed(self, user_id: int, post_ids: List[int]) -> None:
+        self._timelines[user_id] = deque(post_ids[:self.max_length], maxlen=self.max_length)
+
+    async def push(self, user_ids: Iterable[int], post_id: int) -> None:
+        # Only timelines that were already built get the post; missing ones are rebuilt on read
+        for user_id in user_ids:
+            timeline = self._timelines.get(user_id)
+            if timeline is not None:
+                timeline.appendleft(post_id)
+
+    async def drop(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            self._timelines.pop(user_id, None)
+
+    async def push_author_post(self, author_id: int, post_id: int) -> None:
+        self._celebrities.add(author_id)
+        posts = self._author_posts.setdefault(author_id, deque(maxlen=self.max_length))
+        posts.appendleft(post_id)
+
+    async def read_author_posts(
+        self, author_ids: Iterable[int], limit: int, before_id: Optional[int] = None
+    ) -> List[List[int]]:
+        return [
+            list(islice(_older_than(self._author_posts.get(author_id, ()), before_id), limit))
+            for author_id in author_ids
+        ]
+
+    async def celebrities(self) -> Set[int]:
+        return set(self._celebrities)
+
+    async def is_celebrity(self, author_id: int) -> bool:
+        return author_id in self._celebrities
+
+
+class RedisTimelineStore:
+    """Timelines shared by the API and the event consumer, stored as Redis lists."""
+
+    def __init__(
+        self, url: str = "", max_length: int = 800, prefix: str = "timeline:", client=None, claim_ttl: int = 86400
+    ):
+        if client is None:
+            import redis.asyncio as redis  # optional dependency, only needed for this backend
+            client = redis.from_url(url)
+        self.redis = client
+        self.max_length = max_length
+        self.prefix = prefix
+        self.claim_ttl = claim_ttl
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    def _author_key(self, author_id: int) -> str:
+        return f"{self.prefix}author:{author_id}"
+
+    @property
+    def _celebrities_key(self) -> str:
+        return f"{self.prefix}celebrities"
+
+    def _claim_key(self, post_id: int) -> str:
+        return f"{self.prefix}fanned-out:{post_id}"
+
+    async def claim(self, post_ids: Iterable[int]) -> List[int]:
+        """Mark posts as fanned out; returns the ids that were not claimed before.
+
+        SET NX is atomic, so of several workers handling the same post only one wins.
+        """
+        post_ids = list(post_ids)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for post_id in post_ids:
+                pipe.set(self._claim_key(post_id), 1, nx=True, ex=self.claim_ttl)
+            results = await pipe.execute()
+        return [post_id for post_id, ok in zip(post_ids, results) if ok]
+
+    async def release(self, post_ids: Iterable[int]) -> None:
+        keys = [self._claim_key(post_id) for post_id in post_ids]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def read(self, user_id: int, limit: int, before_id: Optional[int] = None) -> Optional[List[int]]:
+        # A list can't be searched by value, so deeper pages read the whole (bounded) timeline
+        stop = limit if before_id is None else -1
+        raw = await self.redis.lrange(self._key(user_id), 0, stop)
+        if not raw:
+            return None
+        post_ids = (int(value) for value in raw)
+        return list(islice(_older_than(post_ids, before_id), limit))
+
+    async def seed(self, user_id: int, post_ids: List[int]) -> None:
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.rpush(key, *post_ids[:self.max_length], _EMPTY_MARKER)
+            pipe.ltrim(key, 0, self.max_length - 1)
+            await pipe.execute()
+
+    async def push(self, user_ids: Iterable[int], post_id: int) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                key = self._key(user_id)
+                # LPUSHX: only timelines that were already built get the post
+                pipe.lpushx(key, post_id)
+                pipe.ltrim(key, 0, self.max_length - 1)
+            await pipe.execute()
+
+    async def drop(self, user_ids: Iterable[int]) -> None:
+        keys = [self._key(user_id) for user_id in user_ids]
+        for start in range(0, len(keys), 1000):
+            await self.redis.delete(*keys[start:start + 1000])
+
+    async def push_author_post(self, author_id: int, post_id: int) -> None:
+        key = self._author_key(author_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(self._celebrities_key, author_id)
+            pipe.lpush(key, post_id)
+            pipe.ltrim(key, 0, self.max_length - 1)
+            await pipe.execute()
+
+    async def read_author_posts(
+        self, author_ids: Iterable[int], limit: int, before_id: Optional[int] = None
+    ) -> List[List[int]]:
+        stop = limit - 1 if before_id is None else -1
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for author_id in author_ids:
+                pipe.lrange(self._author_key(author_id), 0, stop)
+            results = await pipe.execute()
+        return [
+            list(islice(_older_than((int(value) for value in raw), before_id), limit))
+            for raw in results
+        ]
+
+    async def celebrities(self) -> Set[int]:
+        return {int(value) for value in await self.redis.smembers(self._celebrities_key)}
+
+    async def is_celebrity(self, author_id: int) -> bool:
+        return bool(await self.redis.sismember(self._celebrities_key, author_id))
+
+
+def _build_store():
+    if settings.timeline_backend == "redis":
+        return RedisTimelineStore(
+            url=f"redis://{settings.redis_host}:{settings.redis_port}/0",
+            max_length=settings.timeline_max_length,
+            claim_ttl=settings.timeline_claim_ttl,
+        )
+    return InMemoryTimelineStore(max_length=settings.timeline_max_length)
+
+
+timeline_store = _build_store()
@@ -0,0 +1,102 @@
+"""
+PostCreated handling throughput: the old pika callback (a new event loop and one
+follower lookup per message, one message at a time) versus EventConsumer
+(bounded concurrent handlers, per-author coalescing, batched acks).
+
+The broker is left out: a backlog of messages is fed straight into the
+consumer (as after a restart or a burst) and the follower lookup + fan-out is
+simulated with a fixed latency, so the numbers isolate the dispatch strategy. Run from the subscription_service dir:
+
+    python -m benchmarks.bench_event_consumer --events 5000 --authors 200 --lookup-ms 2
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from app.services import event_consumer as consumer_module
+from app.services.event_consumer import EventConsumer
+
+
+class Delivery:
+    def __init__(self, delivery_tag: int, body: bytes):
+        self.delivery_tag = delivery_tag
+        self.body = body
+        self.redelivered = False
+
+    async def ack(self, multiple: bool = False):
+        pass
+
+    async def nack(self, requeue: bool = True):
+        pass
+
+
+def make_events(count: int, authors: int) -> list[bytes]:
+    rng = random.Random(1)
+    # A few active authors post most of the time, as in a real feed
+    weights = [1 / (rank + 1) for rank in range(authors)]
+    author_ids = rng.choices(range(1, authors + 1), weights=weights, k=count)
+    return [
+        f'{{"event": "PostCreated", "post_id": {post_id}, "user_id": {author_id}}}'.encode()
+        for post_id, author_id in enumerate(author_ids, start=1)
+    ]
+
+
+def per_message(events: list[bytes], lookup: float) -> tuple[float, int]:
+    lookups = 0
+
+    async def handle(author_id: int, post_id: int):
+        nonlocal lookups
+        lookups += 1
+        await asyncio.sleep(lookup)
+
+    started = time.perf_counter()
+    for body in events:
+        event = json.loads(body)
+        asyncio.run(handle(event["user_id"], event["post_id"]))
+    return time.perf_counter() - started, lookups
+
+
+async def consumer(events: list[bytes], lookup: float, concurrency: int, window: float) -> tuple[float, int]:
+    lookups = 0
+
+    async def handle(author_id: int, post_ids: list[int]):
+        nonlocal lookups
+        lookups += 1
+        await asyncio.sleep(lookup)
+
+    consumer_module.handle_posts_created = handle
+    events_consumer = EventConsumer("amqp://unused/", concurrency=concurrency, coalesce_window=window)
+    ack_task = asyncio.create_task(events_consumer._ack_loop())
+    started = time.perf_counter()
+    for tag, body in enumerate(events, start=1):
+        events_consumer._dispatch(Delivery(tag, body))
+        if tag % 200 == 0:
+            await asyncio.sleep(0)  # a prefetch window's worth arrives per read
+    while events_consumer.acked < len(events):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    ack_task.cancel()
+    return elapsed, lookups
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--lookup-ms", type=float, default=2.0, help="simulated follower lookup + fan-out")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--window", type=float, default=0.2, help="coalescing window, seconds")
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.authors)
+    lookup = args.lookup_ms / 1000
+    elapsed, lookups = per_message(events, lookup)
+    print(f"per-message  {args.events / elapsed:9.0f} events/s  {lookups} lookups")
+    elapsed, lookups = asyncio.run(consumer(events, lookup, args.concurrency, args.window))
+    print(f"consumer     {args.events / elapsed:9.0f} events/s  {lookups} lookups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Memory and query latency of the in-process follow graph (app.utils.follow_graph)
+on a synthetic graph, and the same edges held as a dict of sets for comparison.
+
+Followees are skewed towards low user ids, so a few users have huge follower
+lists, as on a real network. Run from the subscription_service dir:
+
+    python -m benchmarks.bench_follow_graph --users 1000000 --edges 10000000
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from array import array
+
+from app.utils.follow_graph import Adjacency, AdjacencyBuilder, FollowGraph
+
+
+def generate_following(users: int, edges: int, seed: int = 1) -> Adjacency:
+    """user -> followees, built user by user so no global sort is needed."""
+    rng = random.Random(seed)
+    builder = AdjacencyBuilder()
+    max_degree = 2 * edges // users
+    for user in range(1, users + 1):
+        followees = {int(users * rng.random() ** 3) + 1 for _ in range(rng.randint(0, max_degree))}
+        followees.discard(user)
+        builder.extend((user, followee) for followee in sorted(followees))
+    return builder.build()
+
+
+def transpose(adjacency: Adjacency, users: int) -> Adjacency:
+    """Counting sort of the edges by target: rows come out sorted because keys are visited in order."""
+    counts = array("q", bytes(8 * (users + 2)))
+    for target in adjacency.targets:
+        counts[target + 1] += 1
+    for i in range(1, len(counts)):
+        counts[i] += counts[i - 1]
+    position = array("q", counts)
+    sources = array("i", bytes(4 * len(adjacency.targets)))
+    for row, key in enumerate(adjacency.keys):
+        for i in range(adjacency.offsets[row], adjacency.offsets[row + 1]):
+            target = adjacency.targets[i]
+            sources[position[target]] = key
+            position[target] += 1
+    keys, offsets = array("i"), array("q", [0])
+    for target in range(users + 1):
+        if counts[target + 1] > counts[target]:
+            keys.append(target)
+            offsets.append(counts[target + 1])
+    return Adjacency(keys, offsets, sources)
+
+
+def dict_of_sets_bytes(adjacency: Adjacency, limit: int) -> tuple[int, int]:
+    """Traced size of the first `limit` edges stored as {user: set(followees)}."""
+    tracemalloc.start()
+    graph = {}
+    edges = 0
+    for row, key in enumerate(adjacency.keys):
+        start, end = adjacency.offsets[row], adjacency.offsets[row + 1]
+        graph[key] = set(adjacency.targets[start:end])
+        edges += end - start
+        if edges >= limit:
+            break
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, edges
+
+
+def per_call(fn, args: list, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for arg in args:
+            fn(*arg)
+    return (time.perf_counter() - started) / (len(args) * repeat)
+
+
+async def changes_during_compaction(graph: FollowGraph, pairs: list) -> tuple[float, int]:
+    """Worst latency of a change plus a read while both directions compact in worker threads."""
+    tasks = [asyncio.create_task(direction.compact_in_thread()) for direction in (graph.following, graph.followers)]
+    worst, changes = 0.0, 0
+    while not all(task.done() for task in tasks):
+        user, target = pairs[changes % len(pairs)]
+        started = time.perf_counter()
+        graph.add(user, target + 1000)
+        graph.is_following(user, target)
+        worst = max(worst, time.perf_counter() - started)
+        changes += 1
+        await asyncio.sleep(0)
+    return worst, changes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=10_000_000)
+    parser.add_argument("--deltas", type=int, default=10_000, help="subscribe/unsubscribe changes before compaction")
+    parser.add_argument("--queries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    following = generate_following(args.users, args.edges)
+    followers = transpose(following, args.users)
+    graph = FollowGraph(compact_threshold=args.deltas + 1)
+    graph.replace(following, followers)
+    print(f"built {graph.edges} edges in {time.perf_counter() - started:.1f}s")
+    print(f"follow graph      {graph.nbytes / 2 ** 20:8.1f} MiB  ({graph.nbytes / graph.edges:.1f} bytes/edge, both directions)")
+
+    size, edges = dict_of_sets_bytes(following, min(graph.edges, 1_000_000))
+    print(f"dict of sets      {size / edges * graph.edges / 2 ** 20:8.1f} MiB  "
+          f"({size / edges:.1f} bytes/edge, one direction, measured on {edges} edges)")
+
+    rng = random.Random(2)
+    users = [(rng.randint(1, args.users),) for _ in range(args.queries)]
+    pairs = [(rng.randint(1, args.users), rng.randint(1, 1000)) for _ in range(args.queries)]
+    print(f"get_following     {per_call(graph.get_following, users) * 1e6:8.2f} us")
+    print(f"get_followers     {per_call(graph.get_followers, users) * 1e6:8.2f} us  (mostly small rows)")
+    popular = [(user,) for user in range(1, 11)]
+    print(f"get_followers top {per_call(graph.get_followers, popular, repeat=10) * 1e6:8.2f} us  "
+          f"({len(graph.get_followers(1))} followers of user 1)")
+    print(f"is_following      {per_call(graph.is_following, pairs) * 1e6:8.2f} us")
+
+    for user, target in pairs[:args.deltas]:
+        graph.add(user, target)
+    changed = [(user,) for user, _ in pairs[:args.deltas]]
+    print(f"get_following     {per_call(graph.get_following, changed) * 1e6:8.2f} us  "
+          f"(users with pending deltas, {graph.following.delta_size} in total)")
+    started = time.perf_counter()
+    graph.following.compact()
+    graph.followers.compact()
+    print(f"compaction        {time.perf_counter() - started:8.2f} s  (blocking)")
+
+    for user, target in pairs[:args.deltas]:
+        graph.remove(user, target)
+    worst, changes = asyncio.run(changes_during_compaction(graph, pairs))
+    print(f"compaction        {worst * 1e3:8.2f} ms  (in a thread: worst change + read of {changes} made meanwhile)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-call latency of inter-service requests: a new httpx.AsyncClient per call
+(the old behaviour) versus the shared pooled client from app.clients.http.
+
+The stub service is a minimal keep-alive HTTP/1.1 server on localhost, so the
+numbers isolate connection setup cost. Run from the subscription_service dir:
+
+    python -m benchmarks.bench_http_client --calls 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BODY = b'{"users": []}'
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+)
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def report(name: str, samples: list[float]):
+    samples.sort()
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:22} p50={p50 * 1000:7.3f} ms  p99={p99 * 1000:7.3f} ms")
+
+
+async def main(calls: int):
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/users"
+
+    per_call = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            await client.get(url)
+        per_call.append(time.perf_counter() - started)
+    report("client per call", per_call)
+
+    # Imported late so that settings are only required for the pooled run
+    from app.clients.http import start_http_client, close_http_client, get_http_client
+
+    await start_http_client()
+    client = get_http_client()
+    await client.get(url)
+    pooled = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await client.get(url)
+        pooled.append(time.perf_counter() - started)
+    await close_http_client()
+    report("shared pooled client", pooled)
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    asyncio.run(main(parser.parse_args().calls))
@@ -1,9 +1,38 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 
+from app.clients.http import start_http_client, close_http_client
+from app.core.config import settings
 from app.routers.subscriptions import router as subscriptions_router
+from app.services.event_consumer import event_consumer
+from app.utils.follow_graph import follow_graph
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    if settings.follow_graph_enabled:
+        # Loads in the background; until then queries go to the database
+        await follow_graph.start(settings.follow_graph_reload_interval)
+    if settings.events_consumer_enabled:
+        if "memory" in (settings.feed_cache_backend, settings.timeline_backend):
+            # Workers compete for the queue: with per-process stores each one fans out only its share
+            logger.warning(
+                "Event consumer started with in-memory feed cache/timelines; "
+                "run a single worker or set FEED_CACHE_BACKEND=redis and TIMELINE_BACKEND=redis"
+            )
+        await event_consumer.start()
+    yield
+    await event_consumer.stop()
+    await follow_graph.stop()
+    await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Подключаем роутеры
 app.include_router(subscriptions_router)
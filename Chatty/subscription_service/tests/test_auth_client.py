@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from unittest.mock import AsyncMock
+
+from app.clients.auth_client import AuthClient
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_batched(monkeypatch):
+    client = AuthClient(base_url="http://auth")
+    batch = AsyncMock(return_value=[
+        {"id": 1, "username": "user1"},
+        {"id": 2, "username": "user2"}
+    ])
+    monkeypatch.setattr(client, "get_users_batch", batch)
+
+    results = await asyncio.gather(
+        client.load_user_id("user1"),
+        client.load_user_id("user2"),
+        client.load_user_id("user1"),
+    )
+
+    assert results == [1, 2, 1]
+    batch.assert_awaited_once()
+    assert sorted(batch.await_args.kwargs["usernames"]) == ["user1", "user2"]
+
+
+@pytest.mark.asyncio
+async def test_missing_username_raises_404(monkeypatch):
+    client = AuthClient(base_url="http://auth")
+    monkeypatch.setattr(client, "get_users_batch", AsyncMock(return_value=[{"id": 1, "username": "user1"}]))
+
+    found, missing = await asyncio.gather(
+        client.load_user_id("user1"),
+        client.load_user_id("ghost"),
+        return_exceptions=True,
+    )
+
+    assert found == 1
+    assert isinstance(missing, HTTPException)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting(monkeypatch):
+    client = AuthClient(base_url="http://auth", batch_window=60, max_batch_size=2)
+    batch = AsyncMock(return_value=[
+        {"id": 1, "username": "user1"},
+        {"id": 2, "username": "user2"}
+    ])
+    monkeypatch.setattr(client, "get_users_batch", batch)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(client.load_user_id("user1"), client.load_user_id("user2")), timeout=1
+    )
+
+    assert results == [1, 2]
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache import FeedCache, InMemoryFeedCache, RedisFeedCache
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_lru_and_expires():
+    backend = InMemoryFeedCache(max_entries=2, ttl=60)
+    await backend.set(1, [{"id": 1}])
+    await backend.set(2, [{"id": 2}])
+    await backend.get(1)
+    await backend.set(3, [{"id": 3}])
+
+    assert await backend.get(2) is None
+    assert await backend.get(1) == [{"id": 1}]
+
+    expired = InMemoryFeedCache(ttl=0)
+    await expired.set(1, [])
+    assert await expired.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_feed_once():
+    cache = FeedCache(InMemoryFeedCache())
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [{"id": 10}]
+
+    results = await asyncio.gather(*(cache.get_or_compute(1, compute) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == [{"id": 10}] for r in results)
+    # An empty feed is a valid cached value, not a miss
+    assert await cache.get_or_compute(2, lambda: asyncio.sleep(0, result=[])) == []
+    assert await cache.get(2) == []
+    assert cache.metrics()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_compute_is_not_cached():
+    cache = FeedCache(InMemoryFeedCache())
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.01)
+        return [{"id": 1}]
+
+    task = asyncio.create_task(cache.get_or_compute(1, compute))
+    await started.wait()
+    await cache.invalidate([1])
+    assert await task == [{"id": 1}]
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_roundtrip():
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = FeedCache(RedisFeedCache(client=fakeredis.FakeAsyncRedis(), ttl=60))
+
+    await cache.set(1, [{"id": 1, "content": "hi"}])
+    await cache.set(2, [])
+    assert await cache.get(1) == [{"id": 1, "content": "hi"}]
+
+    await cache.invalidate([1, 2])
+    assert await cache.get(1) is None
+    assert await cache.get(2) is None
@@ -0,0 +1,117 @@
+import asyncio
+import random
+
+import pytest
+
+from app.utils.follow_graph import Adjacency, FollowGraph
+
+
+def test_adjacency_rows_are_sorted_and_deduplicated():
+    adjacency = Adjacency.from_sorted_pairs([(1, 2), (1, 3), (1, 3), (4, 1)])
+    assert adjacency.neighbours(1).tolist() == [2, 3]
+    assert adjacency.neighbours(2).tolist() == []
+    assert adjacency.contains(4, 1)
+    assert not adjacency.contains(4, 2)
+    assert adjacency.edges == 3
+
+
+def test_deltas_and_compaction_match_a_set_model():
+    rng = random.Random(7)
+    edges = {(rng.randrange(50), rng.randrange(50)) for _ in range(500)}
+    graph = FollowGraph(compact_threshold=37)
+    graph.replace(
+        Adjacency.from_sorted_pairs(sorted(edges)),
+        Adjacency.from_sorted_pairs(sorted((target, user) for user, target in edges)),
+    )
+
+    for _ in range(2000):
+        edge = (rng.randrange(60), rng.randrange(60))
+        if rng.random() < 0.5:
+            graph.add(*edge)
+            edges.add(edge)
+        else:
+            graph.remove(*edge)
+            edges.discard(edge)
+
+    for user in range(60):
+        assert graph.get_following(user) == sorted(t for u, t in edges if u == user)
+        assert graph.get_followers(user) == sorted(u for u, t in edges if t == user)
+    assert all(graph.is_following(*edge) for edge in edges)
+    assert not graph.is_following(60, 61)
+
+
+@pytest.mark.asyncio
+async def test_compaction_runs_in_background_while_changes_continue():
+    rng = random.Random(11)
+    edges = {(rng.randrange(50), rng.randrange(50)) for _ in range(500)}
+    graph = FollowGraph(compact_threshold=50)
+    graph.replace(
+        Adjacency.from_sorted_pairs(sorted(edges)),
+        Adjacency.from_sorted_pairs(sorted((target, user) for user, target in edges)),
+    )
+
+    compacting = 0
+    for step in range(3000):
+        edge = (rng.randrange(60), rng.randrange(60))
+        if rng.random() < 0.5:
+            graph.add(*edge)
+            edges.add(edge)
+        else:
+            graph.remove(*edge)
+            edges.discard(edge)
+        # Reads see every change, whether or not a compaction is in flight
+        assert graph.is_following(*edge) == (edge in edges)
+        compacting += graph.following.frozen is not None
+        if step % 7 == 0:
+            await asyncio.sleep(0)
+    await graph.stop()
+
+    assert compacting  # changes were made while a compaction was in progress
+    assert graph.following.frozen is None
+    assert graph.following.delta_size < graph.compact_threshold
+    for user in range(60):
+        assert graph.get_following(user) == sorted(t for u, t in edges if u == user)
+        assert graph.get_followers(user) == sorted(u for u, t in edges if t == user)
+
+
+class FakeStream:
+    def __init__(self, rows, on_first_chunk=None):
+        self.rows = rows
+        self.on_first_chunk = on_first_chunk
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), 2):
+            if start == 0 and self.on_first_chunk:
+                self.on_first_chunk()
+            await asyncio.sleep(0)
+            yield self.rows[start:start + 2]
+
+
+class FakeDb:
+    def __init__(self, streams):
+        self.streams = list(streams)
+
+    async def stream(self, query):
+        return self.streams.pop(0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_changes_made_during_load_survive_the_swap():
+    graph = FollowGraph()
+    # The subscription (1, 9) is committed while the reload reads a snapshot without it
+    db = FakeDb([
+        FakeStream([(1, 2), (1, 3), (2, 3)], on_first_chunk=lambda: graph.add(1, 9)),
+        FakeStream([(2, 1), (3, 1), (3, 2)]),
+    ])
+    await graph.load(session_factory=lambda: db)
+
+    assert graph.loaded
+    assert graph.get_following(1) == [2, 3, 9]
+    assert graph.get_followers(9) == [1]
+    assert graph.get_followers(3) == [1, 2]
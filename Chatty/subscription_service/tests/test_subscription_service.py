@@ -20,15 +20,16 @@ async def db_session():
 @pytest.mark.asyncio
 async def test_get_all_users(db_session: AsyncSession, monkeypatch):
     monkeypatch.setattr("app.core.deps.get_current_user", AsyncMock(return_value=1))
-    monkeypatch.setattr("app.clients.AuthClient.get_all_users", AsyncMock(return_value=[
+    monkeypatch.setattr("app.clients.AuthClient.get_all_users", AsyncMock(return_value=([
         {"id": 1, "username": "user1"},
         {"id": 2, "username": "user2"}
-    ]))
+    ], 2)))
 
     response = client.get("/subscriptions/users")
     assert response.status_code == 200
-    assert len(response.json()) == 2
-    assert response.json()[0]["username"] == "user1"
+    assert len(response.json()["users"]) == 2
+    assert response.json()["users"][0]["username"] == "user1"
+    assert response.json()["next_cursor"] == 2
 
 
 @pytest.mark.asyncio
@@ -102,14 +103,15 @@ async def test_unsubscribe_from_user(db_session: AsyncSession, monkeypatch):
 @pytest.mark.asyncio
 async def test_get_user_posts(db_session: AsyncSession, monkeypatch):
     monkeypatch.setattr("app.core.deps.get_current_user", AsyncMock(return_value=1))
-    monkeypatch.setattr("app.clients.PostClient.get_user_posts", AsyncMock(return_value=[
-        {"id": 1, "user_id": 2, "content": "Test post"}
-    ]))
+    monkeypatch.setattr("app.clients.PostClient.get_user_posts", AsyncMock(return_value={
+        "posts": [{"id": 1, "user_id": 2, "content": "Test post"}],
+        "next_cursor": None
+    }))
 
     response = client.get("/subscriptions/users/2/posts")
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["content"] == "Test post"
+    assert len(response.json()["posts"]) == 1
+    assert response.json()["posts"][0]["content"] == "Test post"
 
 
 @pytest.mark.asyncio
@@ -140,5 +142,5 @@ async def test_get_feed(db_session: AsyncSession, monkeypatch):
 
     response = client.get("/subscriptions/feed")
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["content"] == "Test post"
\ No newline at end of file
+    assert len(response.json()["posts"]) == 1
+    assert response.json()["posts"][0]["content"] == "Test post"
\ No newline at end of file
@@ -0,0 +1,164 @@
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import timeline_service
+from app.services.timeline_service import merge_newest
+from app.utils.cursor import decode_cursor
+from app.utils.timeline import InMemoryTimelineStore, RedisTimelineStore
+
+
+def fake_db(*rows):
+    """AsyncSession stand-in whose consecutive execute() calls return the given scalar rows."""
+    results = []
+    for values in rows:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = list(values)
+        results.append(result)
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=results)
+    return db
+
+
+class FakeSessionLocal:
+    def __init__(self, db):
+        self.db = db
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self.db
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_merge_newest_dedupes_and_limits():
+    assert merge_newest(4, [9, 7, 3], [8, 7, 2], [10]) == [10, 9, 8, 7]
+    assert merge_newest(10, [], [1]) == [1]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_celebrity_threshold(monkeypatch):
+    store = InMemoryTimelineStore(max_length=3)
+    monkeypatch.setattr(timeline_service, "timeline_store", store)
+    monkeypatch.setattr(timeline_service.settings, "feed_celebrity_threshold", 3)
+    monkeypatch.setattr(timeline_service, "invalidate_feeds_of_followers", AsyncMock())
+    await store.seed(1, [])
+    await store.seed(2, [5])
+
+    monkeypatch.setattr(timeline_service, "SessionLocal", FakeSessionLocal(fake_db([1, 2, 3])))
+    await timeline_service.handle_post_created(author_id=10, post_id=6)
+    # User 3 has no timeline yet, it is built on first read instead
+    assert await store.read(1, 10) == [6]
+    assert await store.read(2, 10) == [6, 5]
+    assert await store.read(3, 10) is None
+
+    monkeypatch.setattr(timeline_service, "SessionLocal", FakeSessionLocal(fake_db([1, 2, 3, 4])))
+    await timeline_service.handle_post_created(author_id=20, post_id=7)
+    assert await store.read(1, 10) == [6]
+    assert await store.is_celebrity(20)
+    assert await store.read_author_posts([20], 10) == [[7]]
+
+
+@pytest.mark.asyncio
+async def test_redelivered_post_is_not_fanned_out_again(monkeypatch):
+    store = InMemoryTimelineStore()
+    monkeypatch.setattr(timeline_service, "timeline_store", store)
+    monkeypatch.setattr(timeline_service, "invalidate_feeds_of_followers", AsyncMock())
+    await store.seed(1, [])
+
+    monkeypatch.setattr(timeline_service, "SessionLocal", FakeSessionLocal(fake_db([1])))
+    await timeline_service.handle_posts_created(10, [6])
+    # The fan-out of post 8 fails: it must stay unclaimed for the redelivery
+    failing_db = MagicMock()
+    failing_db.execute = AsyncMock(side_effect=RuntimeError)
+    monkeypatch.setattr(timeline_service, "SessionLocal", FakeSessionLocal(failing_db))
+    with pytest.raises(RuntimeError):
+        await timeline_service.handle_posts_created(10, [8])
+    monkeypatch.setattr(timeline_service, "SessionLocal", FakeSessionLocal(fake_db([1])))
+    await timeline_service.handle_posts_created(10, [6, 8])
+
+    assert await store.read(1, 10) == [8, 6]
+
+
+@pytest.mark.asyncio
+async def test_redis_claims_are_shared():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    first, second = RedisTimelineStore(client=client), RedisTimelineStore(client=client)
+
+    assert await first.claim([1, 2]) == [1, 2]
+    assert await second.claim([2, 3]) == [3]
+    await first.release([2])
+    assert await second.claim([2]) == [2]
+
+
+def post(post_id, user_id=0, minute=0):
+    return {"id": post_id, "user_id": user_id, "content": "", "created_at": f"2025-01-01T00:{minute:02d}:00"}
+
+
+@pytest.mark.asyncio
+async def test_read_merges_celebrity_posts(monkeypatch):
+    store = InMemoryTimelineStore()
+    monkeypatch.setattr(timeline_service, "timeline_store", store)
+    await store.seed(1, [8, 4])
+    await store.push_author_post(20, 6)
+    await store.push_author_post(20, 9)
+    fetch = AsyncMock(return_value=[post(6, minute=6), post(9, minute=9)])
+    monkeypatch.setattr(timeline_service.post_client, "fetch_posts_by_ids", fetch)
+    older = AsyncMock(return_value=[post(4, 10, minute=4)])
+    monkeypatch.setattr(timeline_service.post_client, "fetch_posts", older)
+
+    page = await timeline_service.read_feed(1, 3, None, fake_db([20], [10, 20]))
+
+    fetch.assert_awaited_once_with([9, 8, 6])
+    # Post 8 was deleted in post_service, the page is topped up with older posts
+    assert [p["id"] for p in page["posts"]] == [9, 6, 4]
+    assert decode_cursor(older.await_args.kwargs["cursor"])[1] == 6
+    assert decode_cursor(page["next_cursor"]) == (datetime(2025, 1, 1, 0, 4), 4)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_on_read_merges_per_author_streams(monkeypatch):
+    monkeypatch.setattr(timeline_service.settings, "feed_authors_per_request", 2)
+    by_author = {
+        1: [post(10, 1, 10), post(4, 1, 4)],
+        2: [post(9, 2, 9), post(8, 2, 8)],
+        3: [post(12, 3, 12), post(1, 3, 1)],
+    }
+
+    async def fetch_posts(user_ids, per_author, cursor=None):
+        return [p for uid in user_ids for p in by_author[uid][:per_author]]
+
+    fetch = AsyncMock(side_effect=fetch_posts)
+    monkeypatch.setattr(timeline_service.post_client, "fetch_posts", fetch)
+
+    posts = await timeline_service.fetch_merged_posts([1, 2, 3], limit=3)
+
+    assert [p["id"] for p in posts] == [12, 10, 9]
+    assert fetch.await_count == 2
+    assert all(call.kwargs["per_author"] == 3 for call in fetch.await_args_list)
+
+
+@pytest.mark.asyncio
+async def test_redis_store_keeps_empty_timelines_and_trims():
+    fakeredis = pytest.importorskip("fakeredis")
+    store = RedisTimelineStore(client=fakeredis.FakeAsyncRedis(), max_length=2)
+
+    assert await store.read(1, 10) is None
+    await store.seed(1, [])
+    assert await store.read(1, 10) == []
+
+    await store.push([1, 2], 5)
+    await store.push([1], 6)
+    await store.push([1], 7)
+    assert await store.read(1, 10) == [7, 6]
+    assert await store.read(1, 10, before_id=7) == [6]
+    assert await store.read(2, 10) is None
+
+    await store.push_author_post(20, 3)
+    assert await store.celebrities() == {20}
+    assert await store.read_author_posts([20, 21], 5) == [[3], []]